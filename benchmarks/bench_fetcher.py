@@ -0,0 +1,84 @@
+"""
+Goods-info fetch throughput against the local `mock_server`.
+
+Compares the `get_cs2_goods_info` approach (threads, one new connection per id)
+with `GoodsInfoFetcher` (pooled keep-alive connections on one event loop). Both
+run unthrottled client side; the server adds `--latency` per request and answers
+429 beyond `--rate`, so the numbers measure connection handling and retries.
+
+    PYTHONPATH=src python benchmarks/bench_fetcher.py --ids 2000 --latency 0.01
+"""
+import argparse
+import asyncio
+import http.client
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from fixtures import write_goods_jsonl
+
+from cs2.scrape.async_fetcher import GOOD_PATH, GoodsInfoFetcher
+from cs2.scrape.mock_server import MockGoodsServer
+
+
+def threaded_fetch(port: int, ids: list[int], output: Path, workers: int) -> tuple[int, float]:
+    """Rate limited answers are dropped, as `get_cs2_goods_info` does; only saved ids count."""
+    lock = threading.Lock()
+    saved = 0
+
+    def fetch(good_id):
+        nonlocal saved
+        conn = http.client.HTTPConnection('127.0.0.1', port)
+        conn.request("GET", f"{GOOD_PATH}?id={good_id}")
+        res = conn.getresponse()
+        data = res.read()
+        conn.close()
+        if res.status != 200:
+            return
+        with lock:
+            saved += 1
+            with open(output, "a+", encoding="utf-8") as f:
+                f.write(data.decode("utf-8") + "\n")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(fetch, ids))
+    return saved, time.perf_counter() - start
+
+
+async def bench(args) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        server = MockGoodsServer.from_jsonl(write_goods_jsonl(tmp / 'goods.jsonl', args.containers),
+                                            rate=args.rate, burst=args.concurrency, latency=args.latency)
+        ids = list(server.responses)[:args.ids]
+        async with server:
+            n, seconds = await asyncio.to_thread(threaded_fetch, server.port, ids, tmp / 'threaded.jsonl',
+                                                 args.concurrency)
+            print(f"{'threaded, new connections':<32}{n / seconds:>10.1f} saved/s  "
+                  f"saved {n}/{len(ids)}  connections {server.connections}")
+
+            connections, requests = server.connections, server.requests
+            fetcher = GoodsInfoFetcher(None, tmp / 'async.jsonl', host='127.0.0.1', port=server.port,
+                                       use_ssl=False, concurrency=args.concurrency, rate=0,
+                                       backoff=0.05, error_log=tmp / 'error.log')
+            stats = await fetcher.run(ids)
+            print(f"{'async, pooled connections':<32}{stats.fetched / stats.seconds:>10.1f} saved/s  "
+                  f"saved {stats.fetched}/{len(ids)}  connections {server.connections - connections}  retries {stats.retries}  "
+                  f"requests {server.requests - requests}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--containers', type=int, default=10, help='containers in the synthetic snapshot')
+    parser.add_argument('--ids', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0.01, help='server seconds per request')
+    parser.add_argument('--rate', type=float, default=0.0, help='server requests per second before 429')
+    asyncio.run(bench(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,258 @@
+"""
+Offline benchmarks of the optimizer hot paths.
+
+Runs against `price.csv` and the synthetic goods fixture, prints a table and
+saves the numbers as json so runs can be compared:
+
+    PYTHONPATH=src python benchmarks/bench_optimizer.py
+    PYTHONPATH=src python benchmarks/bench_optimizer.py --compare benchmarks/results/<previous>.json
+
+`--compare` exits with status 1 when any benchmark regresses by more than `--threshold`.
+"""
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from cs2.data_model.fast_loader import load_projected
+from cs2.data_model.hash_name_index import HashNameIndex, parse_hash_name
+from cs2.data_model.response_model import Info
+from cs2.optimize.breakpoints import optimize_mix
+from cs2.optimize.ga import TradeUpProblem, score
+from cs2.optimize.ga_fitness import batch_evaluate, container_possibilities, weapon_float
+from cs2.optimize.input_solver import InputSolver
+from cs2.optimize.outcome_index import OutcomeIndex
+from cs2.optimize.utilities import HashNameTable, Item, build_weapon_identity, return_hash_name
+
+from fixtures import PRICE_CSV, synthetic_goods, write_goods_jsonl
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+BENCHMARKS: dict[str, Callable[["Context"], dict]] = {}
+
+
+def benchmark(func):
+    BENCHMARKS[func.__name__.removeprefix('bench_')] = func
+    return func
+
+def rate(func: Callable[[], int], min_time: float = 0.5) -> float:
+    """Operations per second of `func`, which returns how many operations one call did."""
+    ops, start = 0, time.perf_counter()
+    while True:
+        ops += func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return ops / elapsed
+
+def best_time(func: Callable[[], object], repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def per_second(value: float) -> dict:
+    return {'value': value, 'unit': 'ops/s', 'higher_is_better': True}
+
+def seconds(value: float) -> dict:
+    return {'value': value, 'unit': 's', 'higher_is_better': False}
+
+
+class Context:
+    """Fixtures shared by every benchmark, built once."""
+
+    def __init__(self, num_containers: int, seed: int):
+        self.rng = np.random.default_rng(seed)
+        self.records = [r for r in synthetic_goods(num_containers, seed)
+                        if r['data']['goods_info']['quality_localized_name'] == '普通']
+        self.items = [Item.model_validate({**r, 'tradable': True}) for r in self.records]
+        self.mappings = defaultdict(lambda: defaultdict(list))
+        for item in self.items:
+            self.mappings[item.data.container[0].name][item.data.goods_info.rarity_localized_name].append(item)
+        self.identity = build_weapon_identity(self.mappings)
+        self.index = OutcomeIndex.from_identity(self.identity)
+        self.hash_names = HashNameTable(self.index.weapon_names)
+        self.prices = {r['data']['goods_info']['market_hash_name']: r['data']['goods_info']['yyyp_sell_price']
+                       for r in self.records}
+        self.price_table = pd.read_csv(PRICE_CSV)
+        self.solver = InputSolver(self.price_table)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.goods_jsonl = write_goods_jsonl(Path(self.tmp.name) / 'goods_synthetic.jsonl', num_containers, seed)
+
+    def outcome_prices(self, outcome_ids: np.ndarray) -> np.ndarray:
+        hash_ids = self.hash_names.table[outcome_ids]
+        return np.array([[self.prices.get(self.hash_names.names[h], 0.0) for h in row] for row in hash_ids.tolist()])
+
+    def problem(self, quality: str = '普通', rarity: str = '受限') -> TradeUpProblem:
+        listings = self.price_table[(self.price_table['quality'] == quality) & (self.price_table['rarity'] == rarity)]
+        listings = listings.dropna(subset=['new_abrade', 'price'])
+        containers = sorted(set(listings['container']) & set(self.identity))
+        listings = listings[listings['container'].isin(containers)]
+        outcomes = self.index.contract_outcomes(containers, rarity)
+        return TradeUpProblem.from_arrays(
+            listing_container=listings['container'].map({c: i for i, c in enumerate(containers)}).to_numpy(),
+            listing_float=listings['new_abrade'].to_numpy(),
+            listing_price=listings['price'].to_numpy(),
+            outcome_container=outcomes.outcome_container,
+            outcome_ranges=outcomes.outcome_ranges,
+            outcome_prices=self.outcome_prices(outcomes.outcome_ids),
+        )
+
+
+@benchmark
+def bench_container_possibilities(ctx: Context) -> dict:
+    containers = {'a': (3, 4), 'b': (5, 2), 'c': (2, 5)}
+    return per_second(rate(lambda: (container_possibilities(containers), 1)[1]))
+
+@benchmark
+def bench_weapon_float(ctx: Context) -> dict:
+    floats = ctx.rng.random(10).tolist()
+    return per_second(rate(lambda: (weapon_float(floats, 0.06, 0.8), 1)[1]))
+
+@benchmark
+def bench_batch_evaluate(ctx: Context) -> dict:
+    n = 100_000
+    counts = ctx.rng.multinomial(10, [0.25] * 4, size=n)
+    floats = ctx.rng.random((n, 10))
+    outcome_container = np.repeat(np.arange(4), 3)
+    outcome_ranges = np.sort(ctx.rng.random((12, 2)), axis=1)
+    prices = ctx.rng.random((12, 5)) * 100
+    return per_second(rate(lambda: (batch_evaluate(counts, floats, outcome_container, outcome_ranges, prices), n)[1]))
+
+@benchmark
+def bench_build_weapon_identity(ctx: Context) -> dict:
+    return seconds(best_time(lambda: build_weapon_identity(ctx.mappings)))
+
+@benchmark
+def bench_outcome_index_build(ctx: Context) -> dict:
+    return seconds(best_time(lambda: OutcomeIndex.from_identity(ctx.identity)))
+
+@benchmark
+def bench_return_hash_name(ctx: Context) -> dict:
+    floats = ctx.rng.random(1000).tolist()
+    return per_second(rate(lambda: (list(map(lambda f: return_hash_name('AK-47 | Redline', f), floats)), 1000)[1]))
+
+@benchmark
+def bench_hash_name_resolve(ctx: Context) -> dict:
+    n = 100_000
+    weapon_ids = ctx.rng.integers(0, len(ctx.index), n)
+    floats = ctx.rng.random(n)
+    return per_second(rate(lambda: (ctx.hash_names.resolve(weapon_ids, floats), n)[1]))
+
+@benchmark
+def bench_hash_name_index_build(ctx: Context) -> dict:
+    names = [r['data']['goods_info']['market_hash_name'] for r in ctx.records]
+    # parse from scratch every round, not from the cache of the previous one
+    return seconds(best_time(lambda: (parse_hash_name.cache_clear(), HashNameIndex.from_names(names))))
+
+@benchmark
+def bench_input_solver_queries(ctx: Context) -> dict:
+    key = ctx.price_table.groupby(['quality', 'container', 'rarity']).size().idxmax()
+    ctx.solver.cost(key, 0.5)
+    targets = ctx.rng.random(1000).tolist()
+    return per_second(rate(lambda: (list(map(lambda t: ctx.solver.cost(key, t), targets)), 1000)[1]))
+
+@benchmark
+def bench_ga_contracts(ctx: Context) -> dict:
+    """End to end GA scoring: contracts evaluated per second."""
+    problem = ctx.problem()
+    n = 50_000
+    genomes = ctx.rng.integers(0, len(problem.listing_float), size=(n, 10))
+    return per_second(rate(lambda: (score(problem, genomes), n)[1]))
+
+@benchmark
+def bench_breakpoint_contracts(ctx: Context) -> dict:
+    """End to end exact search: single container contracts priced per second, breakpoints included."""
+    rarity = '受限'
+    keys = [key for key in ctx.solver.groups if key[0] == '普通' and key[2] == rarity and key[1] in ctx.identity]
+
+    def run():
+        evaluated = 0
+        for key in keys:
+            outcomes = ctx.index.contract_outcomes([key[1]], rarity)
+            if not len(outcomes.outcome_ids):
+                continue
+            breakpoints = optimize_mix(
+                np.array([10]), outcomes.outcome_container, outcomes.outcome_ranges,
+                ctx.outcome_prices(outcomes.outcome_ids), ctx.solver.input_cost([key], [10]),
+            )
+            evaluated += len(breakpoints)
+        return evaluated
+
+    run()
+    return per_second(rate(run))
+
+@benchmark
+def bench_goods_full_validation(ctx: Context) -> dict:
+    """Snapshot lines per second through `Info.model_validate_json`."""
+    def run():
+        with open(ctx.goods_jsonl, 'r', encoding='utf-8') as f:
+            return len([Info.model_validate_json(line) for line in f])
+    return per_second(rate(run))
+
+@benchmark
+def bench_goods_projected_load(ctx: Context) -> dict:
+    """Snapshot lines per second through `fast_loader.load_projected`, compare with goods_full_validation."""
+    return per_second(rate(lambda: len(load_projected(ctx.goods_jsonl))))
+
+
+def compare(results: dict, previous_path: Path, threshold: float) -> bool:
+    previous = json.loads(previous_path.read_text(encoding='utf-8'))['results']
+    regressed = False
+    print(f"\ncompared with {previous_path}")
+    for name, result in results.items():
+        if name not in previous:
+            continue
+        old, new = previous[name]['value'], result['value']
+        ratio = new / old if result['higher_is_better'] else old / new
+        flag = ''
+        if ratio < 1 - threshold:
+            flag = '  REGRESSION'
+            regressed = True
+        print(f"{name:<32} {ratio:>8.2f}x{flag}")
+    return regressed
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--containers', type=int, default=40, help='containers in the synthetic snapshot')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--only', nargs='*', choices=sorted(BENCHMARKS), help='run a subset')
+    parser.add_argument('--output', type=Path, default=RESULTS_DIR, help='directory for the json results')
+    parser.add_argument('--compare', type=Path, help='previous results json')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed relative slow down')
+    args = parser.parse_args(argv)
+
+    ctx = Context(args.containers, args.seed)
+    results = {}
+    for name in args.only or BENCHMARKS:
+        results[name] = BENCHMARKS[name](ctx)
+        print(f"{name:<32} {results[name]['value']:>14,.4g} {results[name]['unit']}")
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    output = args.output / f"bench_{stamp}.json"
+    output.write_text(json.dumps({
+        'timestamp': stamp,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'results': results,
+    }, indent=2), encoding='utf-8')
+    print(f"\nsaved {output}")
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
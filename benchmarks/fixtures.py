@@ -0,0 +1,100 @@
+"""
+Synthetic goods snapshot shaped like `/api/v1/info/good` responses.
+
+Containers are taken from `price.csv` when it is available so the synthetic
+outcomes line up with the real input listings; everything is drawn from a seeded
+generator, the same arguments always give the same snapshot.
+"""
+import json
+from pathlib import Path
+
+import numpy as np
+
+from cs2.data_model.response_model import GoodsInfo
+from cs2.scrape.cs2_terms import rank_to_rarity, wear_value
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PRICE_CSV = REPO_ROOT / 'price.csv'
+# weapons per rarity rank of every synthetic container
+WEAPONS_PER_RANK = {1: 4, 2: 4, 3: 6, 4: 5, 5: 3, 6: 2}
+QUALITIES = {'普通': '', 'StatTrak™': 'StatTrak™ '}
+
+
+def container_names(limit: int | None = None) -> list[str]:
+    if PRICE_CSV.exists():
+        import pandas as pd
+        names = sorted(pd.read_csv(PRICE_CSV, usecols=['container'])['container'].dropna().unique())
+    else:
+        names = [f"Synthetic Case {i}" for i in range(limit or 80)]
+    return names[:limit] if limit else names
+
+def _goods_info(rng: np.random.Generator, good_id: int, hash_name: str, rarity: str, quality: str,
+                exterior: str, min_float: float, max_float: float) -> dict:
+    info = {}
+    for field, spec in GoodsInfo.model_fields.items():
+        if spec.annotation is int:
+            info[field] = int(rng.integers(0, 1000))
+        elif spec.annotation is str:
+            info[field] = ''
+        elif 'datetime' in str(spec.annotation):
+            info[field] = '2025-09-25T00:00:00'
+        else:
+            info[field] = round(float(rng.random() * 500), 2)
+    info.update(
+        id=good_id, buff_id=good_id, yyyp_id=good_id, name=hash_name, market_hash_name=hash_name,
+        min_float=min_float, max_float=max_float, rarity_localized_name=rarity,
+        quality_localized_name=quality, exterior_localized_name=exterior, group_hash_name=None,
+    )
+    return info
+
+def synthetic_goods(num_containers: int | None = 40, seed: int = 0) -> list[dict]:
+    """One response dict per hash name, for every wear tier a weapon's float range reaches."""
+    rng = np.random.default_rng(seed)
+    records, good_id = [], 1
+    for c, container_name in enumerate(container_names(num_containers)):
+        container = {
+            'comment': '', 'created_at': '2020-01-01', 'id': c, 'name': container_name,
+            'price': round(float(rng.random() * 10), 2), 'url': None, 'roi': None,
+        }
+        for rank, count in WEAPONS_PER_RANK.items():
+            for w in range(count):
+                min_float = float(rng.choice([0.0, 0.0, 0.06, 0.1]))
+                max_float = float(rng.choice([0.5, 0.7, 0.8, 1.0]))
+                weapon_name = f"W{c}-{rank}-{w} | Synthetic"
+                for quality, prefix in QUALITIES.items():
+                    for wear_rank, range_str in wear_value.items():
+                        low, high = map(float, range_str.split('-'))
+                        if high <= min_float or low >= max_float:
+                            continue
+                        hash_name = f"{prefix}{weapon_name} ({wear_rank})"
+                        # like the api, every hash name carries the float range of its own wear tier
+                        goods_info = _goods_info(rng, good_id, hash_name, rank_to_rarity[rank], quality,
+                                                 wear_rank, max(low, min_float), min(high, max_float))
+                        # sibling wear tiers and their supply, as the api lists them on every item
+                        siblings = [
+                            {'name': tier, 'id': good_id + i, 'current': tier == wear_rank, 'switch': False}
+                            for i, tier in enumerate(wear_value)
+                        ]
+                        statistic_list = [
+                            {'name': f"{prefix}{weapon_name} ({tier})", 'statistic': float(rng.integers(0, 10000)),
+                             'statistic_at': '2025-09-25', 'id': good_id + i, 'exterior_localized_name': tier,
+                             'quality_localized_name': quality, 'rarity_localized_name': rank_to_rarity[rank]}
+                            for i, tier in enumerate(wear_value)
+                        ]
+                        records.append({
+                            'code': 200,
+                            'msg': 'Success',
+                            'data': {
+                                'button_list': siblings, 'container': [container], 'dpl': [],
+                                'goods_info': goods_info, 'is_collection': [], 'statistic_list': statistic_list,
+                            },
+                        })
+                        good_id += 1
+    return records
+
+def write_goods_jsonl(path: str | Path, num_containers: int | None = 40, seed: int = 0) -> Path:
+    path = Path(path)
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in synthetic_goods(num_containers, seed):
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return path
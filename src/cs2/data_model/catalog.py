@@ -0,0 +1,178 @@
+"""
+Struct-of-arrays catalog of the whole market.
+
+One `Info` per item keeps about 80 optional fields, datetimes and nested models
+alive as Python objects. `GoodsCatalog` keeps every `GoodsInfo` field as one typed
+NumPy column instead: int64, float64 with nan for None, datetime64[us], and strings
+interned into int32 codes (-1 for None) over a shared vocabulary. Containers are
+stored once and linked to items CSR-style through `container_offsets` and
+`container_rows`. Hash names are parsed once into a `HashNameIndex` over the
+`market_hash_name` vocabulary.
+"""
+from datetime import datetime, timezone
+from typing import Iterable
+
+import numpy as np
+
+from cs2.data_model.hash_name_index import HashNameIndex
+from cs2.data_model.response_model import Container, Data, GoodsInfo, Info
+
+
+def field_kind(annotation) -> str:
+    text = str(annotation)
+    if annotation is int:
+        return 'int'
+    if annotation is float or 'float' in text:
+        return 'float'
+    if annotation is datetime or 'datetime' in text:
+        return 'datetime'
+    return 'string'
+
+GOODS_KINDS = {name: field_kind(spec.annotation) for name, spec in GoodsInfo.model_fields.items()}
+CONTAINER_KINDS = {name: field_kind(spec.annotation) for name, spec in Container.model_fields.items()}
+
+
+def encode_column(values: list, kind: str) -> tuple[np.ndarray, list[str] | None]:
+    """Typed array of python values, plus the vocabulary of string columns."""
+    if kind == 'int':
+        return np.array(values, dtype=np.int64), None
+    if kind == 'float':
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64), None
+    if kind == 'datetime':
+        # numpy has no time zones, aware values are stored as naive UTC
+        stamps = [v.astimezone(timezone.utc).replace(tzinfo=None) if v is not None and v.tzinfo else v
+                  for v in values]
+        return np.array(stamps, dtype='datetime64[us]'), None
+    vocab, codes = {}, np.empty(len(values), dtype=np.int32)
+    for i, v in enumerate(values):
+        codes[i] = -1 if v is None else vocab.setdefault(v, len(vocab))
+    return codes, list(vocab)
+
+def decode_value(array: np.ndarray, index: int, kind: str, vocab: list[str] | None):
+    """Python value of one cell, the inverse of `encode_column`."""
+    value = array[index]
+    if kind == 'int':
+        return int(value)
+    if kind == 'float':
+        return None if np.isnan(value) else float(value)
+    if kind == 'datetime':
+        return None if np.isnat(value) else value.astype(datetime)
+    return None if value < 0 else vocab[value]
+
+
+class GoodsCatalog:
+    """Columns of every item, rows sorted by `yyyp_id`."""
+
+    def __init__(
+        self,
+        goods: dict[str, np.ndarray],
+        goods_vocabs: dict[str, list[str]],
+        containers: dict[str, np.ndarray],
+        container_vocabs: dict[str, list[str]],
+        container_offsets: np.ndarray,
+        container_rows: np.ndarray,
+        hash_name_index: HashNameIndex | None = None,
+    ):
+        self.goods = goods
+        self.goods_vocabs = goods_vocabs
+        self.containers = containers
+        self.container_vocabs = container_vocabs
+        self.container_offsets = container_offsets
+        self.container_rows = container_rows
+        self._codes: dict[str, dict[str, int]] = {}
+        self.hash_name_index = hash_name_index or HashNameIndex.from_names(goods_vocabs['market_hash_name'])
+
+    def __len__(self) -> int:
+        return len(self.goods['yyyp_id'])
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the arrays, vocabularies excluded."""
+        arrays = [*self.goods.values(), *self.containers.values(), self.container_offsets, self.container_rows]
+        return sum(a.nbytes for a in arrays)
+
+    @classmethod
+    def from_infos(cls, infos: Iterable[Info]) -> "GoodsCatalog":
+        """Build from validated responses, the last record of a duplicated yyyp_id wins."""
+        by_id = {info.data.goods_info.yyyp_id: info for info in infos}
+        ordered = [by_id[k] for k in sorted(by_id)]
+        goods, goods_vocabs = {}, {}
+        for name, kind in GOODS_KINDS.items():
+            goods[name], vocab = encode_column([getattr(info.data.goods_info, name) for info in ordered], kind)
+            if vocab is not None:
+                goods_vocabs[name] = vocab
+
+        container_ids: dict[int, int] = {}
+        container_list: list[Container] = []
+        offsets, rows = [0], []
+        for info in ordered:
+            for container in info.data.container:
+                if container.id not in container_ids:
+                    container_ids[container.id] = len(container_list)
+                    container_list.append(container)
+                rows.append(container_ids[container.id])
+            offsets.append(len(rows))
+        containers, container_vocabs = {}, {}
+        for name, kind in CONTAINER_KINDS.items():
+            containers[name], vocab = encode_column([getattr(c, name) for c in container_list], kind)
+            if vocab is not None:
+                container_vocabs[name] = vocab
+        return cls(goods, goods_vocabs, containers, container_vocabs,
+                   np.array(offsets, dtype=np.int64), np.array(rows, dtype=np.int32))
+
+    def rows(self, yyyp_ids) -> np.ndarray:
+        """Row of every yyyp_id, -1 when it is not in the catalog."""
+        yyyp_ids = np.asarray(yyyp_ids, dtype=np.int64)
+        ids = self.goods['yyyp_id']
+        rows = np.searchsorted(ids, yyyp_ids)
+        found = rows < len(ids)
+        found[found] = ids[rows[found]] == yyyp_ids[found]
+        return np.where(found, rows, -1)
+
+    def row(self, yyyp_id: int) -> int:
+        row = int(self.rows([yyyp_id])[0])
+        if row < 0:
+            raise KeyError(yyyp_id)
+        return row
+
+    def column(self, name: str, rows=slice(None)) -> np.ndarray:
+        """Decoded column, strings as an object array with None for missing values."""
+        array = self.goods[name][rows]
+        if GOODS_KINDS[name] != 'string':
+            return array
+        return np.array(self.goods_vocabs[name] + [None], dtype=object)[array]
+
+    def code(self, name: str, value: str) -> int:
+        """Interned code of a string, -1 when absent; compare against `goods[name]` instead of strings."""
+        if name not in self._codes:
+            self._codes[name] = {v: i for i, v in enumerate(self.goods_vocabs[name])}
+        return self._codes[name].get(value, -1)
+
+    def hash_ids(self, rows=slice(None)) -> np.ndarray:
+        """`hash_name_index` id of every row, the interned `market_hash_name` codes."""
+        return self.goods['market_hash_name'][rows]
+
+    def container_names(self, row: int) -> list[str]:
+        start, end = self.container_offsets[row], self.container_offsets[row + 1]
+        names = self.container_vocabs['name']
+        return [names[code] for code in self.containers['name'][self.container_rows[start:end]].tolist()]
+
+    def to_info(self, row: int) -> Info:
+        """Rebuild the response of one row. Only `goods_info` and `container` are kept in the
+        catalog, the button, doppler, collection and statistic lists come back empty."""
+        goods_info = {
+            name: decode_value(self.goods[name], row, kind, self.goods_vocabs.get(name))
+            for name, kind in GOODS_KINDS.items()
+        }
+        containers = []
+        for c in self.container_rows[self.container_offsets[row]:self.container_offsets[row + 1]].tolist():
+            containers.append(Container(**{
+                name: decode_value(self.containers[name], c, kind, self.container_vocabs.get(name))
+                for name, kind in CONTAINER_KINDS.items()
+            }))
+        data = Data(button_list=[], container=containers, dpl=[], goods_info=GoodsInfo(**goods_info),
+                    is_collection=[], statistic_list=[])
+        return Info(code=200, data=data, msg='Success')
+
+    def to_infos(self) -> list[Info]:
+        return [self.to_info(row) for row in range(len(self))]
@@ -0,0 +1,166 @@
+"""
+Projected, lazily validated loader for `goods_{date}.jsonl` snapshots.
+
+Most consumers only need a handful of `GoodsInfo` fields, so only the values
+of the projected fields are located and decoded on every line, the rest of the
+record is never parsed; the byte span of the line is kept alongside. Building the full `Info` model happens on demand through `LazyInfo.info`,
+which re-reads that span. Large files are split on line boundaries and parsed
+in worker processes.
+"""
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from cs2.data_model.response_model import GoodsInfo, Info
+
+DEFAULT_FIELDS = (
+    'yyyp_id',
+    'market_hash_name',
+    'min_float',
+    'max_float',
+    'rarity_localized_name',
+    'quality_localized_name',
+)
+# pseudo field holding the names of `data.container`
+CONTAINERS = 'containers'
+
+
+class LazyInfo:
+    """Projected fields of one line, attribute access, full `Info` only when asked."""
+
+    __slots__ = ('path', 'offset', 'length', 'fields', '_info')
+
+    def __init__(self, path: str, offset: int, length: int, fields: dict):
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self.fields = fields
+        self._info: Info | None = None
+
+    def __getattr__(self, name: str):
+        try:
+            return self.fields[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __repr__(self) -> str:
+        return f"LazyInfo({self.fields})"
+
+    @property
+    def info(self) -> Info:
+        """The fully validated response, parsed once and cached."""
+        if self._info is None:
+            with open(self.path, 'rb') as f:
+                f.seek(self.offset)
+                self._info = Info.model_validate_json(f.read(self.length))
+        return self._info
+
+
+def _chunk_bounds(path: str, chunks: int) -> list[tuple[int, int]]:
+    """Byte ranges covering the file, every range starting on a line."""
+    size = os.path.getsize(path)
+    bounds = [0]
+    with open(path, 'rb') as f:
+        for i in range(1, chunks):
+            f.seek(size * i // chunks)
+            f.readline()
+            bounds.append(max(f.tell(), bounds[-1]))
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+_decoder = json.JSONDecoder()
+# a json string (braces inside it do not count) or a brace
+_STRING_OR_BRACE = re.compile(r'"(?:[^"\\]|\\.)*"|[{}]')
+
+
+def _object_end(line: str, start: int) -> int:
+    """Index just past the object opening at `line[start]`, skipping over strings without decoding them."""
+    depth = 0
+    for match in _STRING_OR_BRACE.finditer(line, start):
+        token = match.group()
+        if token == '{':
+            depth += 1
+        elif token == '}':
+            depth -= 1
+            if depth == 0:
+                return match.end()
+    raise ValueError("Unterminated object")
+
+def _decode_value(line: str, key: str, start: int = 0, end: int | None = None):
+    """Decode the value of the first `key` in [start, end), without parsing the rest of the line."""
+    i = line.find(f'"{key}":', start, end)
+    if i < 0:
+        raise KeyError(key)
+    i += len(key) + 3
+    while line[i] == ' ':
+        i += 1
+    return _decoder.raw_decode(line, i)[0]
+
+def _project(line: str, goods_fields: list[str], containers: bool) -> dict:
+    try:
+        # every GoodsInfo field is scalar, so a match inside the `goods_info` object is the
+        # item's own value; a missing one must not be taken from a later `statistic_list`
+        start = line.index('{', line.index('"goods_info":'))
+        # its first closing brace ends it unless a string holds one, the exact end is only scanned for then
+        end = line.find('}', start)
+        try:
+            projected = {name: _decode_value(line, name, start, end) for name in goods_fields}
+        except KeyError:
+            end = _object_end(line, start)
+            projected = {name: _decode_value(line, name, start, end) for name in goods_fields}
+        if containers:
+            projected[CONTAINERS] = [c['name'] for c in _decode_value(line, 'container')]
+    except (KeyError, ValueError, IndexError):
+        # unexpected layout, fall back to parsing the whole line
+        data = json.loads(line)['data']
+        projected = {name: data['goods_info'].get(name) for name in goods_fields}
+        if containers:
+            projected[CONTAINERS] = [c['name'] for c in data.get('container', [])]
+    return projected
+
+def _parse_range(path: str, start: int, end: int, fields: tuple[str, ...]) -> list[tuple[int, int, dict]]:
+    records = []
+    goods_fields = [f for f in fields if f != CONTAINERS]
+    containers = CONTAINERS in fields
+    with open(path, 'rb') as f:
+        f.seek(start)
+        offset = start
+        while offset < end:
+            line = f.readline()
+            if not line:
+                break
+            if line.strip():
+                records.append((offset, len(line), _project(line.decode('utf-8'), goods_fields, containers)))
+            offset += len(line)
+    return records
+
+def load_projected(
+    path: str | Path,
+    fields: tuple[str, ...] = DEFAULT_FIELDS + (CONTAINERS,),
+    workers: int | None = None,
+    min_chunk_bytes: int = 8 << 20,
+) -> list[LazyInfo]:
+    """Read a snapshot keeping only `fields`.
+    Args:
+        path (str | Path): `goods_{date}.jsonl` file.
+        fields (tuple[str, ...]): `GoodsInfo` field names, and `containers` for the container names.
+        workers (int | None): Worker processes, one per cpu by default; files smaller than
+            `min_chunk_bytes` per worker are read in this process.
+    """
+    unknown = [f for f in fields if f != CONTAINERS and f not in GoodsInfo.model_fields]
+    if unknown:
+        raise ValueError(f"Unknown GoodsInfo fields: {unknown}")
+    path = str(path)
+    workers = os.cpu_count() if workers is None else workers
+    chunks = max(1, min(workers, os.path.getsize(path) // min_chunk_bytes))
+    if chunks == 1:
+        parsed = [_parse_range(path, 0, os.path.getsize(path), tuple(fields))]
+    else:
+        bounds = _chunk_bounds(path, chunks)
+        with ProcessPoolExecutor(max_workers=chunks) as executor:
+            parsed = list(executor.map(
+                _parse_range, [path] * len(bounds), *zip(*bounds), [tuple(fields)] * len(bounds)
+            ))
+    return [LazyInfo(path, offset, length, projected) for chunk in parsed for offset, length, projected in chunk]
@@ -0,0 +1,172 @@
+"""
+Parsed, interned `market_hash_name`s.
+
+A hash name such as `StatTrak™ AK-47 | Redline (Field-Tested)` is split once into
+its weapon name (`StatTrak™ AK-47 | Redline`, the name without the wear tier), its
+base name (`AK-47 | Redline`, also without the StatTrak™ / Souvenir prefix), the
+wear tier and the two flags. Every name, weapon name and base name gets an integer
+id, so downstream code compares ids instead of running regexes over strings.
+
+Ids of hash names follow the order of the names the index is built from; built from
+the `market_hash_name` vocabulary of a `GoodsCatalog` they are the catalog's codes,
+so `index.wear[catalog.goods['market_hash_name']]` is the wear tier of every row.
+
+    hash_names/
+      names.json          hash names, weapon names and base names
+      arrays.npz          weapon_ids, base_ids, wear, stattrak, souvenir
+"""
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from cs2.scrape.cs2_terms import value_to_wear
+
+# wear tiers in the order of `value_to_wear`, the same indices as `utilities.WEAR_RANKS`
+WEAR_RANKS = list(value_to_wear.values())
+_wear_tiers = {wear_rank: tier for tier, wear_rank in enumerate(WEAR_RANKS)}
+STATTRAK = 'StatTrak™'
+SOUVENIR = 'Souvenir'
+STAR = '★'
+
+
+class ParsedHashName(NamedTuple):
+    weapon_name: str
+    base_name: str
+    # index into `WEAR_RANKS`, -1 for items without a wear tier
+    wear: int
+    stattrak: bool
+    souvenir: bool
+
+
+@lru_cache(maxsize=None)
+def parse_hash_name(hash_name: str) -> ParsedHashName:
+    weapon_name, wear = hash_name.strip(), -1
+    if weapon_name.endswith(')'):
+        start = weapon_name.rfind('(')
+        tier = _wear_tiers.get(weapon_name[start + 1:-1], -1) if start >= 0 else -1
+        if tier >= 0:
+            weapon_name, wear = weapon_name[:start].rstrip(), tier
+
+    star = weapon_name.startswith(STAR)
+    rest = weapon_name.removeprefix(STAR).lstrip()
+    stattrak = rest.startswith(STATTRAK)
+    souvenir = rest.startswith(SOUVENIR + ' ')
+    if stattrak:
+        rest = rest.removeprefix(STATTRAK).lstrip()
+    elif souvenir:
+        rest = rest.removeprefix(SOUVENIR).lstrip()
+    base_name = f"{STAR} {rest}" if star else rest
+    return ParsedHashName(weapon_name, base_name, wear, stattrak, souvenir)
+
+
+def _intern(values: list[str]) -> tuple[list[str], np.ndarray]:
+    vocab: dict[str, int] = {}
+    ids = np.array([vocab.setdefault(v, len(vocab)) for v in values], dtype=np.int32)
+    return list(vocab), ids
+
+
+class HashNameIndex:
+    """Parsed fields of every hash name as arrays indexed by hash name id."""
+
+    def __init__(
+        self,
+        hash_names: list[str],
+        weapon_names: list[str],
+        base_names: list[str],
+        arrays: dict[str, np.ndarray],
+    ):
+        self.hash_names = hash_names
+        self.weapon_names = weapon_names
+        self.base_names = base_names
+        self.weapon_ids: np.ndarray = arrays['weapon_ids']
+        self.base_ids: np.ndarray = arrays['base_ids']
+        self.wear: np.ndarray = arrays['wear']
+        self.stattrak: np.ndarray = arrays['stattrak']
+        self.souvenir: np.ndarray = arrays['souvenir']
+        self._ids: dict[str, int] | None = None
+        self._weapon_ids: dict[str, int] | None = None
+        self._variants: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return len(self.hash_names)
+
+    @classmethod
+    def from_names(cls, hash_names: list[str]) -> "HashNameIndex":
+        parsed = [parse_hash_name(name) for name in hash_names]
+        weapon_names, weapon_ids = _intern([p.weapon_name for p in parsed])
+        base_names, base_ids = _intern([p.base_name for p in parsed])
+        arrays = {
+            'weapon_ids': weapon_ids,
+            'base_ids': base_ids,
+            'wear': np.array([p.wear for p in parsed], dtype=np.int8),
+            'stattrak': np.array([p.stattrak for p in parsed], dtype=bool),
+            'souvenir': np.array([p.souvenir for p in parsed], dtype=bool),
+        }
+        return cls(list(hash_names), weapon_names, base_names, arrays)
+
+    def save(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        names = {'hash_names': self.hash_names, 'weapon_names': self.weapon_names, 'base_names': self.base_names}
+        (path / 'names.json').write_text(json.dumps(names, ensure_ascii=False), encoding='utf-8')
+        np.savez(path / 'arrays.npz', weapon_ids=self.weapon_ids, base_ids=self.base_ids,
+                 wear=self.wear, stattrak=self.stattrak, souvenir=self.souvenir)
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path) -> "HashNameIndex":
+        path = Path(path)
+        names = json.loads((path / 'names.json').read_text(encoding='utf-8'))
+        with np.load(path / 'arrays.npz') as arrays:
+            arrays = dict(arrays)
+        return cls(names['hash_names'], names['weapon_names'], names['base_names'], arrays)
+
+    @classmethod
+    def cached(cls, path: str | Path, hash_names: list[str]) -> "HashNameIndex":
+        """Index saved at `path` when it was built from the same names, otherwise build and save it."""
+        path = Path(path)
+        if (path / 'names.json').exists():
+            index = cls.load(path)
+            if index.hash_names == list(hash_names):
+                return index
+        index = cls.from_names(hash_names)
+        try:
+            index.save(path)
+        except OSError:
+            # read-only snapshot, the index is simply rebuilt next time
+            pass
+        return index
+
+    def id(self, hash_name: str) -> int:
+        """Id of a hash name, -1 when absent."""
+        if self._ids is None:
+            self._ids = {name: i for i, name in enumerate(self.hash_names)}
+        return self._ids.get(hash_name, -1)
+
+    def weapon_id(self, weapon_name: str) -> int:
+        """Id of a weapon name (a hash name without its wear tier), -1 when absent."""
+        if self._weapon_ids is None:
+            self._weapon_ids = {name: i for i, name in enumerate(self.weapon_names)}
+        return self._weapon_ids.get(weapon_name, -1)
+
+    @property
+    def variants(self) -> np.ndarray:
+        """(weapon id, wear tier) -> hash name id, -1 for tiers the weapon does not come in."""
+        if self._variants is None:
+            variants = np.full((len(self.weapon_names), len(WEAR_RANKS)), -1, dtype=np.int32)
+            has_wear = np.flatnonzero(self.wear >= 0)
+            variants[self.weapon_ids[has_wear], self.wear[has_wear]] = has_wear
+            self._variants = variants
+        return self._variants
+
+    def parsed(self, hash_id: int) -> ParsedHashName:
+        return ParsedHashName(
+            self.weapon_names[self.weapon_ids[hash_id]],
+            self.base_names[self.base_ids[hash_id]],
+            int(self.wear[hash_id]),
+            bool(self.stattrak[hash_id]),
+            bool(self.souvenir[hash_id]),
+        )
@@ -0,0 +1,214 @@
+"""
+Append-only price history across daily `goods_{date}.jsonl` snapshots.
+
+Only changes are stored: appending a snapshot diffs it against the latest known
+values and writes one fixed-size record (day, yyyp_id, field, value, previous)
+per price or count that moved. A quiet day costs a few records instead of a full
+copy of the market.
+
+    history/
+      records.bin    structured records, appended day after day
+      days.json      date and record span of every snapshot
+      state.npz      latest value of every (yyyp_id, field), used to diff the next snapshot
+
+`days.json` is written last and is the only commit point of an append: records
+past its last span are truncated on open, and a `state.npz` tagged with another
+day count is rebuilt from the committed records.
+"""
+import json
+import os
+from datetime import date as Date, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from cs2.data_model.fast_loader import load_projected
+
+PRICE_FIELDS = (
+    'buff_sell_price',
+    'buff_buy_price',
+    'buff_sell_num',
+    'buff_buy_num',
+    'yyyp_sell_price',
+    'yyyp_buy_price',
+    'yyyp_sell_num',
+    'yyyp_buy_num',
+    'steam_sell_price',
+    'steam_buy_price',
+    'steam_sell_num',
+    'steam_buy_num',
+)
+RECORD = np.dtype([
+    ('day', '<i4'),
+    ('yyyp_id', '<i8'),
+    ('field', '<u1'),
+    ('value', '<f8'),
+    ('previous', '<f8'),
+])
+
+
+def _atomic_write(path: Path, write) -> None:
+    tmp = path.with_name(path.name + '.tmp')
+    write(tmp)
+    os.replace(tmp, path)
+
+
+class PriceHistory:
+    def __init__(self, path: str | Path, fields: tuple[str, ...] = PRICE_FIELDS):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.fields = fields
+        self._field_ids = {name: i for i, name in enumerate(fields)}
+        days_file = self.path / 'days.json'
+        self.days: list[dict] = json.loads(days_file.read_text(encoding='utf-8')) if days_file.exists() else []
+        # drop a partially written append: records past the last committed day
+        committed = self.days[-1]['end'] if self.days else 0
+        records_file = self.path / 'records.bin'
+        if records_file.exists() and records_file.stat().st_size > committed * RECORD.itemsize:
+            with open(records_file, 'r+b') as f:
+                f.truncate(committed * RECORD.itemsize)
+        self._records: np.ndarray | None = None
+        self._id_order: np.ndarray | None = None
+        self._sorted_ids: np.ndarray | None = None
+        state_file = self.path / 'state.npz'
+        state_days = -1
+        if state_file.exists():
+            with np.load(state_file) as state:
+                if 'days' in state:
+                    state_days = int(state['days'])
+                    self.ids, self.values = state['ids'], state['values']
+        if state_days != len(self.days):
+            # the state of an append that never committed, or of an untagged older version
+            self._rebuild_state()
+
+    def _rebuild_state(self) -> None:
+        """Latest value of every (yyyp_id, field) from the committed records."""
+        records = self.records
+        ids = np.unique(records['yyyp_id'])
+        values = np.full((len(ids), len(self.fields)), np.nan)
+        rows = np.searchsorted(ids, records['yyyp_id'])
+        key = rows * len(self.fields) + records['field']
+        # last record of every key, records are in append order
+        _, last = np.unique(key[::-1], return_index=True)
+        last = len(key) - 1 - last
+        values[rows[last], records['field'][last]] = records['value'][last]
+        self.ids, self.values = ids, values
+        self._write_state()
+
+    def _write_state(self) -> None:
+        def write_state(tmp: Path):
+            with open(tmp, 'wb') as f:
+                np.savez(f, ids=self.ids, values=self.values, days=np.int64(len(self.days)))
+        _atomic_write(self.path / 'state.npz', write_state)
+
+    @property
+    def dates(self) -> list[str]:
+        return [day['date'] for day in self.days]
+
+    @property
+    def records(self) -> np.ndarray:
+        """Every record, memory-mapped."""
+        if self._records is None:
+            records_file = self.path / 'records.bin'
+            if not records_file.exists() or records_file.stat().st_size == 0:
+                self._records = np.empty(0, dtype=RECORD)
+            else:
+                self._records = np.memmap(records_file, dtype=RECORD, mode='r')
+        return self._records
+
+    def append(self, date: str, yyyp_ids: np.ndarray, values: np.ndarray) -> int:
+        """Append one snapshot, returning the number of records written.
+        Args:
+            date (str): ISO date of the snapshot, later than every stored one.
+            yyyp_ids (np.ndarray): (N,) ids of the snapshot.
+            values (np.ndarray): (N, F) values of `fields`, nan for None.
+        """
+        if self.days and date <= self.days[-1]['date']:
+            raise ValueError(f"Snapshot {date} is not newer than {self.days[-1]['date']}")
+        yyyp_ids = np.asarray(yyyp_ids, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64).reshape(len(yyyp_ids), len(self.fields))
+
+        ids = np.union1d(self.ids, yyyp_ids)
+        state = np.full((len(ids), len(self.fields)), np.nan)
+        state[np.searchsorted(ids, self.ids)] = self.values
+        rows = np.searchsorted(ids, yyyp_ids)
+        previous = state[rows]
+        changed = ~((previous == values) | (np.isnan(previous) & np.isnan(values)))
+        item, field = np.nonzero(changed)
+
+        day = len(self.days)
+        records = np.empty(len(item), dtype=RECORD)
+        records['day'] = day
+        records['yyyp_id'] = yyyp_ids[item]
+        records['field'] = field
+        records['value'] = values[item, field]
+        records['previous'] = previous[item, field]
+        start = self.days[-1]['end'] if self.days else 0
+        with open(self.path / 'records.bin', 'ab') as f:
+            records.tofile(f)
+
+        state[rows] = values
+        self.ids, self.values = ids, state
+        self.days.append({'date': date, 'start': start, 'end': start + len(records)})
+        # tagged with the new day count, it only counts once days.json below commits the day
+        self._write_state()
+        _atomic_write(self.path / 'days.json', lambda tmp: tmp.write_text(json.dumps(self.days), encoding='utf-8'))
+        self._records, self._id_order = None, None
+        return len(records)
+
+    def append_jsonl(self, jsonl_path: str | Path, date: str | None = None) -> int:
+        """Append a `goods_{date}.jsonl` snapshot, the date defaults to the one in the file name."""
+        jsonl_path = Path(jsonl_path)
+        date = date or jsonl_path.stem.removeprefix('goods_')
+        items = load_projected(jsonl_path, fields=('yyyp_id', *self.fields), workers=None)
+        latest = {item.yyyp_id: item for item in items}
+        yyyp_ids = np.array(sorted(latest), dtype=np.int64)
+        values = np.array([[np.nan if latest[i].fields[f] is None else latest[i].fields[f] for f in self.fields]
+                           for i in yyyp_ids.tolist()], dtype=np.float64)
+        return self.append(date, yyyp_ids, values)
+
+    def _day_range(self, start: str | None, end: str | None) -> tuple[int, int]:
+        dates = self.dates
+        first = 0 if start is None else int(np.searchsorted(dates, start, side='left'))
+        last = len(dates) if end is None else int(np.searchsorted(dates, end, side='right'))
+        return first, last
+
+    def series(self, yyyp_id: int, field: str, start: str | None = None, end: str | None = None) -> tuple[list[str], np.ndarray]:
+        """Value of one field on every snapshot day in [start, end], nan before the first sighting."""
+        first, last = self._day_range(start, end)
+        if self._id_order is None:
+            # built once per opened history, then every id is a binary search away
+            self._id_order = np.argsort(self.records['yyyp_id'], kind='stable')
+            self._sorted_ids = self.records['yyyp_id'][self._id_order]
+        ids = self._sorted_ids
+        lo, hi = np.searchsorted(ids, yyyp_id, side='left'), np.searchsorted(ids, yyyp_id, side='right')
+        mine = self.records[self._id_order[lo:hi]]
+        mine = mine[mine['field'] == self._field_ids[field]]
+        # records of an id keep their append order, so days are already sorted
+        days = np.arange(first, last)
+        position = np.searchsorted(mine['day'], days, side='right') - 1
+        if not len(mine):
+            return self.dates[first:last], np.full(len(days), np.nan)
+        values = np.where(position >= 0, mine['value'][np.maximum(position, 0)], np.nan)
+        return self.dates[first:last], values
+
+    def recent(self, yyyp_id: int, field: str = 'yyyp_sell_price', days: int = 90) -> tuple[list[str], np.ndarray]:
+        """`series` over the last `days` calendar days before the latest snapshot."""
+        if not self.days:
+            return [], np.empty(0)
+        start = (Date.fromisoformat(self.days[-1]['date']) - timedelta(days=days)).isoformat()
+        return self.series(yyyp_id, field, start=start)
+
+    def movers(self, field: str = 'yyyp_sell_price', threshold: float = 0.05, date: str | None = None) -> np.ndarray:
+        """Records of ids whose value moved by more than `threshold` (relative) on `date`
+        against the snapshot before it, latest snapshot by default."""
+        if not self.days:
+            return np.empty(0, dtype=RECORD)
+        day = len(self.days) - 1 if date is None else self.dates.index(date)
+        span = self.days[day]
+        records = self.records[span['start']:span['end']]
+        records = records[records['field'] == self._field_ids[field]]
+        previous = records['previous']
+        with np.errstate(invalid='ignore', divide='ignore'):
+            change = np.abs(records['value'] - previous) / np.abs(previous)
+        return np.asarray(records[(change > threshold) & np.isfinite(change)])
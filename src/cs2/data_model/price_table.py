@@ -0,0 +1,205 @@
+"""
+Incremental builder of `price.csv` from the scraper output.
+
+Library version of the `notebooks/inspect.ipynb` pipeline: every listing of
+`scraped_data.jsonl` is mapped to the (quality, container, rarity) of its item,
+its abrade normalized to `new_abrade = abrade / (max_float - min_float)` and
+binned into 0.01 steps, and the cheapest listing of every
+(quality, container, rarity, abrade_bin) is kept.
+
+The source is streamed in chunks from a saved byte offset, so appending listings
+only costs the new lines, and memory is bounded by the chunk size plus one row per bin.
+Segments rotated away by `OutputSink` are read once each; the one that used to be
+the active file is recognized by its first line and resumed at the saved offset.
+"""
+import hashlib
+import json
+from collections import defaultdict
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from cs2.config import OUTPUT_FILE
+from cs2.data_model.fast_loader import CONTAINERS, load_projected
+from cs2.data_model.hash_name_index import parse_hash_name
+from cs2.scrape.cs2_terms import rarity
+from cs2.scrape.output_sink import open_segment, segments
+
+KEY_COLUMNS = ['quality', 'container', 'rarity', 'abrade_bin']
+COLUMNS = KEY_COLUMNS + ['yyid', 'commodityName', 'price', 'abrade', 'min_float', 'max_float', 'new_abrade']
+BIN_WIDTH = 0.01
+EXCLUDED_QUALITY = '纪念品'
+EXCLUDED_RARITY = '违禁'
+EXTRA_CONTAINERS = {'阿努比斯收藏包'}
+
+
+class ItemMeta(NamedTuple):
+    quality: str
+    container: str
+    rarity: str
+    min_float: float
+    max_float: float
+
+
+def build_item_meta(goods_jsonl: str | Path) -> dict[int, ItemMeta]:
+    """yyyp_id -> meta of every tradable-up item of a goods snapshot, with the notebook's filters:
+    no souvenirs, no contraband, only weapon cases and collections, and float ranges spanning all
+    wear tiers of the same weapon."""
+    fields = ('yyyp_id', 'market_hash_name', 'min_float', 'max_float',
+              'rarity_localized_name', 'quality_localized_name', CONTAINERS)
+    rarities = set(rarity.strip().splitlines()) - {EXCLUDED_RARITY}
+    items = [
+        item for item in load_projected(goods_jsonl, fields=fields, workers=None)
+        if item.quality_localized_name != EXCLUDED_QUALITY
+        and item.rarity_localized_name in rarities
+        and any('收藏品' in c or '武器箱' in c or c in EXTRA_CONTAINERS for c in item.containers)
+    ]
+    by_weapon = defaultdict(list)
+    for item in items:
+        by_weapon[parse_hash_name(item.market_hash_name).weapon_name].append(item)
+    meta = {}
+    for same_weapon in by_weapon.values():
+        mins = [i.min_float for i in same_weapon if i.min_float is not None]
+        maxs = [i.max_float for i in same_weapon if i.max_float is not None]
+        if not mins or not maxs:
+            continue
+        for item in same_weapon:
+            meta[item.yyyp_id] = ItemMeta(item.quality_localized_name, item.containers[0],
+                                          item.rarity_localized_name, min(mins), max(maxs))
+    return meta
+
+def bin_labels(new_abrade: np.ndarray) -> np.ndarray:
+    """0.01 bin label of every value, matching `pd.cut` over `np.arange(0, upper, 0.01)` with right=False."""
+    index = np.floor(np.asarray(new_abrade) / BIN_WIDTH).astype(np.int64)
+    # the grid is i * 0.01 in floating point, step back when the division rounded up past it
+    index -= (index * BIN_WIDTH > new_abrade)
+    index += ((index + 1) * BIN_WIDTH <= new_abrade)
+    return np.array([f"{round(i * BIN_WIDTH, 2)}-{round((i + 1) * BIN_WIDTH, 2)}" for i in index.tolist()], dtype=object)
+
+
+class PriceTableBuilder:
+    def __init__(
+        self,
+        meta: dict[int, ItemMeta],
+        source: str | Path = OUTPUT_FILE,
+        table_path: str | Path = 'price.csv',
+        chunk_size: int = 50_000,
+    ):
+        """
+        Args:
+            meta (dict[int, ItemMeta]): Output of `build_item_meta`.
+            source (str | Path): Active scraper output file, one listing json per line.
+            table_path (str | Path): Where the price table is saved, with its progress next to it.
+            chunk_size (int): Listings processed per chunk.
+        """
+        self.source = Path(source)
+        self.table_path = Path(table_path)
+        self.state_path = self.table_path.with_name(self.table_path.name + '.state.json')
+        self.chunk_size = chunk_size
+        self.meta = pd.DataFrame.from_dict(meta, orient='index', columns=list(ItemMeta._fields))
+        # progress in the active file, identified by the hash of its first line
+        self.offset = 0
+        self.head: str | None = None
+        # rotated segments already folded in
+        self.done: set[str] = set()
+        # (quality, container, rarity, abrade_bin) -> cheapest row so far
+        self.best: dict[tuple, tuple] = {}
+        self._load()
+
+    @classmethod
+    def from_goods(cls, goods_jsonl: str | Path, **kwargs) -> "PriceTableBuilder":
+        return cls(build_item_meta(goods_jsonl), **kwargs)
+
+    def _load(self) -> None:
+        """Resume from the saved table when it was built from the same source."""
+        if not (self.state_path.exists() and self.table_path.exists()):
+            return
+        state = json.loads(self.state_path.read_text(encoding='utf-8'))
+        if state.get('source') != str(self.source):
+            return
+        table = pd.read_csv(self.table_path)
+        self.best = {tuple(row[:4]): tuple(row[4:]) for row in table[COLUMNS].itertuples(index=False)}
+        self.offset = state['offset']
+        self.head = state.get('head')
+        self.done = set(state.get('done', []))
+
+    @staticmethod
+    def _head(path: Path) -> str | None:
+        with open_segment(path) as f:
+            line = f.readline()
+        return hashlib.sha1(line).hexdigest() if line.endswith(b'\n') else None
+
+    def _read_chunks(self, path: Path, start: int):
+        """Complete lines of `path` after byte `start`, `chunk_size` at a time, with the offset after
+        each chunk. A trailing line still being written is left for the next update."""
+        with open_segment(path, start) as f:
+            offset, lines = start, []
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                offset += len(line)
+                if line.strip():
+                    lines.append(line)
+                if len(lines) >= self.chunk_size:
+                    yield lines, offset
+                    lines = []
+            yield lines, offset
+
+    def _merge(self, lines: list[bytes]) -> None:
+        listings = [json.loads(line) for line in lines]
+        df = pd.DataFrame({
+            'yyid': [d.get('templateId') for d in listings],
+            'commodityName': [d.get('commodityName') for d in listings],
+            'price': pd.to_numeric([d.get('price') for d in listings], errors='coerce'),
+            'abrade': pd.to_numeric([d.get('abrade') for d in listings], errors='coerce'),
+        })
+        df = df.join(self.meta, on='yyid', how='inner').dropna(subset=['abrade', 'price', 'min_float', 'max_float'])
+        denom = df['max_float'] - df['min_float']
+        df['new_abrade'] = df['abrade'] / denom.where(denom > 0, np.nan)
+        df = df.replace([np.inf, -np.inf], np.nan).dropna(subset=['new_abrade'])
+        df = df[df['new_abrade'] >= 0]
+        if df.empty:
+            return
+        df['abrade_bin'] = bin_labels(df['new_abrade'].to_numpy())
+        cheapest = df.loc[df.groupby(KEY_COLUMNS, sort=False)['price'].idxmin()]
+        for row in cheapest[COLUMNS].itertuples(index=False):
+            key, value = tuple(row[:4]), tuple(row[4:])
+            current = self.best.get(key)
+            # value[2] is the price
+            if current is None or value[2] < current[2]:
+                self.best[key] = value
+
+    def update(self, save: bool = True) -> int:
+        """Fold the listings appended since the last update into the table, returning the bytes consumed."""
+        consumed = 0
+        for path in segments(self.source):
+            if path.name in self.done:
+                continue
+            head = self._head(path)
+            start = self.offset if head is not None and head == self.head else 0
+            offset = start
+            for lines, offset in self._read_chunks(path, start):
+                if lines:
+                    self._merge(lines)
+            consumed += offset - start
+            if path == self.source:
+                self.offset, self.head = offset, head
+            else:
+                self.done.add(path.name)
+                if head == self.head:
+                    # the active file this offset belonged to has been rotated away
+                    self.offset, self.head = 0, None
+        if save and consumed:
+            self.save()
+        return consumed
+
+    def table(self) -> pd.DataFrame:
+        rows = [key + value for key, value in self.best.items()]
+        return pd.DataFrame(rows, columns=COLUMNS).sort_values(KEY_COLUMNS, ignore_index=True)
+
+    def save(self) -> None:
+        self.table().to_csv(self.table_path, index=False)
+        state = {'source': str(self.source), 'offset': self.offset, 'head': self.head, 'done': sorted(self.done)}
+        self.state_path.write_text(json.dumps(state), encoding='utf-8')
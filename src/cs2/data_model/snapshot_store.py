@@ -0,0 +1,152 @@
+"""
+Columnar on-disk store of `goods_{date}.jsonl` snapshots.
+
+A snapshot is converted once; afterwards every `GoodsInfo` field is a `.npy`
+column that is memory-mapped on demand, so loading reads only the columns asked
+for. Rows are sorted by `yyyp_id`. Strings are interned into int32 codes with a
+json vocabulary (-1 for None), datetimes are `datetime64[us]` and missing prices
+are nan. Container membership is a side table: `containers/` holds one row per
+distinct container and `container_offsets` / `container_rows` map every item to
+its containers CSR-style.
+
+    snapshot/
+      manifest.json
+      goods/<field>.npy, goods/<field>.vocab.json
+      containers/<field>.npy, containers/<field>.vocab.json
+      container_offsets.npy, container_rows.npy
+      hash_names/         parsed `market_hash_name`s, see `hash_name_index`
+"""
+import json
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from cs2.data_model.catalog import CONTAINER_KINDS, GOODS_KINDS, GoodsCatalog
+from cs2.data_model.hash_name_index import HashNameIndex
+from cs2.data_model.response_model import Info
+
+MANIFEST = 'manifest.json'
+HASH_NAMES = 'hash_names'
+
+
+def _write_table(path: Path, columns: dict[str, np.ndarray], vocabs: dict[str, list[str]]) -> None:
+    path.mkdir(parents=True, exist_ok=True)
+    for name, array in columns.items():
+        np.save(path / f"{name}.npy", np.ascontiguousarray(array))
+        if name in vocabs:
+            (path / f"{name}.vocab.json").write_text(json.dumps(vocabs[name], ensure_ascii=False), encoding='utf-8')
+
+
+def read_infos(jsonl_path: str | Path) -> Iterator[Info]:
+    with open(jsonl_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield Info.model_validate_json(line)
+
+def write_snapshot(infos: Iterable[Info] | GoodsCatalog, path: str | Path, date: str | None = None) -> Path:
+    """Persist validated responses (or a catalog built from them) as a columnar snapshot,
+    the last record of a duplicated yyyp_id wins."""
+    path = Path(path)
+    catalog = infos if isinstance(infos, GoodsCatalog) else GoodsCatalog.from_infos(infos)
+    _write_table(path / 'goods', catalog.goods, catalog.goods_vocabs)
+    _write_table(path / 'containers', catalog.containers, catalog.container_vocabs)
+    np.save(path / 'container_offsets.npy', catalog.container_offsets)
+    np.save(path / 'container_rows.npy', catalog.container_rows)
+    catalog.hash_name_index.save(path / HASH_NAMES)
+
+    manifest = {'date': date, 'rows': len(catalog), 'containers': len(catalog.containers['id']),
+                'goods': GOODS_KINDS, 'container_fields': CONTAINER_KINDS}
+    (path / MANIFEST).write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding='utf-8')
+    return path
+
+def convert_jsonl(jsonl_path: str | Path, path: str | Path | None = None) -> Path:
+    """Convert `goods_{date}.jsonl` next to itself (or into `path`), validating every line once."""
+    jsonl_path = Path(jsonl_path)
+    path = Path(path) if path is not None else jsonl_path.with_suffix('')
+    date = jsonl_path.stem.removeprefix('goods_')
+    return write_snapshot(read_infos(jsonl_path), path, date=date)
+
+
+class _Table:
+    def __init__(self, path: Path, kinds: dict[str, str], mmap: bool):
+        self.path = path
+        self.kinds = kinds
+        self.mmap_mode = 'r' if mmap else None
+        self._arrays: dict[str, np.ndarray] = {}
+        self._vocabs: dict[str, list[str]] = {}
+
+    def array(self, name: str) -> np.ndarray:
+        """Raw column, string columns as their int32 codes."""
+        if name not in self.kinds:
+            raise KeyError(f"Unknown column: {name}")
+        if name not in self._arrays:
+            self._arrays[name] = np.load(self.path / f"{name}.npy", mmap_mode=self.mmap_mode)
+        return self._arrays[name]
+
+    def vocab(self, name: str) -> list[str]:
+        if name not in self._vocabs:
+            self._vocabs[name] = json.loads((self.path / f"{name}.vocab.json").read_text(encoding='utf-8'))
+        return self._vocabs[name]
+
+    def column(self, name: str, rows=slice(None)) -> np.ndarray:
+        """Decoded column, strings as an object array with None for missing values."""
+        array = self.array(name)[rows]
+        if self.kinds[name] != 'string':
+            return np.asarray(array)
+        vocab = np.array(self.vocab(name) + [None], dtype=object)
+        return vocab[array]
+
+
+class SnapshotStore:
+    """Read side of a converted snapshot, nothing is loaded before it is asked for."""
+
+    def __init__(self, path: str | Path, mmap: bool = True):
+        self.path = Path(path)
+        self.manifest = json.loads((self.path / MANIFEST).read_text(encoding='utf-8'))
+        self.goods = _Table(self.path / 'goods', self.manifest['goods'], mmap)
+        self.containers = _Table(self.path / 'containers', self.manifest['container_fields'], mmap)
+        mmap_mode = 'r' if mmap else None
+        self.container_offsets = np.load(self.path / 'container_offsets.npy', mmap_mode=mmap_mode)
+        self.container_rows = np.load(self.path / 'container_rows.npy', mmap_mode=mmap_mode)
+
+    def __len__(self) -> int:
+        return self.manifest['rows']
+
+    @property
+    def yyyp_ids(self) -> np.ndarray:
+        return self.goods.array('yyyp_id')
+
+    def rows(self, yyyp_ids) -> np.ndarray:
+        """Row of every yyyp_id, -1 when it is not in the snapshot."""
+        yyyp_ids = np.asarray(yyyp_ids, dtype=np.int64)
+        ids = self.yyyp_ids
+        rows = np.searchsorted(ids, yyyp_ids)
+        found = rows < len(ids)
+        found[found] = ids[rows[found]] == yyyp_ids[found]
+        return np.where(found, rows, -1)
+
+    def columns(self, names: list[str], rows=slice(None)) -> dict[str, np.ndarray]:
+        return {name: self.goods.column(name, rows) for name in names}
+
+    def container_names(self, row: int) -> list[str]:
+        start, end = self.container_offsets[row], self.container_offsets[row + 1]
+        return self.containers.column('name', self.container_rows[start:end]).tolist()
+
+    def catalog(self) -> GoodsCatalog:
+        """Every column as a `GoodsCatalog`, still memory-mapped when the store is."""
+        goods = {name: self.goods.array(name) for name in self.goods.kinds}
+        containers = {name: self.containers.array(name) for name in self.containers.kinds}
+        goods_vocabs = {n: self.goods.vocab(n) for n, kind in self.goods.kinds.items() if kind == 'string'}
+        container_vocabs = {n: self.containers.vocab(n) for n, kind in self.containers.kinds.items() if kind == 'string'}
+        return GoodsCatalog(goods, goods_vocabs, containers, container_vocabs,
+                            self.container_offsets, self.container_rows, self.hash_name_index())
+
+    def hash_name_index(self) -> HashNameIndex:
+        """Parsed hash names, read from the snapshot and rebuilt there when missing or stale."""
+        return HashNameIndex.cached(self.path / HASH_NAMES, self.goods.vocab('market_hash_name'))
+
+    def item_containers(self) -> tuple[np.ndarray, np.ndarray]:
+        """(item row, container row) of every membership, for joins against `containers`."""
+        counts = np.diff(self.container_offsets)
+        return np.repeat(np.arange(len(self)), counts), np.asarray(self.container_rows)
@@ -0,0 +1,119 @@
+"""
+Exact optimizer over the critical average floats of a container mix.
+
+An outcome only changes price when its output float (`ga_fitness.weapon_float`)
+crosses a wear boundary. Output floats rise with the average input float, so for
+a fixed container mix the expected value is a step function of the average, constant
+on every interval (b_k, b_k+1] between consecutive breakpoints. Since cheaper inputs
+only ever need a higher average, the best contract of an interval sits on its right
+end; evaluating those few points is exact.
+
+Average floats are in the space `weapon_float` averages in; `input_solver.InputSolver`
+prices inputs in the space its `float_space` names, which must be the same one.
+"""
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+from cs2.optimize.ga.problem import TradeUpProblem
+from cs2.optimize.ga_fitness import batch_evaluate
+from cs2.optimize.utilities import WEAR_UPPER
+
+
+class Breakpoint(NamedTuple):
+    avg_float: float        # highest average input float of the interval
+    expected_value: float
+    cost: float             # cheapest inputs reaching `avg_float`, inf when impossible
+    profit: float
+
+
+def critical_floats(outcome_ranges: np.ndarray) -> np.ndarray:
+    """Sorted average input floats at which some outcome reaches a wear boundary, 1.0 included.
+    Args:
+        outcome_ranges (np.ndarray): (M, 2) min and max float of every outcome."""
+    outcome_ranges = np.asarray(outcome_ranges, dtype=np.float64)
+    min_f, max_f = outcome_ranges[:, :1], outcome_ranges[:, 1:]
+    span = max_f - min_f
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg = (WEAR_UPPER[None, :] - min_f) / span
+    valid = (WEAR_UPPER[None, :] >= min_f) & (WEAR_UPPER[None, :] < max_f) & (span > 0)
+    points = np.append(avg[valid], 1.0)
+    return np.unique(np.clip(points, 0.0, 1.0))
+
+def evaluate_breakpoints(
+    counts: np.ndarray,
+    outcome_container: np.ndarray,
+    outcome_ranges: np.ndarray,
+    outcome_prices: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Expected value of a container mix at every critical average float.
+    Args:
+        counts (np.ndarray): (C,) # used weapons of every container.
+        outcome_container (np.ndarray): (M,) container index of every outcome.
+        outcome_ranges (np.ndarray): (M, 2) min and max float of every outcome.
+        outcome_prices (np.ndarray): (M, 5) price of every outcome in every wear tier.
+    Returns:
+        critical floats (K,) and the expected value (K,) on the interval each one closes."""
+    points = critical_floats(outcome_ranges)
+    # tiers are constant on (previous, point]; probe the middle so rounding at the exact
+    # boundary cannot push an outcome into the next tier, the first interval starts at 0
+    previous = np.concatenate([[0.0], points[:-1]])
+    probes = np.where(points > previous, (points + previous) / 2, points)
+    mix = np.repeat(np.asarray(counts)[None, :], len(points), axis=0)
+    result = batch_evaluate(mix, probes, outcome_container, outcome_ranges, outcome_prices)
+    return points, result.expected_value
+
+def optimize_mix(
+    counts: np.ndarray,
+    outcome_container: np.ndarray,
+    outcome_ranges: np.ndarray,
+    outcome_prices: np.ndarray,
+    input_cost: Callable[[float], float],
+) -> list[Breakpoint]:
+    """Every breakpoint of a container mix priced with its cheapest inputs, best profit first.
+    Args:
+        input_cost (Callable[[float], float]): Cost of the cheapest inputs of the mix whose
+            average float does not exceed the argument, inf when none exist."""
+    points, expected_values = evaluate_breakpoints(counts, outcome_container, outcome_ranges, outcome_prices)
+    breakpoints = []
+    for avg_float, expected_value in zip(points.tolist(), expected_values.tolist()):
+        cost = input_cost(avg_float)
+        breakpoints.append(Breakpoint(avg_float, expected_value, cost, expected_value - cost))
+    breakpoints.sort(key=lambda b: b.profit, reverse=True)
+    return breakpoints
+
+
+def uniform_input_cost(
+    counts: np.ndarray,
+    listing_container: np.ndarray,
+    listing_float: np.ndarray,
+    listing_price: np.ndarray,
+) -> Callable[[float], float]:
+    """`input_cost` buying, per container, the cheapest listings that are each at or below the target.
+    Every input under the target keeps the average under it; mixing floats above and below
+    can be cheaper, which `input_solver` handles."""
+    counts = np.asarray(counts)
+    listing_container = np.asarray(listing_container)
+    by_container = []
+    for c, n in enumerate(counts.tolist()):
+        mask = listing_container == c
+        order = np.argsort(np.asarray(listing_price)[mask], kind='stable')
+        by_container.append((n, np.asarray(listing_float)[mask][order], np.asarray(listing_price)[mask][order]))
+
+    def input_cost(target: float) -> float:
+        total = 0.0
+        for n, floats, prices in by_container:
+            if n == 0:
+                continue
+            affordable = prices[floats <= target][:n]
+            if len(affordable) < n:
+                return np.inf
+            total += float(affordable.sum())
+        return total
+
+    return input_cost
+
+def optimize_problem(problem: TradeUpProblem, counts: np.ndarray) -> list[Breakpoint]:
+    """`optimize_mix` over the listings and outcomes of a GA search space, for a fixed container mix."""
+    cost = uniform_input_cost(counts, problem.listing_container, problem.listing_float, problem.listing_price)
+    return optimize_mix(counts, problem.outcome_container, problem.outcome_ranges, problem.outcome_prices, cost)
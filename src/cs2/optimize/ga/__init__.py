@@ -0,0 +1,3 @@
+from .engine import GAConfig, GAResult, GeneticOptimizer
+from .pool import ScoringPool
+from .problem import CONTRACT_SIZE, TradeUpProblem, objectives, score
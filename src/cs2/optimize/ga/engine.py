@@ -0,0 +1,179 @@
+import numpy as np
+from pydantic import BaseModel
+
+from cs2.optimize.ga.pool import ScoringPool
+from cs2.optimize.ga.problem import CONTRACT_SIZE, TradeUpProblem
+from cs2.optimize.pareto import ParetoFront, domination_counts
+
+
+class GAConfig(BaseModel):
+    population_size: int = 512
+    generations: int = 200
+    elite: int = 16
+    tournament_size: int = 4
+    crossover_rate: float = 0.9
+    """probability per slot to move to a neighbouring float of the same container"""
+    float_mutation_rate: float = 0.1
+    """largest number of listings a float mutation steps over"""
+    float_mutation_step: int = 3
+    """probability per slot to swap in a random listing, possibly of another container"""
+    listing_mutation_rate: float = 0.02
+    objective: str = 'profit'
+    seed: int = 0
+    """stop when the best fitness has not improved for this many generations, 0 disables"""
+    patience: int = 0
+
+
+class GAResult(BaseModel):
+    model_config = {'arbitrary_types_allowed': True}
+
+    best_genome: np.ndarray
+    best_fitness: float
+    history: list[float]
+
+
+class GeneticOptimizer:
+    """Genetic algorithm searching the listing choices of a trade up contract.
+
+    A listing is one physical item, so a genome never holds the same listing twice:
+    the initial contracts are drawn without replacement and duplicates left by
+    crossover or mutation are repaired.
+
+    All randomness comes from one generator seeded with `config.seed`, scoring is
+    deterministic, so a run is reproducible whatever the number of workers."""
+
+    def __init__(self, problem: TradeUpProblem, config: GAConfig | None = None, workers: int | None = None):
+        self.problem = problem
+        self.config = config or GAConfig()
+        self.workers = workers
+        self.rng = np.random.default_rng(self.config.seed)
+        # first and one-past-last listing of every container, listings are sorted by container
+        containers = np.arange(problem.num_containers)
+        self._start = np.searchsorted(problem.listing_container, containers, side='left')
+        self._end = np.searchsorted(problem.listing_container, containers, side='right')
+        if len(problem.listing_container) < CONTRACT_SIZE:
+            raise ValueError(f"A contract needs {CONTRACT_SIZE} distinct listings, "
+                             f"the problem has {len(problem.listing_container)}")
+
+    def initial_population(self) -> np.ndarray:
+        """Random contracts of distinct listings, each one drawn from a single random container
+        with enough listings, or from every listing when no container has enough."""
+        cfg = self.config
+        populated = np.flatnonzero(self._end - self._start >= CONTRACT_SIZE)
+        population = np.empty((cfg.population_size, CONTRACT_SIZE), dtype=np.int64)
+        for row in range(cfg.population_size):
+            if len(populated):
+                container = self.rng.choice(populated)
+                low, high = self._start[container], self._end[container]
+            else:
+                low, high = 0, len(self.problem.listing_container)
+            population[row] = low + self.rng.choice(high - low, size=CONTRACT_SIZE, replace=False)
+        return population
+
+    def repair(self, genomes: np.ndarray) -> np.ndarray:
+        """Replace repeated listings of a genome with the nearest unused listing of the same
+        container, or a random unused listing once the container has none left."""
+        genomes = genomes.copy()
+        ordered = np.sort(genomes, axis=1)
+        for row in np.flatnonzero((np.diff(ordered, axis=1) == 0).any(axis=1)).tolist():
+            used = set()
+            for slot, listing in enumerate(genomes[row].tolist()):
+                if listing in used:
+                    listing = self._unused_neighbour(listing, used)
+                    genomes[row, slot] = listing
+                used.add(listing)
+        return genomes
+
+    def _unused_neighbour(self, listing: int, used: set[int]) -> int:
+        container = self.problem.listing_container[listing]
+        low, high = self._start[container], self._end[container]
+        for distance in range(1, high - low):
+            for candidate in (listing - distance, listing + distance):
+                if low <= candidate < high and candidate not in used:
+                    return candidate
+        while (candidate := int(self.rng.integers(0, len(self.problem.listing_container)))) in used:
+            pass
+        return candidate
+
+    def select(self, population: np.ndarray, fitness: np.ndarray, n: int) -> np.ndarray:
+        """Tournament selection of `n` parents."""
+        entrants = self.rng.integers(0, len(population), size=(n, self.config.tournament_size))
+        winners = entrants[np.arange(n), np.argmax(fitness[entrants], axis=1)]
+        return population[winners]
+
+    def crossover(self, parents: np.ndarray) -> np.ndarray:
+        """Uniform crossover of the slot choices of consecutive parent pairs."""
+        first, second = parents[0::2], parents[1::2]
+        second = second[:len(first)] if len(second) >= len(first) else np.concatenate([second, first[len(second):]])
+        mask = self.rng.random(first.shape) < 0.5
+        mate = self.rng.random(len(first)) < self.config.crossover_rate
+        mask &= mate[:, None]
+        child_a = np.where(mask, second, first)
+        child_b = np.where(mask, first, second)
+        return self.repair(np.concatenate([child_a, child_b])[:len(parents)])
+
+    def mutate(self, genomes: np.ndarray) -> np.ndarray:
+        """Shift slots to neighbouring floats within their container, or swap in random listings."""
+        cfg = self.config
+        genomes = genomes.copy()
+        containers = self.problem.listing_container[genomes]
+        shift = self.rng.random(genomes.shape) < cfg.float_mutation_rate
+        steps = self.rng.integers(-cfg.float_mutation_step, cfg.float_mutation_step + 1, size=genomes.shape)
+        shifted = np.clip(genomes + steps, self._start[containers], self._end[containers] - 1)
+        genomes = np.where(shift, shifted, genomes)
+        swap = self.rng.random(genomes.shape) < cfg.listing_mutation_rate
+        genomes[swap] = self.rng.integers(0, len(self.problem.listing_float), size=int(swap.sum()))
+        return self.repair(genomes)
+
+    def _next_generation(self, population: np.ndarray, fitness: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Elite rows (by index) and freshly bred children."""
+        cfg = self.config
+        elite = np.argsort(fitness, kind='stable')[::-1][:cfg.elite]
+        parents = self.select(population, fitness, cfg.population_size - cfg.elite)
+        return elite, self.mutate(self.crossover(parents))
+
+    def run(self) -> GAResult:
+        cfg = self.config
+        if cfg.objective == 'pareto':
+            raise ValueError("Use run_pareto for the 'pareto' objective")
+        history = []
+        with ScoringPool(self.problem, workers=self.workers, objective=cfg.objective) as pool:
+            population = self.initial_population()
+            fitness = pool.score(population)
+            stale = 0
+            for _ in range(cfg.generations):
+                elite, children = self._next_generation(population, fitness)
+                population = np.concatenate([population[elite], children])
+                fitness = np.concatenate([fitness[elite], pool.score(children)])
+                best = float(fitness.max())
+                stale = stale + 1 if history and best <= history[-1] else 0
+                history.append(best)
+                if cfg.patience and stale >= cfg.patience:
+                    break
+        best_index = int(np.argmax(fitness))
+        return GAResult(
+            best_genome=np.sort(population[best_index]),
+            best_fitness=float(fitness[best_index]),
+            history=history,
+        )
+
+    def run_pareto(self) -> ParetoFront:
+        """Search ROI and probability of profit together in one run.
+
+        Selection and elitism rank genomes by how many others dominate them; every
+        scored genome is offered to one `ParetoFront`, whose items are the sorted
+        genomes of the whole frontier."""
+        cfg = self.config
+        front = ParetoFront()
+        with ScoringPool(self.problem, workers=self.workers, objective='pareto') as pool:
+            population = self.initial_population()
+            points = pool.score(population)
+            front.add_batch(points, np.sort(population, axis=1))
+            for _ in range(cfg.generations):
+                fitness = -domination_counts(points).astype(np.float64)
+                elite, children = self._next_generation(population, fitness)
+                child_points = pool.score(children)
+                front.add_batch(child_points, np.sort(children, axis=1))
+                population = np.concatenate([population[elite], children])
+                points = np.concatenate([points[elite], child_points])
+        return front
@@ -0,0 +1,85 @@
+"""
+Process pool scoring GA populations against arrays held in shared memory.
+
+The problem arrays are copied once into `SharedMemory` blocks; every worker
+attaches to them at start-up, so only genomes and fitness values cross process
+boundaries per generation.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from cs2.optimize.ga.problem import TradeUpProblem, score
+
+# problem attached inside a worker process
+_worker_problem: TradeUpProblem | None = None
+_worker_blocks: list[SharedMemory] = []
+
+
+def _attach(specs: dict) -> TradeUpProblem:
+    # workers share the parent's resource tracker, the blocks are unlinked once by the parent
+    arrays = {}
+    for field, (name, shape, dtype) in specs.items():
+        shm = SharedMemory(name=name)
+        _worker_blocks.append(shm)
+        arrays[field] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    return TradeUpProblem(**arrays)
+
+def _init_worker(specs: dict):
+    global _worker_problem
+    _worker_problem = _attach(specs)
+
+def _score_chunk(genomes: np.ndarray, objective: str) -> np.ndarray:
+    return score(_worker_problem, genomes, objective)
+
+
+class ScoringPool:
+    """Score populations of a `TradeUpProblem` in parallel.
+
+    Use as a context manager so the shared memory is released:
+
+        with ScoringPool(problem, workers=8) as pool:
+            fitness = pool.score(genomes)
+    """
+
+    def __init__(self, problem: TradeUpProblem, workers: int | None = None, objective: str = 'profit'):
+        self.problem = problem
+        self.workers = os.cpu_count() if workers is None else workers
+        self.objective = objective
+        self._blocks: list[SharedMemory] = []
+        self._executor: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> "ScoringPool":
+        if self.workers > 1:
+            specs = {}
+            for field, array in self.problem._asdict().items():
+                shm = SharedMemory(create=True, size=max(array.nbytes, 1))
+                np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+                self._blocks.append(shm)
+                specs[field] = (shm.name, array.shape, array.dtype.str)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker, initargs=(specs,)
+            )
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks = []
+
+    def score(self, genomes: np.ndarray) -> np.ndarray:
+        """Fitness of every genome, split into one chunk per worker."""
+        if self._executor is None:
+            return score(self.problem, genomes, self.objective)
+        chunks = np.array_split(genomes, self.workers)
+        results = self._executor.map(_score_chunk, chunks, [self.objective] * len(chunks))
+        return np.concatenate(list(results))
@@ -0,0 +1,90 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from cs2.optimize.ga_fitness import BatchResult, batch_evaluate
+from cs2.optimize.risk import outcome_values
+
+CONTRACT_SIZE = 10
+
+
+class TradeUpProblem(NamedTuple):
+    """Arrays describing one trade up search space.
+
+    Listings are the purchasable inputs, outcomes the weapons of the next rarity.
+    A genome is a row of `CONTRACT_SIZE` listing indices."""
+    listing_container: np.ndarray   # (L,) container index of every listing
+    listing_float: np.ndarray       # (L,) float of every listing
+    listing_price: np.ndarray       # (L,) price of every listing
+    outcome_container: np.ndarray   # (M,) container index of every outcome
+    outcome_ranges: np.ndarray      # (M, 2) min and max float of every outcome
+    outcome_prices: np.ndarray      # (M, 5) price of every outcome in every wear tier
+
+    @property
+    def num_containers(self) -> int:
+        return int(max(self.listing_container.max(), self.outcome_container.max())) + 1
+
+    @classmethod
+    def from_arrays(cls, **arrays) -> "TradeUpProblem":
+        """Build a problem with every array cast to a contiguous, fixed dtype.
+        Listings are sorted by (container, float) so neighbouring indices are close floats."""
+        listing_container = np.asarray(arrays['listing_container'], dtype=np.int32)
+        listing_float = np.asarray(arrays['listing_float'], dtype=np.float64)
+        order = np.lexsort((listing_float, listing_container))
+        return cls(
+            listing_container=np.ascontiguousarray(listing_container[order]),
+            listing_float=np.ascontiguousarray(listing_float[order]),
+            listing_price=np.ascontiguousarray(np.asarray(arrays['listing_price'], dtype=np.float64)[order]),
+            outcome_container=np.ascontiguousarray(arrays['outcome_container'], dtype=np.int32),
+            outcome_ranges=np.ascontiguousarray(arrays['outcome_ranges'], dtype=np.float64),
+            outcome_prices=np.ascontiguousarray(arrays['outcome_prices'], dtype=np.float64),
+        )
+
+
+def _evaluate(problem: TradeUpProblem, genomes: np.ndarray) -> tuple[BatchResult, np.ndarray]:
+    genomes = np.asarray(genomes, dtype=np.intp)
+    containers = problem.listing_container[genomes]
+    num_containers = problem.num_containers
+    # per row bincount: offset every row into its own block of containers
+    offsets = np.arange(genomes.shape[0])[:, None] * num_containers
+    counts = np.bincount((containers + offsets).ravel(), minlength=genomes.shape[0] * num_containers)
+    counts = counts.reshape(genomes.shape[0], num_containers)
+    result = batch_evaluate(
+        counts,
+        problem.listing_float[genomes],
+        problem.outcome_container,
+        problem.outcome_ranges,
+        problem.outcome_prices,
+    )
+    cost = problem.listing_price[genomes].sum(axis=1)
+    return result, cost
+
+def objectives(problem: TradeUpProblem, genomes: np.ndarray) -> np.ndarray:
+    """(P, 2) ROI and probability of profit of every genome, both to maximize.
+    An outcome out of range of every wear tier has no price, as in `batch_evaluate`, and sinks both."""
+    result, cost = _evaluate(problem, genomes)
+    values = outcome_values(result, problem.outcome_prices)
+    p_profit = (result.probabilities * (values > cost[:, None])).sum(axis=1)
+    p_profit[np.isnan(values).any(axis=1)] = np.nan
+    # summed possibilities drift by a few ulps, which would keep near-equal points apart on the frontier
+    p_profit = np.round(p_profit, 12)
+    roi = result.expected_value / cost
+    return np.nan_to_num(np.column_stack([roi, p_profit]), nan=-np.inf)
+
+def score(problem: TradeUpProblem, genomes: np.ndarray, objective: str = 'profit') -> np.ndarray:
+    """Fitness of every genome.
+    Args:
+        problem (TradeUpProblem): The search space.
+        genomes (np.ndarray): (P, CONTRACT_SIZE) listing indices.
+        objective (str): 'profit' (expected value - cost), 'roi' (expected value / cost)
+            or 'pareto' ((P, 2) ROI and probability of profit, see `objectives`)."""
+    if objective == 'pareto':
+        return objectives(problem, genomes)
+    result, cost = _evaluate(problem, genomes)
+    if objective == 'profit':
+        fitness = result.expected_value - cost
+    elif objective == 'roi':
+        fitness = result.expected_value / cost
+    else:
+        raise ValueError(f"Unknown objective: {objective}")
+    return np.nan_to_num(fitness, nan=-np.inf)
@@ -1,3 +1,10 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from cs2.optimize.utilities import wear_tiers as batch_wear_tiers
+
+
 def container_possibilities(containers: dict[str, tuple]):
     """Get product container possibilities from all used containers in the trade up contract.
     Args:
@@ -10,3 +17,64 @@ def weapon_float(wear_floats: list[float], min_float: float, max_float: float):
     avg = sum(wear_floats) / len(wear_floats)
     output_float = min_float + (max_float - min_float) * avg
     return output_float
+
+
+class BatchResult(NamedTuple):
+    probabilities: np.ndarray    # (N, M) possibility of every outcome
+    output_floats: np.ndarray    # (N, M) float of every outcome
+    wear_tiers: np.ndarray       # (N, M) index into `utilities.WEAR_RANKS`, -1 when out of range
+    expected_value: np.ndarray   # (N,) expected outcome price, nan when no prices given
+
+
+def batch_container_possibilities(counts: np.ndarray, outcome_container: np.ndarray) -> np.ndarray:
+    """Vectorized `container_possibilities`, expanded to every outcome.
+    Args:
+        counts (np.ndarray): (N, C) # used weapons of every container per contract.
+        outcome_container (np.ndarray): (M,) container index of every outcome."""
+    counts = np.asarray(counts, dtype=np.float64)
+    outcome_container = np.asarray(outcome_container, dtype=np.intp)
+    next_rarity_num = np.bincount(outcome_container, minlength=counts.shape[1])
+    summation = counts @ next_rarity_num
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return counts[:, outcome_container] / summation[:, None]
+
+def batch_weapon_float(wear_floats: np.ndarray, min_floats: np.ndarray, max_floats: np.ndarray) -> np.ndarray:
+    """Vectorized `weapon_float`.
+    Args:
+        wear_floats (np.ndarray): (N, K) input floats per contract, or (N,) already averaged floats.
+        min_floats (np.ndarray): (M,) minimum float of every outcome.
+        max_floats (np.ndarray): (M,) maximum float of every outcome."""
+    wear_floats = np.asarray(wear_floats, dtype=np.float64)
+    avg = wear_floats.mean(axis=1) if wear_floats.ndim == 2 else wear_floats
+    min_floats = np.asarray(min_floats, dtype=np.float64)
+    max_floats = np.asarray(max_floats, dtype=np.float64)
+    return min_floats + (max_floats - min_floats) * avg[:, None]
+
+def batch_evaluate(
+    counts: np.ndarray,
+    wear_floats: np.ndarray,
+    outcome_container: np.ndarray,
+    outcome_ranges: np.ndarray,
+    prices: np.ndarray | None = None,
+) -> BatchResult:
+    """Score N trade up contracts at once.
+    Args:
+        counts (np.ndarray): (N, C) # used weapons of every container per contract.
+        wear_floats (np.ndarray): (N, K) input floats per contract, or (N,) already averaged floats.
+        outcome_container (np.ndarray): (M,) container index of every outcome.
+        outcome_ranges (np.ndarray): (M, 2) min and max float of every outcome.
+        prices (np.ndarray | None): (M, 5) price of every outcome in every wear tier."""
+    outcome_ranges = np.asarray(outcome_ranges, dtype=np.float64)
+    probabilities = batch_container_possibilities(counts, outcome_container)
+    output_floats = batch_weapon_float(wear_floats, outcome_ranges[:, 0], outcome_ranges[:, 1])
+    tiers = batch_wear_tiers(output_floats)
+    if prices is None:
+        expected_value = np.full(probabilities.shape[0], np.nan)
+    else:
+        prices = np.asarray(prices, dtype=np.float64)
+        outcome_prices = prices[np.arange(prices.shape[0]), np.maximum(tiers, 0)]
+        outcome_prices[tiers < 0] = np.nan
+        # outcomes of unused containers must not turn a missing price into nan
+        contribution = np.where(probabilities > 0, probabilities * outcome_prices, 0.0)
+        expected_value = contribution.sum(axis=1)
+    return BatchResult(probabilities, output_floats, tiers, expected_value)
@@ -0,0 +1,125 @@
+"""
+Incremental expected value of cached contracts across price snapshots.
+
+Every cached contract depends on the (container, rarity, wear tier) keys of the
+outcomes it can produce. When a new snapshot arrives only the prices that moved
+are diffed, mapped to their keys, and only the contracts depending on those keys
+are re-evaluated. A snapshot is complete: a hash name missing from it, or without
+a price, was delisted and its price becomes nan.
+"""
+import json
+from collections import defaultdict
+from typing import Iterable, NamedTuple
+
+import numpy as np
+
+from cs2.optimize.ga_fitness import batch_container_possibilities, batch_weapon_float
+from cs2.optimize.outcome_index import OutcomeIndex
+from cs2.optimize.utilities import HashNameTable, wear_tiers
+
+
+class Contract(NamedTuple):
+    container_names: tuple[str, ...]
+    counts: tuple[int, ...]        # # used weapons of every container
+    rarity: str                    # rarity of the inputs
+    avg_float: float               # average input float
+
+
+def snapshot_prices(path: str, field: str = 'yyyp_sell_price') -> dict[str, float]:
+    """market_hash_name -> price of a `goods_{date}.jsonl` snapshot, items without a price are skipped."""
+    prices = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            goods_info = json.loads(line)['data']['goods_info']
+            if goods_info.get(field) is not None:
+                prices[goods_info['market_hash_name']] = float(goods_info[field])
+    return prices
+
+
+class IncrementalEvaluator:
+    def __init__(self, index: OutcomeIndex, prices: dict[str, float]):
+        self.index = index
+        self.hash_names = HashNameTable(index.weapon_names)
+        self.prices = np.full(len(self.hash_names.names), np.nan)
+        self._set_prices(prices)
+        # hash name id -> every (container, rarity, wear tier) key it prices
+        self.hash_keys: dict[int, set[tuple]] = defaultdict(set)
+        rows = np.arange(len(index))
+        self._row_group = np.searchsorted(index.group_offsets, rows, side='right') - 1
+        for row, group in zip(rows.tolist(), self._row_group.tolist()):
+            for tier, hash_id in enumerate(self.hash_names.table[row].tolist()):
+                self.hash_keys[hash_id].add((*index.groups[group], tier))
+
+        self.contracts: dict[int, Contract] = {}
+        self.values: dict[int, float] = {}
+        self.dependents: dict[tuple, set[int]] = defaultdict(set)
+        self._keys: dict[int, set[tuple]] = {}
+        # contract id -> (outcome hash name ids, outcome possibilities)
+        self._outcomes: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+        self._next_id = 0
+
+    def _set_prices(self, prices: dict[str, float | None]) -> np.ndarray:
+        """Replace the prices of every known hash name, nan for the ones missing from `prices`
+        or None in it, returning the ids whose price changed."""
+        new = np.full(len(self.prices), np.nan)
+        for hash_name, price in prices.items():
+            hash_id = self.hash_names.ids.get(hash_name)
+            if hash_id is not None and price is not None:
+                new[hash_id] = price
+        same = (new == self.prices) | (np.isnan(new) & np.isnan(self.prices))
+        self.prices = new
+        return np.flatnonzero(~same)
+
+    def add(self, contract: Contract) -> int:
+        """Cache a contract and its dependencies, returning its id."""
+        outcomes = self.index.contract_outcomes(list(contract.container_names), contract.rarity)
+        probabilities = batch_container_possibilities(np.array([contract.counts]), outcomes.outcome_container)[0]
+        floats = batch_weapon_float(np.array([contract.avg_float]), outcomes.outcome_ranges[:, 0], outcomes.outcome_ranges[:, 1])[0]
+        hash_ids = self.hash_names.resolve(outcomes.outcome_ids, floats)
+        used = probabilities > 0
+        hash_ids, probabilities = hash_ids[used], probabilities[used]
+        tiers = wear_tiers(floats[used])
+
+        contract_id = self._next_id
+        self._next_id += 1
+        self.contracts[contract_id] = contract
+        self._outcomes[contract_id] = (hash_ids, probabilities)
+        groups = self._row_group[outcomes.outcome_ids[used]]
+        # an out of range outcome (-1) has no price to depend on
+        self._keys[contract_id] = {(*self.index.groups[g], t) for g, t in zip(groups.tolist(), tiers.tolist()) if t >= 0}
+        for key in self._keys[contract_id]:
+            self.dependents[key].add(contract_id)
+        self.values[contract_id] = self._evaluate(contract_id)
+        return contract_id
+
+    def add_many(self, contracts: Iterable[Contract]) -> list[int]:
+        return [self.add(contract) for contract in contracts]
+
+    def remove(self, contract_id: int) -> None:
+        self.contracts.pop(contract_id)
+        self.values.pop(contract_id)
+        self._outcomes.pop(contract_id)
+        for key in self._keys.pop(contract_id):
+            self.dependents[key].discard(contract_id)
+
+    def _evaluate(self, contract_id: int) -> float:
+        """Expected value, nan when an outcome has no hash name, as in `batch_evaluate`."""
+        hash_ids, probabilities = self._outcomes[contract_id]
+        prices = np.where(hash_ids >= 0, self.prices[np.maximum(hash_ids, 0)], np.nan)
+        return float(probabilities @ prices)
+
+    def changed_keys(self, prices: dict[str, float]) -> set[tuple]:
+        """Apply a price snapshot, returning the (container, rarity, wear tier) keys it moved."""
+        keys = set()
+        for hash_id in self._set_prices(prices).tolist():
+            keys |= self.hash_keys[hash_id]
+        return keys
+
+    def update_prices(self, prices: dict[str, float]) -> set[int]:
+        """Apply a price snapshot and re-evaluate only the affected contracts, returning their ids."""
+        affected = set()
+        for key in self.changed_keys(prices):
+            affected |= self.dependents.get(key, set())
+        for contract_id in affected:
+            self.values[contract_id] = self._evaluate(contract_id)
+        return affected
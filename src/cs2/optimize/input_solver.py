@@ -0,0 +1,154 @@
+"""
+Cheapest trade up inputs under a target average float.
+
+Every row of `price.csv` is the cheapest listing of one 0.01 `new_abrade` bin of a
+(quality, container, rarity) group, so picking inputs is a 0/1 knapsack with a
+cardinality constraint: choose `count` rows whose input float sum stays under
+count * target at minimum price.
+
+Targets are averages in the space `ga_fitness.weapon_float` (and so
+`breakpoints.critical_floats`) takes its average in. `float_space` says which one:
+'normalized', `(abrade - min_float) / (max_float - min_float)`, the average of the
+current trade up rule, or 'raw', `abrade` itself. Both are computed from the raw
+columns; `new_abrade` (`abrade / (max_float - min_float)`) is only used for binning.
+
+Floats are discretized upward (so every answer is feasible with the real floats)
+and one DP table per group is built lazily; after a prefix minimum over the float
+budget a query is a single array lookup.
+"""
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from cs2.optimize.ga.problem import CONTRACT_SIZE
+
+GROUP_COLUMNS = ['quality', 'container', 'rarity']
+FLOAT_SPACES = ('normalized', 'raw')
+# column of the input float in the space the solver works in
+INPUT_FLOAT = 'input_float'
+
+
+class InputSolver:
+    def __init__(
+        self,
+        price_table: pd.DataFrame,
+        resolution: int = 1000,
+        max_count: int = CONTRACT_SIZE,
+        float_space: str = 'normalized',
+    ):
+        """
+        Args:
+            price_table (pd.DataFrame): Rows of `price.csv`, at least the group columns, `abrade`,
+                `min_float`, `max_float` and `price`.
+            resolution (int): Float units per 1.0 of input float.
+            max_count (int): Largest number of inputs asked from one group.
+            float_space (str): Space of the input floats and of every target, see `FLOAT_SPACES`.
+        """
+        if float_space not in FLOAT_SPACES:
+            raise ValueError(f"Unknown float space {float_space!r}, expected one of {FLOAT_SPACES}")
+        missing = {'abrade', 'min_float', 'max_float', 'price'} - set(price_table.columns)
+        if missing:
+            raise ValueError(f"Price table misses {sorted(missing)}")
+        table = price_table.copy()
+        if float_space == 'normalized':
+            span = table['max_float'] - table['min_float']
+            table[INPUT_FLOAT] = (table['abrade'] - table['min_float']) / span.where(span > 0)
+        else:
+            table[INPUT_FLOAT] = table['abrade']
+        table = table.dropna(subset=[INPUT_FLOAT, 'price'])
+        self.float_space = float_space
+        self.resolution = resolution
+        self.max_count = max_count
+        self.groups: dict[tuple, pd.DataFrame] = {
+            key: group.sort_values(INPUT_FLOAT) for key, group in table.groupby(GROUP_COLUMNS, observed=True)
+        }
+        # group -> (count + 1, budget + 1) cheapest price with at most `budget` float units
+        self._best: dict[tuple, np.ndarray] = {}
+
+    @classmethod
+    def from_csv(cls, path: str = 'price.csv', **kwargs) -> "InputSolver":
+        return cls(pd.read_csv(path), **kwargs)
+
+    def _weights(self, group: pd.DataFrame) -> np.ndarray:
+        return np.ceil(group[INPUT_FLOAT].to_numpy() * self.resolution - 1e-9).astype(np.int64).clip(min=0)
+
+    def _knapsack(self, key: tuple, keep_choices: bool = False):
+        group = self.groups[key]
+        weights = self._weights(group)
+        prices = group['price'].to_numpy(dtype=np.float64)
+        budget = self.max_count * int(weights.max(initial=0))
+        # dp[j, s]: cheapest j inputs with float units summing to exactly s
+        dp = np.full((self.max_count + 1, budget + 1), np.inf)
+        dp[0, 0] = 0.0
+        choices = np.zeros((len(weights), self.max_count + 1, budget + 1), dtype=bool) if keep_choices else None
+        for i, (w, p) in enumerate(zip(weights.tolist(), prices.tolist())):
+            for j in range(min(i + 1, self.max_count), 0, -1):
+                candidate = dp[j - 1, :budget + 1 - w] + p
+                better = candidate < dp[j, w:]
+                dp[j, w:][better] = candidate[better]
+                if keep_choices:
+                    choices[i, j, w:] = better
+        return dp, choices
+
+    def _best_table(self, key: tuple) -> np.ndarray:
+        best = self._best.get(key)
+        if best is None:
+            dp, _ = self._knapsack(key)
+            best = np.minimum.accumulate(dp, axis=1)
+            self._best[key] = best
+        return best
+
+    def _budget(self, target: float, count: int) -> int:
+        return int(np.floor(target * count * self.resolution + 1e-9))
+
+    def cost(self, key: tuple, target: float, count: int = CONTRACT_SIZE) -> float:
+        """Price of the cheapest `count` inputs of the group averaging at most `target`, inf when impossible."""
+        if key not in self.groups or count > self.max_count:
+            return np.inf
+        if count == 0:
+            return 0.0
+        best = self._best_table(key)
+        budget = self._budget(target, count)
+        if budget < 0:
+            return np.inf
+        return float(best[count, min(budget, best.shape[1] - 1)])
+
+    def costs(self, key: tuple, targets: np.ndarray, count: int = CONTRACT_SIZE) -> np.ndarray:
+        """Vectorized `cost` over many targets of one group."""
+        targets = np.asarray(targets, dtype=np.float64)
+        if key not in self.groups or count > self.max_count:
+            return np.full(targets.shape, np.inf)
+        best = self._best_table(key)
+        budgets = np.floor(targets * count * self.resolution + 1e-9).astype(np.int64)
+        result = best[count, np.clip(budgets, 0, best.shape[1] - 1)]
+        result[budgets < 0] = np.inf
+        return result
+
+    def select(self, key: tuple, target: float, count: int = CONTRACT_SIZE) -> pd.DataFrame:
+        """Rows of the cheapest inputs behind `cost`, empty when impossible."""
+        if self.cost(key, target, count) == np.inf:
+            return self.groups.get(key, pd.DataFrame()).iloc[:0]
+        dp, choices = self._knapsack(key, keep_choices=True)
+        weights = self._weights(self.groups[key])
+        budget = min(self._budget(target, count), dp.shape[1] - 1)
+        s = int(np.argmin(dp[count, :budget + 1]))
+        rows, j = [], count
+        for i in range(len(weights) - 1, -1, -1):
+            if j == 0:
+                break
+            if choices[i, j, s]:
+                rows.append(i)
+                s -= int(weights[i])
+                j -= 1
+        return self.groups[key].iloc[sorted(rows)]
+
+    def input_cost(self, keys: list[tuple], counts: np.ndarray) -> Callable[[float], float]:
+        """`input_cost` for `breakpoints.optimize_mix`, every container group kept under the target.
+        The target is an average in `float_space`, the space the breakpoints were computed in."""
+        pairs = [(key, int(n)) for key, n in zip(keys, counts) if n > 0]
+
+        def input_cost(target: float) -> float:
+            return sum(self.cost(key, target, n) for key, n in pairs)
+
+        return input_cost
@@ -0,0 +1,135 @@
+"""
+Compiled outcome lookup built once from `utilities.build_weapon_identity`.
+
+Weapons of every (container, rarity) group are laid out contiguously, so the
+outcomes of a group are plain array slices instead of walks over nested dicts
+of pydantic objects. The index is saved as `.npy` files plus a small json
+manifest and can be memory-mapped back from disk.
+"""
+import json
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from cs2.optimize.utilities import Weapon
+from cs2.scrape.cs2_terms import rarity_rank, rank_to_rarity
+
+ARRAYS = ('min_float', 'max_float', 'hash_offsets', 'group_offsets')
+MANIFEST = 'manifest.json'
+
+
+class Outcomes(NamedTuple):
+    ids: np.ndarray          # (M,) outcome ids, rows of the index
+    min_float: np.ndarray    # (M,)
+    max_float: np.ndarray    # (M,)
+
+
+class ContractOutcomes(NamedTuple):
+    outcome_container: np.ndarray   # (M,) index into the given containers
+    outcome_ids: np.ndarray         # (M,)
+    outcome_ranges: np.ndarray      # (M, 2) min and max float
+
+
+class OutcomeIndex:
+    """Struct-of-arrays view of a weapon identity.
+
+    Row `i` is one weapon of one (container, rarity) group:
+        - weapon_names[i], min_float[i], max_float[i]
+        - hash_names[hash_offsets[i]:hash_offsets[i + 1]]
+    Group `g` owns rows group_offsets[g]:group_offsets[g + 1]."""
+
+    def __init__(self, groups: list[tuple[str, str]], weapon_names: list[str], hash_names: list[str], arrays: dict):
+        self.groups = groups
+        self.weapon_names = weapon_names
+        self.hash_names = hash_names
+        self.min_float: np.ndarray = arrays['min_float']
+        self.max_float: np.ndarray = arrays['max_float']
+        self.hash_offsets: np.ndarray = arrays['hash_offsets']
+        self.group_offsets: np.ndarray = arrays['group_offsets']
+        self._group_ids = {group: i for i, group in enumerate(groups)}
+
+    def __len__(self) -> int:
+        return len(self.weapon_names)
+
+    @classmethod
+    def from_identity(cls, identity: dict[str, dict[str, list[Weapon]]]) -> "OutcomeIndex":
+        groups, weapon_names, hash_names = [], [], []
+        min_float, max_float, hash_offsets, group_offsets = [], [], [0], [0]
+        for container_name in sorted(identity):
+            for rarity in sorted(identity[container_name]):
+                groups.append((container_name, rarity))
+                for weapon in identity[container_name][rarity]:
+                    weapon_names.append(weapon.weapon_name)
+                    min_float.append(weapon.min_float)
+                    max_float.append(weapon.max_float)
+                    hash_names.extend(weapon.hash_names)
+                    hash_offsets.append(len(hash_names))
+                group_offsets.append(len(weapon_names))
+        arrays = {
+            'min_float': np.array(min_float, dtype=np.float64),
+            'max_float': np.array(max_float, dtype=np.float64),
+            'hash_offsets': np.array(hash_offsets, dtype=np.int64),
+            'group_offsets': np.array(group_offsets, dtype=np.int64),
+        }
+        return cls(groups, weapon_names, hash_names, arrays)
+
+    def save(self, path: str | Path) -> None:
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        for name in ARRAYS:
+            np.save(path / f"{name}.npy", np.ascontiguousarray(getattr(self, name)))
+        manifest = {
+            'groups': self.groups,
+            'weapon_names': self.weapon_names,
+            'hash_names': self.hash_names,
+        }
+        (path / MANIFEST).write_text(json.dumps(manifest, ensure_ascii=False), encoding='utf-8')
+
+    @classmethod
+    def load(cls, path: str | Path, mmap: bool = True) -> "OutcomeIndex":
+        path = Path(path)
+        manifest = json.loads((path / MANIFEST).read_text(encoding='utf-8'))
+        mmap_mode = 'r' if mmap else None
+        arrays = {name: np.load(path / f"{name}.npy", mmap_mode=mmap_mode) for name in ARRAYS}
+        groups = [tuple(group) for group in manifest['groups']]
+        return cls(groups, manifest['weapon_names'], manifest['hash_names'], arrays)
+
+    def group_slice(self, container_name: str, rarity: str) -> slice:
+        """Rows of the group, an empty slice when the group does not exist."""
+        g = self._group_ids.get((container_name, rarity))
+        if g is None:
+            return slice(0, 0)
+        return slice(int(self.group_offsets[g]), int(self.group_offsets[g + 1]))
+
+    def weapons(self, container_name: str, rarity: str) -> Outcomes:
+        """Weapons of the given rarity in the container."""
+        rows = self.group_slice(container_name, rarity)
+        return Outcomes(np.arange(rows.start, rows.stop), self.min_float[rows], self.max_float[rows])
+
+    def outcomes(self, container_name: str, rarity: str) -> Outcomes:
+        """Possible outcomes of trading up weapons of `rarity` from the container, none when
+        `rarity` is unknown or has no rarity above it."""
+        rank = rarity_rank.get(rarity)
+        next_rarity = rank_to_rarity.get(rank + 1) if rank is not None else None
+        if next_rarity is None:
+            return Outcomes(np.empty(0, dtype=np.int64), np.empty(0), np.empty(0))
+        return self.weapons(container_name, next_rarity)
+
+    def contract_outcomes(self, container_names: list[str], rarity: str) -> ContractOutcomes:
+        """Outcome arrays of a container mix, in the layout `ga_fitness.batch_evaluate` expects."""
+        outcome_container, outcome_ids, outcome_ranges = [], [], []
+        for i, container_name in enumerate(container_names):
+            outcomes = self.outcomes(container_name, rarity)
+            outcome_container.append(np.full(len(outcomes.ids), i, dtype=np.int32))
+            outcome_ids.append(outcomes.ids)
+            outcome_ranges.append(np.column_stack([outcomes.min_float, outcomes.max_float]))
+        return ContractOutcomes(
+            np.concatenate(outcome_container) if outcome_container else np.empty(0, dtype=np.int32),
+            np.concatenate(outcome_ids) if outcome_ids else np.empty(0, dtype=np.int64),
+            np.concatenate(outcome_ranges) if outcome_ranges else np.empty((0, 2)),
+        )
+
+    def hash_names_of(self, outcome_id: int) -> list[str]:
+        start, end = self.hash_offsets[outcome_id], self.hash_offsets[outcome_id + 1]
+        return self.hash_names[start:end]
@@ -0,0 +1,74 @@
+"""
+Non-dominated set of contracts trading ROI against the probability of profit.
+
+`ParetoFront` keeps the frontier sorted by ROI, so every insertion is a binary
+search plus the removal of the points it dominates; the frontier is always
+up to date and a whole search is one pass over its candidates.
+"""
+from bisect import bisect_left
+from typing import Any, Iterable
+
+import numpy as np
+
+
+class ParetoFront:
+    """Points maximizing two objectives (roi, p_profit).
+
+    Sorted by decreasing roi, the p_profit of kept points is strictly increasing:
+    a point is dominated exactly when its predecessor in roi order has a p_profit
+    at least as high."""
+
+    def __init__(self):
+        self._neg_roi: list[float] = []    # ascending, for bisect
+        self._p_profit: list[float] = []
+        self._items: list[Any] = []
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def dominated(self, roi: float, p_profit: float) -> bool:
+        i = bisect_left(self._neg_roi, -roi)
+        # an existing point with the same roi and at least the same p_profit
+        if i < len(self._neg_roi) and self._neg_roi[i] == -roi and self._p_profit[i] >= p_profit:
+            return True
+        return i > 0 and self._p_profit[i - 1] >= p_profit
+
+    def add(self, roi: float, p_profit: float, item: Any = None) -> bool:
+        """Insert a point, returning False when it is dominated."""
+        if self.dominated(roi, p_profit):
+            return False
+        i = bisect_left(self._neg_roi, -roi)
+        # points with lower (or equal) roi and no better p_profit are now dominated
+        j = i
+        while j < len(self._p_profit) and self._p_profit[j] <= p_profit:
+            j += 1
+        self._neg_roi[i:j] = [-roi]
+        self._p_profit[i:j] = [p_profit]
+        self._items[i:j] = [item]
+        return True
+
+    def add_batch(self, points: np.ndarray, items: Iterable[Any] | None = None) -> int:
+        """Insert (N, 2) points at once; the batch's own dominated points are dropped
+        with a vectorized sort before touching the frontier. Returns how many were kept."""
+        points = np.asarray(points, dtype=np.float64)
+        items = list(items) if items is not None else [None] * len(points)
+        order = np.lexsort((-points[:, 1], -points[:, 0]))
+        p_sorted = points[order, 1]
+        best_before = np.concatenate([[-np.inf], np.maximum.accumulate(p_sorted)[:-1]])
+        survivors = order[p_sorted > best_before]
+        return sum(self.add(points[i, 0], points[i, 1], items[i]) for i in survivors.tolist())
+
+    def points(self) -> np.ndarray:
+        """(F, 2) roi and p_profit of the frontier, decreasing roi."""
+        return np.column_stack([-np.array(self._neg_roi), np.array(self._p_profit)]).reshape(-1, 2)
+
+    def items(self) -> list[Any]:
+        return list(self._items)
+
+
+def domination_counts(points: np.ndarray) -> np.ndarray:
+    """How many other points dominate every point of an (N, 2) array, 0 on the frontier."""
+    points = np.asarray(points, dtype=np.float64)
+    ge = (points[None, :, :] >= points[:, None, :]).all(axis=2)
+    gt = (points[None, :, :] > points[:, None, :]).any(axis=2)
+    return (ge & gt).sum(axis=1)
@@ -0,0 +1,141 @@
+"""
+Price vs scaled abrade curves of every (quality, container, rarity) group.
+
+Port of the two-exponential fit in `notebooks/inspect.ipynb`: points breaking a
+monotone decrease are dropped, then `c + a1 * exp(-b1 * x) + a2 * exp(-b2 * x)` is
+fitted with extra weight around the Factory New knee. All groups are fitted in a
+process pool and the parameters kept in one (G, 5) array, saved as `.npz`.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import least_squares
+
+from cs2.optimize.input_solver import GROUP_COLUMNS
+
+PARAMS = ('a1', 'b1', 'a2', 'b2', 'c')
+MIN_POINTS = 10
+MIN_CLEAN_POINTS = 5
+
+
+def two_exp(x, a1, b1, a2, b2, c):
+    return c + a1 * np.exp(-b1 * x) + a2 * np.exp(-b2 * x)
+
+def monotone_filter(y: np.ndarray, rel_tol: float = 0.05) -> np.ndarray:
+    """Mask of points keeping a decreasing trend, small increases up to `rel_tol` allowed."""
+    keep, last = np.zeros(len(y), dtype=bool), None
+    for i, yi in enumerate(y):
+        if last is None or yi <= last * (1 + rel_tol):
+            keep[i] = True
+            last = yi
+    return keep
+
+def fit_group(
+    x: np.ndarray,
+    y: np.ndarray,
+    rel_tol: float = 0.05,
+    knee_center: float = 0.07,
+    knee_window: float = 0.01,
+    lam_knee: float = 10.0,
+    use_local_weights: bool = True,
+) -> np.ndarray:
+    """Fit one group, points sorted by x. Returns the 5 parameters, all nan when the group is too sparse."""
+    if len(x) < MIN_POINTS:
+        return np.full(len(PARAMS), np.nan)
+    keep = monotone_filter(y, rel_tol)
+    x_clean, y_clean = x[keep], y[keep]
+    if len(x_clean) < MIN_CLEAN_POINTS:
+        return np.full(len(PARAMS), np.nan)
+
+    # target y just right of knee (x < knee_center)
+    mask_right = (x_clean < knee_center) & (x_clean >= knee_center - knee_window)
+    if np.any(mask_right):
+        idx = np.argmin(np.abs(x_clean[mask_right] - knee_center))
+        y_target = y_clean[mask_right][idx]
+    else:
+        lt = x_clean < knee_center
+        y_target = y_clean[lt][np.argmax(x_clean[lt])] if np.any(lt) else None
+
+    # emphasize around the knee
+    if use_local_weights:
+        w = np.exp(-0.5 * ((x_clean - knee_center) / max(knee_window, 1e-6)) ** 2)
+        w = 0.2 + 0.8 * w
+    else:
+        w = np.ones_like(x_clean)
+
+    # initial guess: one slow and one fast exponential
+    a1_0 = max(y_clean[0] - y_clean[-1], 1e-6)
+    theta0 = np.array([a1_0, 5.0, a1_0 * 0.5, 60.0, max(min(y_clean[-1], y_clean.mean()), 0.0)])
+    # bounds: keep parameters >= 0 and b2 > b1 for a clear knee
+    lb = np.array([0.0, 0.0, 0.0, 10.0, 0.0])
+    ub = np.array([np.inf, 40.0, np.inf, 200.0, np.inf])
+
+    def residuals(theta):
+        r = (two_exp(x_clean, *theta) - y_clean) * np.sqrt(w)
+        if y_target is not None:
+            r_knee = lam_knee * (two_exp(knee_center, *theta) - y_target)
+            return np.append(r, r_knee)
+        return r
+
+    try:
+        return least_squares(residuals, theta0, bounds=(lb, ub), method='trf').x
+    except (ValueError, np.linalg.LinAlgError):
+        return np.full(len(PARAMS), np.nan)
+
+def _fit_item(item: tuple[np.ndarray, np.ndarray, dict]) -> np.ndarray:
+    x, y, kwargs = item
+    return fit_group(x, y, **kwargs)
+
+
+class PriceCurves:
+    """Fitted parameters of every group, row `g` belongs to `keys[g]`."""
+
+    def __init__(self, keys: list[tuple], params: np.ndarray):
+        self.keys = keys
+        self.params = params
+        self._ids = {key: i for i, key in enumerate(keys)}
+
+    def group_id(self, key: tuple) -> int:
+        """Row of the group, -1 when it was never fitted."""
+        return self._ids.get(tuple(key), -1)
+
+    def group_ids(self, keys: list[tuple]) -> np.ndarray:
+        return np.array([self.group_id(key) for key in keys], dtype=np.int64)
+
+    def price(self, group_ids: np.ndarray, floats: np.ndarray) -> np.ndarray:
+        """Fitted price of every (group id, scaled abrade) pair, nan for unknown or failed groups."""
+        group_ids, floats = np.broadcast_arrays(np.asarray(group_ids, dtype=np.int64), np.asarray(floats, dtype=np.float64))
+        params = self.params[np.maximum(group_ids, 0)]
+        prices = two_exp(floats, *np.moveaxis(params, -1, 0))
+        return np.where(group_ids >= 0, prices, np.nan)
+
+    def save(self, path: str | Path) -> None:
+        keys = np.array(self.keys, dtype=str).reshape(len(self.keys), len(GROUP_COLUMNS))
+        np.savez(path, keys=keys, params=self.params)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "PriceCurves":
+        with np.load(path) as data:
+            keys = [tuple(row) for row in data['keys'].tolist()]
+            return cls(keys, data['params'])
+
+    @classmethod
+    def fit(cls, price_table: pd.DataFrame, workers: int | None = None, **fit_kwargs) -> "PriceCurves":
+        """Fit every group of `price.csv` rows across `workers` processes."""
+        items, keys = [], []
+        table = price_table.dropna(subset=['new_abrade', 'price'])
+        for key, group in table.groupby(GROUP_COLUMNS, observed=True):
+            group = group.sort_values('new_abrade')
+            keys.append(key)
+            items.append((group['new_abrade'].to_numpy(), group['price'].to_numpy(dtype=np.float64), fit_kwargs))
+        workers = os.cpu_count() if workers is None else workers
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                params = list(executor.map(_fit_item, items, chunksize=max(1, len(items) // (workers * 4))))
+        else:
+            params = [_fit_item(item) for item in items]
+        params = np.vstack(params) if params else np.empty((0, len(PARAMS)))
+        return cls(keys, params)
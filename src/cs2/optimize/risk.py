@@ -0,0 +1,123 @@
+"""
+Monte Carlo risk metrics of trade up contracts.
+
+Outcome possibilities come from `ga_fitness.batch_container_possibilities` and
+outcome values from the output floats of `ga_fitness.batch_weapon_float`, so the
+same `BatchResult` that ranks contracts by expected value feeds the simulator.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+from cs2.optimize.ga_fitness import BatchResult
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+class RiskReport(NamedTuple):
+    mean: np.ndarray         # mean profit
+    std: np.ndarray          # standard deviation of profit
+    p_loss: np.ndarray       # share of draws losing money
+    quantiles: np.ndarray    # profit at every quantile, last axis follows `QUANTILES`
+
+
+def outcome_values(result: BatchResult, prices: np.ndarray) -> np.ndarray:
+    """(N, M) price of every outcome at its wear tier, 0 for outcomes that cannot happen and nan
+    for outcomes out of range of every tier, as in `batch_evaluate`, so they cannot pass for Factory New.
+    Args:
+        result (BatchResult): Output of `ga_fitness.batch_evaluate`.
+        prices (np.ndarray): (M, 5) price of every outcome in every wear tier."""
+    prices = np.asarray(prices, dtype=np.float64)
+    values = prices[np.arange(prices.shape[0]), np.maximum(result.wear_tiers, 0)]
+    values = np.where(result.wear_tiers < 0, np.nan, values)
+    return np.where(result.probabilities > 0, values, 0.0)
+
+def _normalize(probabilities: np.ndarray) -> np.ndarray:
+    probabilities = np.nan_to_num(np.asarray(probabilities, dtype=np.float64))
+    return probabilities / probabilities.sum(axis=-1, keepdims=True)
+
+def _weighted_quantiles(values: np.ndarray, weights: np.ndarray, quantiles: np.ndarray) -> np.ndarray:
+    """Quantiles of discrete distributions, one per row of `values` with counts in `weights`."""
+    order = np.argsort(values, axis=1)
+    values = np.take_along_axis(values, order, axis=1)
+    cumulative = np.cumsum(np.take_along_axis(weights, order, axis=1), axis=1)
+    cumulative /= cumulative[:, -1:]
+    positions = np.stack([(cumulative < q).sum(axis=1) for q in quantiles], axis=1)
+    return np.take_along_axis(values, np.minimum(positions, values.shape[1] - 1), axis=1)
+
+def simulate_contracts(
+    probabilities: np.ndarray,
+    values: np.ndarray,
+    costs: np.ndarray,
+    n_draws: int = 1_000_000,
+    seed: int | None = 0,
+    quantiles: tuple[float, ...] = QUANTILES,
+) -> RiskReport:
+    """Draw `n_draws` outcomes of every contract independently.
+
+    Outcomes are discrete, so the draws of a contract are fully described by how many
+    times each outcome came up: one multinomial sample per contract replaces millions
+    of per-draw lookups and memory stays (K, M).
+    Args:
+        probabilities (np.ndarray): (K, M) outcome possibilities.
+        values (np.ndarray): (K, M) outcome values.
+        costs (np.ndarray): (K,) price of the inputs.
+    """
+    rng = np.random.default_rng(seed)
+    probabilities = _normalize(probabilities)
+    profits = np.asarray(values, dtype=np.float64) - np.asarray(costs, dtype=np.float64)[:, None]
+    counts = rng.multinomial(n_draws, probabilities).astype(np.float64)
+    mean = (counts * profits).sum(axis=1) / n_draws
+    var = (counts * (profits - mean[:, None]) ** 2).sum(axis=1) / n_draws
+    p_loss = (counts * (profits < 0)).sum(axis=1) / n_draws
+    return RiskReport(mean, np.sqrt(var), p_loss, _weighted_quantiles(profits, counts, np.asarray(quantiles)))
+
+def exact_risk(probabilities: np.ndarray, values: np.ndarray, costs: np.ndarray,
+               quantiles: tuple[float, ...] = QUANTILES) -> RiskReport:
+    """The same metrics computed from the possibilities directly, the limit of `simulate_contracts`."""
+    probabilities = _normalize(probabilities)
+    profits = np.asarray(values, dtype=np.float64) - np.asarray(costs, dtype=np.float64)[:, None]
+    mean = (probabilities * profits).sum(axis=1)
+    var = (probabilities * (profits - mean[:, None]) ** 2).sum(axis=1)
+    p_loss = (probabilities * (profits < 0)).sum(axis=1)
+    return RiskReport(mean, np.sqrt(var), p_loss, _weighted_quantiles(profits, probabilities, np.asarray(quantiles)))
+
+def simulate_portfolio(
+    probabilities: np.ndarray,
+    values: np.ndarray,
+    costs: np.ndarray,
+    n_draws: int = 1_000_000,
+    seed: int | None = 0,
+    quantiles: tuple[float, ...] = QUANTILES,
+    chunk_size: int = 1 << 22,
+) -> RiskReport:
+    """Profit distribution of running all K contracts once each, drawn `n_draws` times.
+    Draws are generated in chunks of about `chunk_size` outcomes so memory stays bounded."""
+    rng = np.random.default_rng(seed)
+    probabilities = _normalize(probabilities)
+    profits = np.asarray(values, dtype=np.float64) - np.asarray(costs, dtype=np.float64)[:, None]
+    k, m = probabilities.shape
+    # one monotone array for every contract: row r's cdf shifted by r, so a single
+    # searchsorted samples all contracts at once
+    cdf = np.cumsum(probabilities, axis=1)
+    cdf[:, -1] = 1.0
+    flat_cdf = (cdf + np.arange(k)[:, None]).ravel()
+    flat_profits = profits.ravel()
+    rows = np.arange(k)[None, :]
+    totals = np.empty(n_draws)
+    step = max(1, chunk_size // k)
+    for start in range(0, n_draws, step):
+        n = min(step, n_draws - start)
+        u = rng.random((n, k)) + rows
+        picks = np.minimum(np.searchsorted(flat_cdf, u, side='right'), (rows + 1) * m - 1)
+        totals[start:start + n] = flat_profits[picks].sum(axis=1)
+    return RiskReport(
+        np.float64(totals.mean()),
+        np.float64(totals.std()),
+        np.float64((totals < 0).mean()),
+        np.quantile(totals, quantiles),
+    )
+
+def portfolio_variance(probabilities: np.ndarray, values: np.ndarray, costs: np.ndarray) -> float:
+    """Exact variance of the portfolio profit, contracts being independent."""
+    return float((exact_risk(probabilities, values, costs).std ** 2).sum())
@@ -0,0 +1,170 @@
+"""
+Streaming top-k search over container combinations and count splits.
+
+Containers are visited in decreasing order of their best-case outcome price; a
+combination can never be worth more than the best outcome of its first (best)
+container, so as soon as that bound minus the cheapest possible inputs falls
+under the k-th best contract the rest of the search is cut. Candidates are
+generated lazily and only the k best are kept, memory does not grow with the
+size of the search space.
+"""
+import heapq
+import itertools
+from typing import Iterator, NamedTuple
+
+import numpy as np
+
+from cs2.optimize.breakpoints import evaluate_breakpoints
+from cs2.optimize.ga.problem import CONTRACT_SIZE
+from cs2.optimize.input_solver import InputSolver
+from cs2.optimize.outcome_index import OutcomeIndex
+from cs2.optimize.utilities import HashNameTable
+
+
+class Candidate(NamedTuple):
+    container_names: tuple[str, ...]
+    counts: tuple[int, ...]
+    avg_float: float
+    expected_value: float
+    cost: float
+    profit: float
+    roi: float
+
+
+def compositions(total: int, parts: int) -> Iterator[tuple[int, ...]]:
+    """Every way to split `total` inputs into `parts` containers, each using at least one."""
+    for cuts in itertools.combinations(range(1, total), parts - 1):
+        bounds = (0, *cuts, total)
+        yield tuple(bounds[i + 1] - bounds[i] for i in range(parts))
+
+
+class ContractSearch:
+    def __init__(
+        self,
+        index: OutcomeIndex,
+        solver: InputSolver,
+        prices: dict[str, float],
+        quality: str,
+        rarity: str,
+        max_containers: int = 2,
+        contract_size: int = CONTRACT_SIZE,
+    ):
+        """
+        Args:
+            index (OutcomeIndex): Outcomes of every (container, rarity).
+            solver (InputSolver): Cheapest inputs of every (quality, container, rarity).
+            prices (dict[str, float]): market_hash_name -> price of the outcomes.
+            quality (str): Quality of the inputs, as in `price.csv`.
+            rarity (str): Rarity of the inputs.
+            max_containers (int): Most containers mixed in one contract.
+        """
+        self.index = index
+        self.solver = solver
+        self.quality = quality
+        self.rarity = rarity
+        self.max_containers = max_containers
+        self.contract_size = contract_size
+        hash_names = HashNameTable(index.weapon_names)
+        price_array = np.array([prices.get(name, np.nan) for name in hash_names.names])
+        self._hash_table = hash_names.table
+        self._prices = price_array
+
+        containers, best_prices, min_inputs, outcomes = [], [], [], {}
+        for key, group in solver.groups.items():
+            if key[0] != quality or key[2] != rarity:
+                continue
+            container_outcomes = index.outcomes(key[1], rarity)
+            if not len(container_outcomes.ids):
+                continue
+            outcome_prices = self._prices[self._hash_table[container_outcomes.ids]]
+            if np.all(np.isnan(outcome_prices)):
+                continue
+            containers.append(key[1])
+            best_prices.append(np.nanmax(outcome_prices))
+            min_inputs.append(group['price'].min())
+        order = np.argsort(best_prices, kind='stable')[::-1]
+        self.containers: list[str] = [containers[i] for i in order]
+        # best-case outcome price and cheapest single input of every container
+        self.best_prices = np.array(best_prices)[order]
+        self.min_inputs = np.array(min_inputs)[order]
+        self.next_rarity_num = np.array([len(index.outcomes(c, rarity).ids) for c in self.containers])
+
+    def _keys(self, combo: tuple[int, ...]) -> list[tuple]:
+        return [(self.quality, self.containers[c], self.rarity) for c in combo]
+
+    def upper_bound(self, combo: tuple[int, ...], counts: tuple[int, ...], objective: str) -> float:
+        """Score no contract of this mix can beat: every outcome at its best price, inputs at their cheapest."""
+        counts = np.array(counts)
+        weights = counts * self.next_rarity_num[list(combo)]
+        expected_value = float(weights @ self.best_prices[list(combo)] / weights.sum())
+        cost = float(counts @ self.min_inputs[list(combo)])
+        return expected_value - cost if objective == 'profit' else expected_value / cost
+
+    def _branch_bound(self, first: int, objective: str) -> float:
+        # combinations led by `first` only hold containers with lower best-case prices
+        cheapest = self.contract_size * self.min_inputs[first:].min()
+        return self.best_prices[first] - cheapest if objective == 'profit' else self.best_prices[first] / cheapest
+
+    def evaluate(self, combo: tuple[int, ...], counts: tuple[int, ...]) -> Iterator[Candidate]:
+        """Every breakpoint contract of one mix."""
+        names = [self.containers[c] for c in combo]
+        outcomes = self.index.contract_outcomes(names, self.rarity)
+        outcome_prices = np.nan_to_num(self._prices[self._hash_table[outcomes.outcome_ids]])
+        points, expected_values = evaluate_breakpoints(
+            np.array(counts), outcomes.outcome_container, outcomes.outcome_ranges, outcome_prices
+        )
+        input_cost = self.solver.input_cost(self._keys(combo), counts)
+        for avg_float, expected_value in zip(points.tolist(), expected_values.tolist()):
+            cost = input_cost(avg_float)
+            if not np.isfinite(cost):
+                continue
+            yield Candidate(tuple(names), counts, avg_float, expected_value, cost,
+                            expected_value - cost, expected_value / cost if cost > 0 else np.inf)
+
+    def mixes(self) -> Iterator[tuple[tuple[int, ...], tuple[int, ...]]]:
+        """(container indices, counts) of every mix, best-case containers first."""
+        for first in range(len(self.containers)):
+            for size in range(1, self.max_containers + 1):
+                for rest in itertools.combinations(range(first + 1, len(self.containers)), size - 1):
+                    combo = (first, *rest)
+                    for counts in compositions(self.contract_size, size):
+                        yield combo, counts
+
+    def candidates(self) -> Iterator[Candidate]:
+        """Every contract of the search space, unpruned."""
+        for combo, counts in self.mixes():
+            yield from self.evaluate(combo, counts)
+
+    def top_k(self, k: int = 20, objective: str = 'profit', per_mix: bool = True) -> list[Candidate]:
+        """The k best contracts by `objective` ('profit' or 'roi'), best first.
+        Args:
+            per_mix (bool): Keep only the best breakpoint of every mix, so results are distinct mixes."""
+        if objective not in ('profit', 'roi'):
+            raise ValueError(f"Unknown objective: {objective}")
+        heap: list[tuple[float, int, Candidate]] = []
+        sequence = itertools.count()
+
+        def threshold() -> float:
+            return heap[0][0] if len(heap) >= k else -np.inf
+
+        current_first = -1
+        for combo, counts in self.mixes():
+            if combo[0] != current_first:
+                current_first = combo[0]
+                if self._branch_bound(current_first, objective) <= threshold():
+                    # later branches are led by containers with even lower best-case prices
+                    break
+            if self.upper_bound(combo, counts, objective) <= threshold():
+                continue
+            found = self.evaluate(combo, counts)
+            if per_mix:
+                found = [max(found, key=lambda c: getattr(c, objective), default=None)]
+            for candidate in found:
+                if candidate is None:
+                    continue
+                entry = (getattr(candidate, objective), next(sequence), candidate)
+                if len(heap) < k:
+                    heapq.heappush(heap, entry)
+                elif entry[0] > heap[0][0]:
+                    heapq.heapreplace(heap, entry)
+        return [candidate for _, _, candidate in sorted(heap, reverse=True)]
@@ -1,7 +1,9 @@
-import re
+from bisect import bisect_left
 
+import numpy as np
 from pydantic import BaseModel
 
+from cs2.data_model.hash_name_index import WEAR_RANKS, parse_hash_name
 from cs2.data_model.response_model import Info
 from cs2.scrape.cs2_terms import wear_value, value_to_wear
 
@@ -16,7 +18,6 @@ class Weapon(BaseModel):
     min_float: float
     max_float: float
 
-wear_rank_p = re.compile(r'\s*\(([^)]*)\)\s*$')
 def build_weapon_identity(mappings: dict):
     identity = {}
     for container_name, content in mappings.items():
@@ -25,10 +26,10 @@ def build_weapon_identity(mappings: dict):
             weapon = {}
             float_ranges = []
             for item in items:
-                weapon_name = wear_rank_p.sub('', item.data.goods_info.market_hash_name).strip()
+                parsed = parse_hash_name(item.data.goods_info.market_hash_name)
+                weapon_name = parsed.weapon_name
                 if item.data.goods_info.min_float is None or item.data.goods_info.max_float is None:
-                    wear_rank = wear_rank_p.search(item.data.goods_info.market_hash_name).group(1)
-                    wear_range = wear_value.get(wear_rank)
+                    wear_range = wear_value.get(WEAR_RANKS[parsed.wear]) if parsed.wear >= 0 else None
                     item.data.goods_info.min_float = float(wear_range.split('-')[0])
                     item.data.goods_info.max_float = float(wear_range.split('-')[1])
                 if weapon_name not in weapon:
@@ -63,10 +64,58 @@ def build_weapon_identity(mappings: dict):
             identity.setdefault(container_name, {})[rarity] = weapon_list
     return identity
 
+# bounds of `WEAR_RANKS`, parsed once
+WEAR_LOWER = np.array([float(r.split('-')[0]) for r in value_to_wear])
+WEAR_UPPER = np.array([float(r.split('-')[1]) for r in value_to_wear])
+_wear_upper = WEAR_UPPER.tolist()
+
+
+def wear_tier(float_: float) -> int:
+    """Index into `WEAR_RANKS` of a float, -1 when out of range.
+    A float on a boundary belongs to the lower tier, e.g. 0.07 is Factory New."""
+    if not WEAR_LOWER[0] <= float_ <= _wear_upper[-1]:
+        return -1
+    return bisect_left(_wear_upper, float_)
+
+def wear_tiers(floats: np.ndarray) -> np.ndarray:
+    """Vectorized `wear_tier`."""
+    floats = np.asarray(floats, dtype=np.float64)
+    tiers = np.searchsorted(WEAR_UPPER, floats, side='left').astype(np.int8)
+    tiers[~((floats >= WEAR_LOWER[0]) & (floats <= WEAR_UPPER[-1]))] = -1
+    return tiers
+
 def return_hash_name(weaopn_name: str, float_: float):
-    for range_str, wear_rank in value_to_wear.items():
-        min_f, max_f = map(float, range_str.split('-'))
-        if min_f <= float_ <= max_f:
-            return f"{weaopn_name} ({wear_rank})"
+    tier = wear_tier(float_)
+    if tier >= 0:
+        return f"{weaopn_name} ({WEAR_RANKS[tier]})"
+
+
+class HashNameTable:
+    """Interned hash names of every (weapon, wear tier).
+
+    `resolve` maps arrays of weapon ids and floats to integer hash name ids, the
+    strings are only built once here and looked up with `name` when needed."""
+
+    def __init__(self, weapon_names: list[str]):
+        self.names: list[str] = []
+        ids: dict[str, int] = {}
+        self.table = np.empty((len(weapon_names), len(WEAR_RANKS)), dtype=np.int32)
+        for i, weapon_name in enumerate(weapon_names):
+            for tier, wear_rank in enumerate(WEAR_RANKS):
+                hash_name = f"{weapon_name} ({wear_rank})"
+                if hash_name not in ids:
+                    ids[hash_name] = len(self.names)
+                    self.names.append(hash_name)
+                self.table[i, tier] = ids[hash_name]
+        self.ids = ids
 
+    def resolve(self, weapon_ids: np.ndarray, floats: np.ndarray) -> np.ndarray:
+        """Hash name id of every (weapon id, float) pair, -1 when the float is out of range."""
+        weapon_ids, floats = np.broadcast_arrays(np.asarray(weapon_ids, dtype=np.intp), floats)
+        tiers = wear_tiers(floats)
+        hash_ids = self.table[weapon_ids, np.maximum(tiers, 0)]
+        hash_ids[tiers < 0] = -1
+        return hash_ids
 
+    def name(self, hash_id: int) -> str | None:
+        return self.names[hash_id] if hash_id >= 0 else None
@@ -0,0 +1,357 @@
+"""
+Asyncio fetcher of `/api/v1/info/good` responses.
+
+`get_cs2_goods_info` opens a new HTTPS connection per id and reopens the output
+file for every line. Here a small pool of keep-alive HTTP/1.1 connections is
+shared by `concurrency` tasks, "Too Many Requests" answers are retried with
+exponential backoff, and responses are appended to the output in batches by a
+single writer task.
+
+    fetcher = GoodsInfoFetcher(token, 'WeaponsINFO/goods_2025-09-25.jsonl')
+    stats = asyncio.run(fetcher.run(ids))
+
+or `python -m cs2.scrape.async_fetcher`, which takes the ids from the `get_cs2_id`
+index like `get_cs2_goods_info`; `--host 127.0.0.1 --port 8080 --no-ssl` points it at
+`mock_server`.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import ssl
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+from .get_cs2_id import INDEX_FILE, TOO_MANY_REQUESTS, load_ids
+from .throttle import AdaptiveThrottle
+
+API_HOST = 'api.csqaq.com'
+GOOD_PATH = '/api/v1/info/good'
+
+
+class HTTPResponse(NamedTuple):
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+    def text(self) -> str:
+        return self.body.decode('utf-8', errors='replace')
+
+
+class RateLimited(Exception):
+    pass
+
+
+class HTTPConnection:
+    """One keep-alive HTTP/1.1 connection, requests are sent one at a time."""
+
+    def __init__(self, host: str, port: int, ssl_context: ssl.SSLContext | None):
+        self.host = host
+        self.port = port
+        self.ssl_context = ssl_context
+        self.reader: asyncio.StreamReader | None = None
+        self.writer: asyncio.StreamWriter | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.writer is not None and not self.writer.is_closing()
+
+    async def open(self) -> None:
+        self.reader, self.writer = await asyncio.open_connection(
+            self.host, self.port, ssl=self.ssl_context,
+            server_hostname=self.host if self.ssl_context else None,
+        )
+
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except (ConnectionError, ssl.SSLError):
+                pass
+        self.reader = self.writer = None
+
+    async def request(self, method: str, path: str, headers: dict[str, str] | None = None) -> HTTPResponse:
+        if not self.is_open:
+            await self.open()
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}", "Connection: keep-alive"]
+        lines += [f"{k}: {v}" for k, v in (headers or {}).items()]
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed by server")
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        if response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            body = await self._read_chunked()
+        elif 'content-length' in response_headers:
+            body = await self.reader.readexactly(int(response_headers['content-length']))
+        else:
+            body = await self.reader.read()
+            response_headers['connection'] = 'close'
+        if response_headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return HTTPResponse(status, response_headers, body)
+
+    async def _read_chunked(self) -> bytes:
+        chunks = []
+        while True:
+            size = int((await self.reader.readline()).split(b';')[0], 16)
+            if size == 0:
+                # trailers end with an empty line
+                while (await self.reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return b''.join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readexactly(2)
+
+
+class ConnectionPool:
+    """At most `size` connections to one host, reused across requests."""
+
+    def __init__(self, host: str, port: int = 443, use_ssl: bool = True, size: int = 5):
+        self.host = host
+        self.port = port
+        self.ssl_context = ssl.create_default_context() if use_ssl else None
+        self.size = size
+        self._idle: asyncio.LifoQueue[HTTPConnection] = asyncio.LifoQueue()
+        self._slots = asyncio.Semaphore(size)
+        self._connections: list[HTTPConnection] = []
+        self.opened = 0
+
+    async def request(self, method: str, path: str, headers: dict[str, str] | None = None) -> HTTPResponse:
+        async with self._slots:
+            conn = self._idle.get_nowait() if not self._idle.empty() else self._new()
+            reused = conn.is_open
+            try:
+                if not reused:
+                    self.opened += 1
+                response = await conn.request(method, path, headers)
+            except (ConnectionError, asyncio.IncompleteReadError, ssl.SSLError):
+                await conn.close()
+                if not reused:
+                    raise
+                # the server dropped an idle connection, retry once on a fresh one
+                self.opened += 1
+                response = await conn.request(method, path, headers)
+            except BaseException:
+                await conn.close()
+                raise
+            finally:
+                self._idle.put_nowait(conn)
+            return response
+
+    def _new(self) -> HTTPConnection:
+        conn = HTTPConnection(self.host, self.port, self.ssl_context)
+        self._connections.append(conn)
+        return conn
+
+    async def close(self) -> None:
+        for conn in self._connections:
+            await conn.close()
+
+
+class FetchStats(NamedTuple):
+    fetched: int
+    failed: int
+    retries: int
+    connections: int
+    seconds: float
+
+
+class GoodsInfoFetcher:
+    def __init__(
+        self,
+        token: str | None,
+        output: str | Path,
+        host: str = API_HOST,
+        port: int = 443,
+        use_ssl: bool = True,
+        concurrency: int = 5,
+        rate: float = 1.0,
+        throttle: AdaptiveThrottle | None = None,
+        timeout: float = 30.0,
+        max_retries: int = 5,
+        backoff: float = 1.0,
+        batch_size: int = 50,
+        error_log: str | Path = 'error.log',
+    ):
+        """
+        Args:
+            token (str | None): `ApiToken` header.
+            output (str | Path): jsonl file the responses are appended to.
+            concurrency (int): Requests in flight, also the size of the connection pool.
+            rate (float): Initial requests per second of the default throttle, 0 for no limit.
+            throttle (AdaptiveThrottle | None): Shared throttle, adapted on 429s and timeouts;
+                defaults to one bucket at `rate`.
+            timeout (float): Seconds before a request counts as timed out and is retried.
+            max_retries (int): Retries of a rate limited, timed out or failed request before giving up on the id.
+            backoff (float): Initial retry delay in seconds, doubled after every retry, with jitter.
+            batch_size (int): Responses buffered before they are written.
+        """
+        self.token = token
+        self.output = Path(output)
+        self.host, self.port, self.use_ssl = host, port, use_ssl
+        self.concurrency = concurrency
+        if throttle is None and rate > 0:
+            throttle = AdaptiveThrottle(capacity=1, rate=rate, name='good')
+        self.throttle = throttle
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.batch_size = batch_size
+        self.error_log = Path(error_log)
+        self.retries = 0
+
+    def _log_error(self, message: str) -> None:
+        with open(self.error_log, 'a+', encoding='utf-8') as f:
+            f.write(message + '\n')
+
+    async def fetch(self, pool: ConnectionPool, good_id: int) -> dict | None:
+        """Response of one id, None when it could not be fetched."""
+        headers = {'ApiToken': self.token} if self.token else {}
+        delay = self.backoff
+        for attempt in range(self.max_retries + 1):
+            if self.throttle is not None:
+                await self.throttle.acquire()
+            try:
+                response = await asyncio.wait_for(
+                    pool.request('GET', f"{GOOD_PATH}?id={good_id}", headers), self.timeout)
+                decoded = response.text()
+                if response.status == 429 or TOO_MANY_REQUESTS in decoded:
+                    raise RateLimited(decoded)
+            # OSError covers timeouts, refused and dropped connections, DNS failures (socket.gaierror) and TLS errors
+            except (RateLimited, asyncio.IncompleteReadError, OSError) as e:
+                if self.throttle is not None:
+                    if isinstance(e, RateLimited):
+                        self.throttle.on_throttled()
+                    elif isinstance(e, TimeoutError):
+                        self.throttle.on_timeout()
+                if attempt == self.max_retries:
+                    self._log_error(f"Giving up on good ID {good_id}: {e!r}")
+                    return None
+                self.retries += 1
+                await asyncio.sleep(delay * (1 + random.random()))
+                delay *= 2
+                continue
+            if self.throttle is not None:
+                self.throttle.on_success()
+            try:
+                ret = json.loads(decoded)
+            except json.JSONDecodeError:
+                self._log_error(f"JSON decode error for good ID {good_id}: {decoded}")
+                return None
+            if ret.get('code') != 200:
+                self._log_error(f"API Error for good ID {good_id}: {ret.get('msg')}")
+                return None
+            return ret
+        return None
+
+    async def _write(self, queue: asyncio.Queue) -> int:
+        """Append queued responses `batch_size` lines at a time until a None arrives."""
+        written, batch, done = 0, [], False
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.output, 'a', encoding='utf-8') as f:
+            while not done:
+                item = await queue.get()
+                if item is None:
+                    done = True
+                else:
+                    batch.append(json.dumps(item, ensure_ascii=False) + '\n')
+                # drain what is already waiting before touching the file
+                while len(batch) < self.batch_size and not queue.empty():
+                    item = queue.get_nowait()
+                    if item is None:
+                        done = True
+                        break
+                    batch.append(json.dumps(item, ensure_ascii=False) + '\n')
+                if batch and (done or len(batch) >= self.batch_size or queue.empty()):
+                    f.write(''.join(batch))
+                    f.flush()
+                    written += len(batch)
+                    batch = []
+        return written
+
+    async def run(self, ids: Iterable[int], progress=None) -> FetchStats:
+        """Fetch every id and append the responses to `output`.
+        Args:
+            ids (Iterable[int]): Good ids to fetch.
+            progress: Optional callable invoked once per finished id, e.g. `tqdm.update`.
+        """
+        start = time.perf_counter()
+        pool = ConnectionPool(self.host, self.port, self.use_ssl, size=self.concurrency)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.batch_size * 4)
+        writer = asyncio.create_task(self._write(queue))
+        pending = iter(ids)
+        failed = 0
+
+        async def worker():
+            nonlocal failed
+            for good_id in pending:
+                ret = await self.fetch(pool, good_id)
+                if ret is None:
+                    failed += 1
+                else:
+                    await queue.put(ret)
+                if progress is not None:
+                    progress()
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        finally:
+            await queue.put(None)
+            fetched = await writer
+            await pool.close()
+        return FetchStats(fetched, failed, self.retries, pool.opened, time.perf_counter() - start)
+
+
+def extracted_ids(output: str | Path) -> set[int]:
+    """Ids already saved in `output`, so an interrupted run only fetches the rest."""
+    output = Path(output)
+    if not output.exists():
+        return set()
+    with open(output, 'r', encoding='utf-8') as f:
+        return {json.loads(line)['data']['goods_info']['id'] for line in f if line.strip()}
+
+def main():
+    from dotenv import load_dotenv
+    from tqdm import tqdm
+
+    load_dotenv()
+    date_str = datetime.now().strftime("%Y-%m-%d")
+    parser = argparse.ArgumentParser(description="Fetch goods info of every id found by get_cs2_id.")
+    parser.add_argument('--index', default=INDEX_FILE, help='id index of get_cs2_id')
+    parser.add_argument('--output', default=f"WeaponsINFO/goods_{date_str}.jsonl")
+    parser.add_argument('--host', default=API_HOST)
+    parser.add_argument('--port', type=int, default=443)
+    parser.add_argument('--no-ssl', action='store_true')
+    parser.add_argument('--concurrency', type=int, default=5)
+    parser.add_argument('--rate', type=float, default=1.0, help='requests per second')
+    args = parser.parse_args()
+
+    done = extracted_ids(args.output)
+    ids = [item['id'] for item in load_ids(args.index) if item['id'] not in done]
+    print(f"Total IDs to fetch: {len(ids)}")
+    fetcher = GoodsInfoFetcher(os.environ.get("cs_api_token"), args.output, host=args.host, port=args.port,
+                               use_ssl=not args.no_ssl, concurrency=args.concurrency, rate=args.rate)
+    with tqdm(total=len(ids), desc="Fetching goods info") as bar:
+        stats = asyncio.run(fetcher.run(ids, progress=bar.update))
+    print(stats)
+    if fetcher.throttle is not None:
+        print(fetcher.throttle.metrics())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""
+Durable record of what the scraper has already extracted.
+
+Replaces re-parsing `scrape.log` on every browser restart: finished float ranges
+are rows of a SQLite table keyed by (yyid, min_float, max_float), and items whose
+listings were fully paginated are rows keyed by yyid. The database runs in WAL
+mode, every mark is its own transaction, and a lookup is an index probe, so the
+cost of a restart does not grow with the length of the scrape.
+
+An existing `scrape.log` is imported once, as a migration. Its "Success" lines are
+written before the listings reach the disk, so importing the lines of later runs
+again would mark ranges whose records were lost in a crash as done.
+"""
+import sqlite3
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Iterable
+
+CHECKPOINT_FILE = 'scrape_checkpoint.sqlite3'
+# float bounds are stored rounded, the same range typed twice must hit the same key
+FLOAT_DIGITS = 6
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ranges (
+    yyid INTEGER NOT NULL,
+    min_float REAL NOT NULL,
+    max_float REAL NOT NULL,
+    done_at REAL NOT NULL,
+    PRIMARY KEY (yyid, min_float, max_float)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS full_items (
+    yyid INTEGER PRIMARY KEY,
+    done_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+INSERT_RANGE = "INSERT OR REPLACE INTO ranges VALUES (?, ?, ?, ?)"
+INSERT_FULL = "INSERT OR REPLACE INTO full_items VALUES (?, ?)"
+
+
+def _key(yyid, min_float: float, max_float: float) -> tuple[int, float, float]:
+    return int(yyid), round(float(min_float), FLOAT_DIGITS), round(float(max_float), FLOAT_DIGITS)
+
+
+class CheckpointStore:
+    """Thread-safe; one connection shared behind a lock."""
+
+    def __init__(self, path: str | Path = CHECKPOINT_FILE):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # WAL with synchronous=NORMAL survives a process crash, only an OS crash can drop the last commits
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
+
+    def __enter__(self) -> "CheckpointStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _write(self, *batches: tuple[str, list[tuple]]) -> None:
+        """Run every (sql, rows) batch in one transaction."""
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                for sql, rows in batches:
+                    self.conn.executemany(sql, rows)
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def mark_range(self, yyid, min_float: float, max_float: float) -> None:
+        self.mark_ranges([(yyid, min_float, max_float)])
+
+    def mark_ranges(self, ranges: Iterable[tuple]) -> None:
+        """Record (yyid, min_float, max_float) ranges in one transaction."""
+        now = time.time()
+        rows = [_key(*r) + (now,) for r in ranges]
+        self._write((INSERT_RANGE, rows))
+
+    def mark_full(self, yyid) -> None:
+        """Record that every listing of an item was paginated through."""
+        self._write((INSERT_FULL, [(int(yyid), time.time())]))
+
+    def has_range(self, yyid, min_float: float, max_float: float) -> bool:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM ranges WHERE yyid = ? AND min_float = ? AND max_float = ?",
+                _key(yyid, min_float, max_float),
+            ).fetchone()
+        return row is not None
+
+    def is_full(self, yyid) -> bool:
+        with self.lock:
+            row = self.conn.execute("SELECT 1 FROM full_items WHERE yyid = ?", (int(yyid),)).fetchone()
+        return row is not None
+
+    def done_ranges(self, yyid) -> set[tuple[float, float]]:
+        """(min_float, max_float) of every finished range of one item."""
+        with self.lock:
+            rows = self.conn.execute("SELECT min_float, max_float FROM ranges WHERE yyid = ?", (int(yyid),)).fetchall()
+        return set(rows)
+
+    def counts(self) -> tuple[int, int]:
+        """(finished ranges, fully paginated items)."""
+        with self.lock:
+            ranges = self.conn.execute("SELECT COUNT(*) FROM ranges").fetchone()[0]
+            full = self.conn.execute("SELECT COUNT(*) FROM full_items").fetchone()[0]
+        return ranges, full
+
+    def _meta(self, key: str) -> str | None:
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def import_log(self, logger_file: str | Path) -> int:
+        """Import the "Success" lines of a scraper log once, returning how many; later calls are no-ops."""
+        logger_file = Path(logger_file)
+        key = f"log_imported:{logger_file.resolve()}"
+        if self._meta(key) is not None:
+            return 0
+        ranges, full = [], []
+        with open(logger_file, 'rb') if logger_file.exists() else nullcontext([]) as f:
+            for raw in f:
+                if not raw.endswith(b'\n'):
+                    break
+                line = raw.decode('utf-8', errors='replace')
+                if "Success" not in line:
+                    continue
+                parts = line.split('\t')
+                try:
+                    id_ = int(parts[0].split('id: ')[-1])
+                    if "full" in line:
+                        full.append((id_, time.time()))
+                        continue
+                    min_val, max_val = map(float, parts[1].split('range: ')[-1].split('-'))
+                except (ValueError, IndexError):
+                    continue
+                ranges.append(_key(id_, min_val, max_val) + (time.time(),))
+        self._write((INSERT_RANGE, ranges), (INSERT_FULL, full),
+                    ("INSERT OR REPLACE INTO meta VALUES (?, ?)", [(key, '1')]))
+        return len(ranges) + len(full)
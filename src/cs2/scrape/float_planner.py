@@ -0,0 +1,204 @@
+"""
+Adaptive planning of the float range searches of one item.
+
+The goal of a scrape is the cheapest listing of every bin of an item's float
+range (0.01 of the normalized float by default, see `normalized_bin_width`).
+Listings come back cheapest first, `PAGE_SIZE` per page, with the `TotalCount`
+of the searched range, which gives two ways to settle a bin:
+
+- a bin fully inside the searched range whose listing shows up on the page: the
+  first such listing is the cheapest of the bin, whatever is left unseen costs more;
+- a searched range with at most `PAGE_SIZE` listings: every bin in it is settled,
+  empty or not.
+
+Instead of sweeping every 0.01 step, `FloatPlanner` keeps the unsettled bins as
+runs, splits a run whose expected count exceeds a page (the density estimate comes
+from the smallest search covering it), and merges nearby sparse runs into one
+search when their combined expected count still fits in a page. `prefer_pagination`
+weighs the expected number of searches against paging through the whole item.
+
+A single-bin search that still settles nothing (an empty page despite its
+`TotalCount`, listings without `abrade`) is given up for this run, and the searches
+of an item are capped at `max_searches`, so the loop below always ends.
+
+    planner = FloatPlanner(0.45, 1.00, done=checkpoint.done_ranges(yyid))
+    planner.record(*planner.full_range, total_count, listings)   # the unfiltered page
+    while (r := planner.next_range()) is not None:
+        planner.record(*r, search(r))
+"""
+import math
+from typing import Iterable, NamedTuple
+
+import numpy as np
+
+PAGE_SIZE = 10
+# relative cost of a float range search (open the filter, fill, confirm) and of a next-page click
+RANGE_COST = 1.0
+PAGE_COST = 0.6
+
+
+def normalized_bin_width(min_float: float, max_float: float, step: float = 0.01) -> float:
+    """Raw float width of a `step` bin of the normalized float `(abrade - min_float) / (max_float - min_float)`."""
+    return step * (max_float - min_float)
+
+
+class Recorded(NamedTuple):
+    listings: list[dict]
+    """Cheapest listing of every bin settled with a listing by this search."""
+    bins: list[tuple[float, float]]
+    """(low, high) edges of every bin settled by this search, with or without a listing."""
+
+
+class FloatPlanner:
+    def __init__(
+        self,
+        min_float: float,
+        max_float: float,
+        bin_width: float = 0.01,
+        done: Iterable[tuple[float, float]] = (),
+        page_size: int = PAGE_SIZE,
+        range_cost: float = RANGE_COST,
+        page_cost: float = PAGE_COST,
+        decimals: int = 4,
+        max_searches: int | None = None,
+        origin: float | None = None,
+    ):
+        """
+        Args:
+            min_float, max_float: Float range of the item to cover.
+            bin_width: Raw float width of a bin.
+            done: (low, high) bins settled by an earlier run, e.g. `CheckpointStore.done_ranges`.
+            decimals: Edges are rounded to this many decimals, they are typed into the site.
+            max_searches: Searches after which `next_range` stops, twice the number of bins by default.
+            origin: Float the bin grid starts from, `min_float` by default; the skin's minimum float
+                aligns the bins with the normalized float when the range is one wear tier of it.
+        """
+        origin = min_float if origin is None else origin
+        first = math.floor((min_float - origin) / bin_width + 1e-9) + 1
+        last = math.ceil((max_float - origin) / bin_width - 1e-9)
+        inner = origin + np.arange(first, max(first, last)) * bin_width
+        # a grid point rounding onto an end would leave an empty bin
+        edges = np.unique(np.round(np.concatenate([[min_float], inner, [max_float]]), decimals))
+        n = len(edges) - 1
+        self.edges = edges
+        self.page_size = page_size
+        self.range_cost = range_cost
+        self.page_cost = page_cost
+        self.resolved = np.zeros(n, dtype=bool)
+        # bins whose search settled nothing, left unsettled for the next run
+        self.skipped = np.zeros(n, dtype=bool)
+        self.max_searches = 2 * n if max_searches is None else max_searches
+        self.cheapest: list[dict | None] = [None] * n
+        # (first bin, end bin, total count) of every search so far
+        self.observations: list[tuple[int, int, int]] = []
+        self.requests = 0
+        index = {(round(float(lo), 6), round(float(hi), 6)): i for i, (lo, hi) in enumerate(zip(edges[:-1], edges[1:]))}
+        for lo, hi in done:
+            i = index.get((round(lo, 6), round(hi, 6)))
+            if i is not None:
+                self.resolved[i] = True
+
+    @property
+    def num_bins(self) -> int:
+        return len(self.resolved)
+
+    @property
+    def complete(self) -> bool:
+        return bool(self.resolved.all())
+
+    @property
+    def full_range(self) -> tuple[float, float]:
+        return float(self.edges[0]), float(self.edges[-1])
+
+    def bin_range(self, i: int, j: int) -> tuple[float, float]:
+        """Float range of bins i..j-1."""
+        return float(self.edges[i]), float(self.edges[j])
+
+    def _bins_of(self, low: float, high: float) -> tuple[int, int]:
+        """Bins fully inside [low, high]."""
+        i = int(np.searchsorted(self.edges, low - 1e-9, side='left'))
+        j = int(np.searchsorted(self.edges, high + 1e-9, side='right')) - 1
+        return i, max(i, j)
+
+    def record(self, low: float, high: float, total_count: int, listings: list[dict]) -> Recorded:
+        """Fold in the first page of a search of [low, high]."""
+        self.requests += 1
+        i, j = self._bins_of(low, high)
+        if j > i:
+            self.observations.append((i, j, int(total_count)))
+        new_listings, settled = [], []
+        for listing in listings:
+            try:
+                b = int(np.searchsorted(self.edges, float(listing['abrade']), side='right')) - 1
+            except (KeyError, TypeError, ValueError):
+                continue
+            if i <= b < j and not self.resolved[b]:
+                self.resolved[b] = True
+                self.cheapest[b] = listing
+                new_listings.append(listing)
+                settled.append(b)
+        if total_count <= self.page_size:
+            # the page held every listing of the range
+            rest = [b for b in range(i, j) if not self.resolved[b]]
+            self.resolved[i:j] = True
+            settled.extend(rest)
+        elif not settled and j - i == 1:
+            # a smaller search is not possible, searching it again would return the same page
+            self.skipped[i] = True
+        return Recorded(new_listings, [self.bin_range(b, b + 1) for b in sorted(settled)])
+
+    def _density(self, i: int, j: int) -> float:
+        """Expected listings per bin of bins i..j-1, from the smallest search covering them."""
+        covering = [(e - s, total) for s, e, total in self.observations if s <= i and j <= e]
+        if not covering:
+            return float(self.page_size)
+        width, total = min(covering)
+        return total / width
+
+    def _runs(self) -> list[tuple[int, int]]:
+        runs, start = [], None
+        for b, done in enumerate((self.resolved | self.skipped).tolist() + [True]):
+            if not done and start is None:
+                start = b
+            elif done and start is not None:
+                runs.append((start, b))
+                start = None
+        return runs
+
+    def _plan(self) -> list[tuple[int, int]]:
+        """Searches, as bin spans, that settle the unsettled bins under the current density estimates."""
+        planned = []
+        for i, j in self._runs():
+            # merge with the previous span when the union, gap included, still fits in a page
+            if planned:
+                pi, _ = planned[-1]
+                if self._density(pi, j) * (j - pi) <= self.page_size:
+                    planned[-1] = (pi, j)
+                    continue
+            while i < j:
+                step = max(1, int(self.page_size // max(self._density(i, j), 1e-9)))
+                planned.append((i, min(j, i + step)))
+                i += step
+        return planned
+
+    def next_range(self) -> tuple[float, float] | None:
+        """Next range to search, None once every bin is settled, skipped or the searches ran out."""
+        if self.requests >= self.max_searches:
+            return None
+        planned = self._plan()
+        if not planned:
+            return None
+        return self.bin_range(*planned[0])
+
+    def expected_searches(self) -> int:
+        """Searches left if the density estimates hold, at least one per planned span."""
+        count = 0
+        for i, j in self._plan():
+            expected = self._density(i, j) * (j - i)
+            count += min(j - i, max(1, math.ceil(expected / self.page_size)))
+        return count
+
+    def prefer_pagination(self, total_count: int) -> bool:
+        """Whether paging through all `total_count` listings of the item is cheaper than searching."""
+        pages = max(0, math.ceil(total_count / self.page_size) - 1)
+        return pages * self.page_cost <= self.expected_searches() * self.range_cost
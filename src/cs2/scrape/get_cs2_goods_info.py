@@ -1,13 +1,13 @@
 import os
 import http.client
 import json
-import glob
 from threading import Lock
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from dotenv import load_dotenv
 
 from .throttle import Throttle
+from .get_cs2_id import load_ids
 from datetime import datetime
 from tqdm import tqdm
 
@@ -19,15 +19,7 @@ TOKEN = os.environ.get("cs_api_token")
 date_str = datetime.now().strftime("%Y-%m-%d")
 FILE = f"WeaponsINFO/goods_{date_str}.jsonl"
 
-merged_list = []
-json_files = glob.glob("WeaponsID/*.json")
-for file in json_files:
-    with open(file, "r", encoding="utf-8") as f:
-        data = json.load(f)
-        if isinstance(data, list):
-            merged_list.extend(data)
-        else:
-            merged_list.append(data)
+merged_list = load_ids()
 
 
 def fetch_good_info(good_id):
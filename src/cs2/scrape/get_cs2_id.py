@@ -1,66 +1,240 @@
+"""
+Discover the good ids of every weapon category through `/api/v1/info/get_good_id`.
+
+The first page of every category is fetched to learn its page count, then all
+remaining pages of all categories are fetched concurrently under one shared rate
+limit, each thread on its own connection. Pages are recorded in one consolidated
+index, saved every `save_every` pages and at the end of every round, so an
+interrupted run resumes close to where it stopped.
+
+    python -m cs2.scrape.get_cs2_id
+"""
 import os
 import http.client
 import json
+import glob
+import socket
+import ssl
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
 
 from cs2.scrape.cs2_terms import categories
+from cs2.scrape.throttle import AdaptiveThrottle, RateLimiter
 
 from dotenv import load_dotenv
 load_dotenv()
 
-conn = http.client.HTTPSConnection("api.csqaq.com")
 TOKEN = os.environ.get("cs_api_token")
+API_HOST = "api.csqaq.com"
+ID_PATH = "/api/v1/info/get_good_id"
+PAGE_SIZE = 500
+INDEX_FILE = "WeaponsID/index.json"
+TOO_MANY_REQUESTS = "Too Many Requests"
+
+
+def page_count(total: int, page_size: int = PAGE_SIZE) -> int:
+   return total // page_size + (1 if total % page_size > 0 else 0)
+
+
+class IdIndex:
+   """
+   Pages fetched so far, saved as one json file:
+      {category: {"total": int, "page_size": int, "pages": {page_index: [item, ...]}}}
+   """
+
+   def __init__(self, path: str | Path = INDEX_FILE):
+      self.path = Path(path)
+      self.lock = threading.Lock()
+      self.categories: dict[str, dict] = {}
+      if self.path.exists():
+         self.categories = json.loads(self.path.read_text(encoding="utf-8"))
+
+   def save(self):
+      """Write through a temporary file, an interrupted save keeps the previous index."""
+      with self.lock:
+         self.path.parent.mkdir(parents=True, exist_ok=True)
+         tmp = self.path.with_name(self.path.name + ".tmp")
+         tmp.write_text(json.dumps(self.categories, ensure_ascii=False), encoding="utf-8")
+         os.replace(tmp, self.path)
+
+   def add_page(self, category: str, page_index: int, total: int, items: list[dict], page_size: int = PAGE_SIZE):
+      with self.lock:
+         entry = self.categories.setdefault(category, {"total": total, "page_size": page_size, "pages": {}})
+         if entry.get("page_size", PAGE_SIZE) != page_size:
+            # pages of another size do not line up, start the category over
+            entry["page_size"], entry["pages"] = page_size, {}
+         entry["total"] = total
+         entry["pages"][str(page_index)] = items
+
+   def missing_pages(self, category: str) -> list[int]:
+      """Pages still to fetch, [1] while the page count is unknown."""
+      entry = self.categories.get(category)
+      if entry is None:
+         return [1]
+      pages = page_count(entry["total"], entry.get("page_size", PAGE_SIZE))
+      return [p for p in range(1, pages + 1) if str(p) not in entry["pages"]]
+
+   def complete(self, category: str) -> bool:
+      return not self.missing_pages(category)
 
-def get_weapon_ids(weapon_name):
+   def items(self, category: str | None = None) -> list[dict]:
+      """Items of one or every category, first occurrence of an id kept."""
+      seen, items = set(), []
+      names = [category] if category is not None else list(self.categories)
+      for name in names:
+         pages = self.categories.get(name, {}).get("pages", {})
+         for page in sorted(pages, key=int):
+            for item in pages[page]:
+               if item["id"] not in seen:
+                  seen.add(item["id"])
+                  items.append(item)
+      return items
 
-   returns = []
 
-   def make_request(page_index=1):
+class IdFetcher:
+   def __init__(
+      self,
+      token: str | None = TOKEN,
+      index: IdIndex | None = None,
+      host: str = API_HOST,
+      port: int = 443,
+      use_ssl: bool = True,
+      workers: int = 5,
+      limiter: RateLimiter | None = None,
+      max_retries: int = 5,
+      page_size: int = PAGE_SIZE,
+      timeout: float = 30.0,
+      save_every: int = 50,
+   ):
+      """
+      :param index: Where pages are recorded, defaults to `INDEX_FILE`.
+      :param workers: Threads fetching pages, each with its own connection.
+      :param limiter: Shared rate limiter, requests go through its `get_good_id` bucket.
+      :param max_retries: Retries of a rate limited or dropped request.
+      :param page_size: Ids per page, at most 500.
+      :param timeout: Seconds a connection may stall before the request is retried.
+      :param save_every: Pages fetched between two saves of the index.
+      """
+      self.token = token
+      self.index = index if index is not None else IdIndex()
+      self.host, self.port, self.use_ssl = host, port, use_ssl
+      self.workers = workers
+      self.limiter = limiter if limiter is not None else RateLimiter(capacity=1, rate=1.0)
+      self.max_retries = max_retries
+      self.page_size = page_size
+      self.timeout = timeout
+      self.save_every = save_every
+      self._local = threading.local()
+
+   @property
+   def bucket(self) -> AdaptiveThrottle:
+      return self.limiter.bucket("get_good_id")
+
+   def _connection(self) -> http.client.HTTPConnection:
+      """Connection of the calling thread, `http.client` connections are not thread-safe."""
+      conn = getattr(self._local, "conn", None)
+      if conn is None:
+         if self.use_ssl:
+            conn = http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout,
+                                               context=ssl.create_default_context())
+         else:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+         self._local.conn = conn
+      return conn
+
+   def _reset_connection(self):
+      conn = getattr(self._local, "conn", None)
+      if conn is not None:
+         conn.close()
+      self._local.conn = None
+
+   def make_request(self, weapon_name: str, page_index: int = 1) -> dict:
       payload = json.dumps({
          "page_index": page_index,
-         "page_size": 500,
+         "page_size": self.page_size,
          "search": weapon_name,
       })
       headers = {
-         'ApiToken': TOKEN,
+         'ApiToken': self.token or '',
          'Content-Type': 'application/json'
       }
-      conn.request("POST", "/api/v1/info/get_good_id", payload, headers)
-      res = conn.getresponse()
-      data = res.read()
-      ret = json.loads(data.decode("utf-8")) 
-      if ret['code'] != 200:
-         raise Exception(f"API error: {ret['msg']}")
-      return ret
-
-   first_ret = make_request()
-   returns.extend(list(first_ret['data']['data'].values()))
-   total = first_ret['data']['total']
-   page_num = total // 500 + (1 if total % 500 > 0 else 0)
-   if page_num > 1:
-      page_numbers = list(range(2, page_num + 1))
-      for page_n in page_numbers:
-         next_ret = make_request(page_n)
-         returns.extend(list(next_ret['data']['data'].values()))
-
-   return returns
-
-def fetch_and_save_to_file(weapon_name):
-   ids = get_weapon_ids(weapon_name)
-   os.makedirs("WeaponsID", exist_ok=True)
-   filename = os.path.join("WeaponsID", f"{weapon_name}_ids.json")
-   with open(filename, 'w') as f:
-      json.dump(ids, f, ensure_ascii=False, indent=2)
-   print(f"Saved {len(ids)} ids for {weapon_name} to {filename}")
+      for attempt in range(self.max_retries + 1):
+         self.bucket.wait_consume()
+         try:
+            conn = self._connection()
+            conn.request("POST", ID_PATH, payload, headers)
+            res = conn.getresponse()
+            decoded = res.read().decode("utf-8")
+         except (http.client.HTTPException, OSError) as e:
+            self._reset_connection()
+            if isinstance(e, socket.timeout):
+               # only a stalled server says anything about the rate, a dropped connection does not
+               self.bucket.on_timeout()
+            if attempt == self.max_retries:
+               raise
+            continue
+         if res.status == 429 or TOO_MANY_REQUESTS in decoded:
+            self.bucket.on_throttled()
+            if attempt == self.max_retries:
+               raise Exception(f"API error: {TOO_MANY_REQUESTS}")
+            continue
+         ret = json.loads(decoded)
+         if ret['code'] != 200:
+            raise Exception(f"API error: {ret['msg']}")
+         self.bucket.on_success()
+         return ret
 
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from throttle import Throttle
+   def fetch_page(self, weapon_name: str, page_index: int):
+      ret = self.make_request(weapon_name, page_index)
+      self.index.add_page(weapon_name, page_index, ret['data']['total'], list(ret['data']['data'].values()),
+                          self.page_size)
+
+   def _run(self, executor: ThreadPoolExecutor, tasks: list[tuple[str, int]]):
+      """Fetch a round of pages, saving the index every `save_every` pages and once the round ends."""
+      futures = {executor.submit(self.fetch_page, name, page): (name, page) for name, page in tasks}
+      try:
+         for done, future in enumerate(as_completed(futures), 1):
+            future.result()
+            if done % self.save_every == 0:
+               self.index.save()
+      finally:
+         self.index.save()
+
+   def _counted(self, weapon_name: str) -> bool:
+      """Whether the page count of a category is known for this page size."""
+      entry = self.index.categories.get(weapon_name)
+      return entry is not None and entry.get("page_size", PAGE_SIZE) == self.page_size
+
+   def fetch(self, weapon_names: list[str] = categories) -> IdIndex:
+      """Fetch every page of `weapon_names` that is not in the index yet."""
+      with ThreadPoolExecutor(max_workers=self.workers) as executor:
+         # page counts first, then every remaining page of every category at once
+         self._run(executor, [(name, 1) for name in weapon_names if not self._counted(name)])
+         self._run(executor, [(name, page) for name in weapon_names for page in self.index.missing_pages(name)])
+      for name in weapon_names:
+         print(f"{name}: {len(self.index.items(name))} ids")
+      return self.index
+
+
+def load_ids(index_path: str | Path = INDEX_FILE, pattern: str = "WeaponsID/*.json") -> list[dict]:
+   """Items of the consolidated index, or of the per-category files of older runs when it is missing."""
+   if Path(index_path).exists():
+      return IdIndex(index_path).items()
+   merged_list = []
+   for file in glob.glob(pattern):
+      with open(file, "r", encoding="utf-8") as f:
+         data = json.load(f)
+         if isinstance(data, list):
+            merged_list.extend(data)
+         else:
+            merged_list.append(data)
+   return merged_list
+
+def main():
+   index = IdFetcher().fetch()
+   print(f"Saved {len(index.items())} ids to {index.path}")
 
-throttler = Throttle(capacity=1, recovery_rate=1)
 
-def throttled_fetch_and_save(weapon_name):
-   throttler.wait_consume()
-   fetch_and_save_to_file(weapon_name)
-with ThreadPoolExecutor(max_workers=5) as executor:
-   futures = {executor.submit(throttled_fetch_and_save, weapon): weapon for weapon in categories}
-   for future in as_completed(futures):
-      future.result()
+if __name__ == '__main__':
+   main()
@@ -0,0 +1,179 @@
+"""
+Local stand-in for `api.csqaq.com`, for benchmarking fetchers offline.
+
+Serves `GET /api/v1/info/good?id=<id>` and the paginated name search of
+`POST /api/v1/info/get_good_id` over keep-alive HTTP/1.1 from a goods snapshot,
+with a token bucket that answers `429 Too Many Requests` once the
+client outpaces `rate`, like the real API does.
+
+    python -m cs2.scrape.mock_server WeaponsINFO/goods_2025-09-25.jsonl --port 8080 --rate 20
+"""
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from .async_fetcher import GOOD_PATH, TOO_MANY_REQUESTS
+from .get_cs2_id import ID_PATH
+
+
+class MockGoodsServer:
+    def __init__(
+        self,
+        responses: dict[int, bytes],
+        host: str = '127.0.0.1',
+        port: int = 0,
+        rate: float = 0.0,
+        burst: int = 1,
+        latency: float = 0.0,
+    ):
+        """
+        Args:
+            responses (dict[int, bytes]): good id -> json body.
+            port (int): 0 picks a free port, see `port` after `start`.
+            rate (float): Requests per second before answering 429, 0 for no limit.
+            burst (int): Requests allowed at once on top of `rate`.
+            latency (float): Seconds spent on every request, as network plus server time.
+        """
+        self.responses = responses
+        self.host = host
+        self.port = port
+        self.rate = rate
+        self.burst = burst
+        self.latency = latency
+        self.tokens = float(burst)
+        self.last_check = time.monotonic()
+        self.requests = 0
+        self.rejected = 0
+        self.connections = 0
+        self._names: dict[int, str] | None = None
+        self._server: asyncio.base_events.Server | None = None
+
+    @classmethod
+    def from_jsonl(cls, path: str | Path, **kwargs) -> "MockGoodsServer":
+        """Serve the lines of a `goods_{date}.jsonl` snapshot, keyed by `goods_info.id`."""
+        responses = {}
+        with open(path, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    responses[json.loads(line)['data']['goods_info']['id']] = line.strip()
+        return cls(responses, **kwargs)
+
+    def _allow(self) -> bool:
+        if self.rate <= 0:
+            return True
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last_check) * self.rate)
+        self.last_check = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def _search(self, body: bytes) -> bytes:
+        """One page of the goods whose name contains `search`, shaped like `get_good_id`."""
+        query = json.loads(body or b'{}')
+        if self._names is None:
+            self._names = {good_id: json.loads(r)['data']['goods_info']['name'] for good_id, r in self.responses.items()}
+        matches = [good_id for good_id, name in self._names.items() if query.get('search', '') in name]
+        page_index, page_size = int(query.get('page_index', 1)), int(query.get('page_size', 500))
+        page = matches[(page_index - 1) * page_size:page_index * page_size]
+        data = {'total': len(matches), 'data': {str(i): {'id': i, 'name': self._names[i]} for i in page}}
+        return json.dumps({'code': 200, 'data': data, 'msg': 'Success'}, ensure_ascii=False).encode()
+
+    def _respond(self, method: str, target: str, body: bytes) -> tuple[int, bytes, str]:
+        url = urlsplit(target)
+        if (method, url.path) not in (('GET', GOOD_PATH), ('POST', ID_PATH)):
+            return 404, b'Not Found', 'text/plain'
+        if not self._allow():
+            self.rejected += 1
+            return 429, TOO_MANY_REQUESTS.encode(), 'text/plain'
+        if url.path == ID_PATH:
+            return 200, self._search(body), 'application/json; charset=utf-8'
+        try:
+            good_id = int(parse_qs(url.query)['id'][0])
+            body = self.responses[good_id]
+        except (KeyError, ValueError):
+            body = json.dumps({'code': 400, 'data': None, 'msg': '饰品不存在'}, ensure_ascii=False).encode()
+        return 200, body, 'application/json; charset=utf-8'
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                self.requests += 1
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                method, target = request_line.decode('latin-1').split()[:2]
+                status, body, content_type = self._respond(method, target, body)
+                keep_alive = headers.get('connection', 'keep-alive').lower() != 'close'
+                reason = {200: 'OK', 404: 'Not Found', 429: 'Too Many Requests'}[status]
+                head = (
+                    f"HTTP/1.1 {status} {reason}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                )
+                writer.write(head.encode('latin-1') + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, IndexError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> "MockGoodsServer":
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def __aenter__(self) -> "MockGoodsServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+
+async def _serve(server: MockGoodsServer) -> None:
+    async with server:
+        print(f"Serving {len(server.responses)} goods on http://{server.host}:{server.port}{GOOD_PATH}")
+        await asyncio.Event().wait()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('snapshot', type=Path, help='goods_{date}.jsonl to serve')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--rate', type=float, default=0.0, help='requests per second before 429, 0 for no limit')
+    parser.add_argument('--burst', type=int, default=1)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds per request')
+    args = parser.parse_args()
+    server = MockGoodsServer.from_jsonl(args.snapshot, host=args.host, port=args.port, rate=args.rate,
+                                        burst=args.burst, latency=args.latency)
+    try:
+        asyncio.run(_serve(server))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
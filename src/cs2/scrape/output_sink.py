@@ -0,0 +1,254 @@
+"""
+Buffered, rotating writer of the scraper output.
+
+Records are buffered and appended to the active file (`OUTPUT_FILE`) in batches,
+when `batch_size` records are waiting or every `flush_interval` seconds, through
+one file handle kept open. Callbacks attached with `after_flush` run once the
+records written before them are flushed, so a checkpoint is never ahead of the data.
+
+The active file is rotated by size or by day: it is renamed to
+`{stem}.{YYYYmmdd-HHMMSS}-{n}{suffix}` and, with `compression`, replaced by a gzip or
+zstd copy written under a temporary name first. Readers list the files with
+`segments` (rotated ones by age, the active file last) and read them with
+`open_segment`; a segment is always complete, the active file only ever grows by
+whole batches, and a trailing partial line is one still being written.
+"""
+import gzip
+import io
+import json
+import os
+import shutil
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Iterator
+
+try:
+    import zstandard
+except ImportError:  # optional, only needed for compression='zstd'
+    zstandard = None
+
+from cs2.config import OUTPUT_FILE
+
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+TMP_SUFFIX = '.tmp'
+
+
+def _compress(src: Path, compression: str) -> Path:
+    dst = src.with_name(src.name + COMPRESSION_SUFFIXES[compression])
+    tmp = dst.with_name(dst.name + TMP_SUFFIX)
+    with open(src, 'rb') as fin:
+        if compression == 'gzip':
+            with gzip.open(tmp, 'wb', compresslevel=6) as fout:
+                shutil.copyfileobj(fin, fout, 1 << 20)
+        else:
+            with open(tmp, 'wb') as raw:
+                zstandard.ZstdCompressor(level=10).copy_stream(fin, raw)
+    os.replace(tmp, dst)
+    src.unlink()
+    return dst
+
+def segments(path: str | Path = OUTPUT_FILE) -> list[Path]:
+    """Rotated segments of `path` from oldest to newest, then `path` itself if it exists."""
+    path = Path(path)
+    found: dict[str, Path] = {}
+    for candidate in sorted(path.parent.glob(f"{path.stem}.*{path.suffix}*")):
+        name = candidate.name
+        if name.endswith(TMP_SUFFIX) or candidate == path:
+            continue
+        base = name
+        for suffix in COMPRESSION_SUFFIXES.values():
+            base = base.removesuffix(suffix)
+        if not base.endswith(path.suffix):
+            continue
+        # a compressed copy wins over a plain one left by an interrupted rotation
+        if base not in found or found[base].name == base:
+            found[base] = candidate
+    rotated = [found[base] for base in sorted(found)]
+    return rotated + ([path] if path.exists() else [])
+
+def open_segment(path: str | Path, offset: int = 0) -> BinaryIO:
+    """Binary reader of a plain, gzip or zstd segment, at byte `offset` of its content."""
+    path = Path(path)
+    if path.suffix == '.gz':
+        f = gzip.open(path, 'rb')
+    elif path.suffix == '.zst':
+        if zstandard is None:
+            raise RuntimeError("Reading .zst segments requires the zstandard package")
+        # the bare stream reader can neither iterate nor readline
+        f = io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True))
+    else:
+        f = open(path, 'rb')
+    if offset and f.seekable():
+        f.seek(offset)
+    elif offset:
+        while offset > 0 and (chunk := f.read(min(offset, 1 << 20))):
+            offset -= len(chunk)
+    return f
+
+def read_records(path: str | Path = OUTPUT_FILE) -> Iterator[dict]:
+    """Every complete record of every segment, oldest first."""
+    for segment in segments(path):
+        with open_segment(segment) as f:
+            for line in f:
+                if line.endswith(b'\n') and line.strip():
+                    yield json.loads(line)
+
+
+class OutputSink:
+    def __init__(
+        self,
+        path: str | Path = OUTPUT_FILE,
+        batch_size: int = 100,
+        flush_interval: float = 5.0,
+        max_bytes: int | None = None,
+        rotate_daily: bool = False,
+        compression: str | None = None,
+        fsync: bool = False,
+    ):
+        """
+        Args:
+            path (str | Path): Active jsonl file.
+            batch_size (int): Records buffered before a flush.
+            flush_interval (float): Seconds after which buffered records are flushed anyway, 0 for no timer.
+            max_bytes (int | None): Rotate once the active file reaches this size.
+            rotate_daily (bool): Rotate when the active file was started on an earlier day.
+            compression (str | None): 'gzip' or 'zstd' for rotated segments, None to keep them plain.
+            fsync (bool): fsync after every flush, not only on rotation and close.
+        """
+        if compression not in (None, *COMPRESSION_SUFFIXES):
+            raise ValueError(f"Unknown compression: {compression}")
+        if compression == 'zstd' and zstandard is None:
+            raise RuntimeError("compression='zstd' requires the zstandard package")
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.compression = compression
+        self.fsync = fsync
+        self.lock = threading.RLock()
+        self._buffer: list[str] = []
+        self._callbacks: list[Callable[[], None]] = []
+        self._file = None
+        self._started: date | None = None
+        self.written = 0
+        self.flushes = 0
+        self._recover()
+        self._closed = threading.Event()
+        self._timer = None
+        if flush_interval > 0:
+            self._timer = threading.Thread(target=self._flush_periodically, daemon=True)
+            self._timer.start()
+
+    def _recover(self) -> None:
+        """Finish the compression of segments an interrupted rotation left behind."""
+        for tmp in self.path.parent.glob(f"{self.path.stem}.*{TMP_SUFFIX}"):
+            tmp.unlink()
+        if self.compression is None:
+            return
+        for segment in segments(self.path):
+            if segment != self.path and segment.suffix == self.path.suffix:
+                _compress(segment, self.compression)
+
+    def _flush_periodically(self) -> None:
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+    def _open(self):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8')
+            if self._started is None:
+                stat = self.path.stat()
+                self._started = datetime.fromtimestamp(stat.st_mtime).date() if stat.st_size else date.today()
+        return self._file
+
+    def write(self, record: dict) -> None:
+        self.write_many([record])
+
+    def write_many(self, records: Iterable[dict]) -> None:
+        lines = [json.dumps(r, ensure_ascii=False) + '\n' for r in records]
+        with self.lock:
+            self._buffer.extend(lines)
+            if len(self._buffer) >= self.batch_size:
+                self.flush()
+
+    def after_flush(self, callback: Callable[[], None]) -> None:
+        """Run `callback` once every record written so far is flushed."""
+        with self.lock:
+            self._callbacks.append(callback)
+            if not self._buffer:
+                self.flush()
+
+    def _should_rotate(self) -> bool:
+        if self._file is None or self._file.tell() == 0:
+            return False
+        if self.max_bytes is not None and self._file.tell() >= self.max_bytes:
+            return True
+        return self.rotate_daily and self._started is not None and self._started < date.today()
+
+    def flush(self) -> None:
+        with self.lock:
+            if self._buffer:
+                f = self._open()
+                f.write(''.join(self._buffer))
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+                self.written += len(self._buffer)
+                self.flushes += 1
+                self._buffer = []
+            callbacks, self._callbacks = self._callbacks, []
+            error = None
+            for callback in callbacks:
+                # the records are written, a failing callback must not hold back the others
+                try:
+                    callback()
+                except Exception as e:
+                    error = error or e
+            if self._should_rotate():
+                self.rotate()
+            if error is not None:
+                raise error
+
+    def rotate(self) -> Path | None:
+        """Turn the active file into a segment, returning it."""
+        with self.lock:
+            if self._buffer:
+                self.flush()
+            if self._file is not None:
+                os.fsync(self._file.fileno())
+                self._file.close()
+                self._file = None
+            if not self.path.exists() or self.path.stat().st_size == 0:
+                return None
+            stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+            n = 0
+            while True:
+                segment = self.path.with_name(f"{self.path.stem}.{stamp}-{n:03d}{self.path.suffix}")
+                if not any(segment.with_name(segment.name + s).exists() for s in ('', *COMPRESSION_SUFFIXES.values())):
+                    break
+                n += 1
+            os.replace(self.path, segment)
+            self._started = None
+            if self.compression is not None:
+                segment = _compress(segment, self.compression)
+            return segment
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._timer is not None:
+            self._timer.join()
+        with self.lock:
+            self.flush()
+            if self._file is not None:
+                os.fsync(self._file.fileno())
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> "OutputSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,303 @@
+"""
+Worker-pool mode of the youpin898.com scraper.
+
+`YouPin898Scraper` drives one tab and spends most of its time waiting on it. Here
+one persistent browser context (one login, one `USER_DATA_DIR`) hosts `workers`
+pages on the playwright async API; every page takes items off a shared queue, so
+each worker processes its own shard of ids while slow items do not hold the
+others back. All pages share one `RateLimiter` bucket, one `CheckpointStore` and
+one `OutputSink`.
+
+A worker whose page fails, or whose request is answered with an error status,
+closes it, requeues the item, asks for the session to be reset and opens a fresh
+page; only when the context itself is gone is the browser relaunched, and the
+other workers carry on with the new context. A 429 also slows the shared bucket
+down, only 2xx answers speed it up.
+
+    python -m cs2.scrape.parallel_scraper --workers 4
+"""
+import argparse
+import asyncio
+import logging
+from functools import partial
+from typing import Optional
+
+from playwright.async_api import async_playwright, BrowserContext, Page, Playwright, TimeoutError, Error
+from tqdm import tqdm
+
+from .checkpoint import CHECKPOINT_FILE, CheckpointStore
+from .float_planner import FloatPlanner
+from .output_sink import OutputSink
+from .scraper import (
+    FLOAT_RANGE_BUTTON, MAX_INPUT_SELECTOR, MIN_INPUT_SELECTOR, YouPin898Scraper,
+    load_float_ranges, logger_file, plan_float_ranges, read_yyid_file,
+)
+from .throttle import AdaptiveThrottle, RateLimiter
+from cs2.config import USER_DATA_DIR, OUTPUT_FILE
+
+logger = logging.getLogger(__name__)
+BUCKET = 'youpin898'
+NEXT_BUTTON = 'div.paginationItem___cPDSU.next___CBWi0'
+NEXT_DISABLED = 'disabled___ncf6R'
+CONFIRM_BUTTON = 'div.btn2___x8GlT:has-text("确认")'
+
+
+def is_list_response(r) -> bool:
+    return "queryOnSaleCommodityList" in r.url and r.request.method == "POST"
+
+
+class ResponseStatusError(RuntimeError):
+    """A list request was answered with a non-2xx status; the item is retried."""
+
+
+class ParallelScraper:
+    def __init__(
+        self,
+        workers: int = 4,
+        output_file: str = OUTPUT_FILE,
+        checkpoint: Optional[CheckpointStore] = None,
+        sink: Optional[OutputSink] = None,
+        limiter: Optional[RateLimiter] = None,
+        max_attempts: int = 3,
+        headless: bool = False,
+        float_ranges: Optional[dict[int, tuple[float, float]]] = None,
+    ):
+        """
+        Args:
+            workers: Pages scraping at the same time.
+            limiter: Shared by every page, requests go through its `youpin898` bucket.
+            max_attempts: Attempts of one item before it is left for the next run.
+            float_ranges: Skin (min_float, max_float) per yyid, as in `YouPin898Scraper`.
+        """
+        self.workers = workers
+        self.checkpoint = checkpoint if checkpoint is not None else CheckpointStore(CHECKPOINT_FILE)
+        self.checkpoint.import_log(logger_file)
+        self.sink = sink if sink is not None else OutputSink(output_file)
+        # the single-tab default of 1 request per 2.5 s, adapted from there
+        self.limiter = limiter if limiter is not None else RateLimiter(capacity=1, rate=0.4)
+        self.max_attempts = max_attempts
+        self.headless = headless
+        self.float_ranges = float_ranges or {}
+        self.viewport_seed = YouPin898Scraper.gen_viewport_parameters()
+        self.logging_format = "id: {id_}\trange: {min_float}-{max_float}\t{e}"
+        self.logging_format_pagination = "id: {id_}\trange: full\t{e}"
+        self.context: Optional[BrowserContext] = None
+        self.context_generation = 0
+        self.needs_reset = True
+        self.restarts = 0
+        self._context_lock = asyncio.Lock()
+
+    @property
+    def bucket(self) -> AdaptiveThrottle:
+        return self.limiter.bucket(BUCKET)
+
+    async def _launch(self, playwright: Playwright, generation: int) -> BrowserContext:
+        """The shared context, relaunched once per failed generation however many workers noticed."""
+        async with self._context_lock:
+            if self.context is None or generation == self.context_generation:
+                if self.context is not None:
+                    try:
+                        await self.context.close()
+                    except Error:
+                        pass
+                width, height = next(self.viewport_seed)
+                self.context = await playwright.chromium.launch_persistent_context(
+                    user_data_dir=USER_DATA_DIR,
+                    headless=self.headless,
+                    viewport={'width': width, 'height': height},
+                )
+                self.context_generation += 1
+                self.needs_reset = True
+            return self.context
+
+    async def _clear_local_storage(self, page: Page) -> None:
+        """Async `YouPin898Scraper.clear_local_storage`; the storage is shared by every page of the context."""
+        if await page.locator("text=SMS Login").is_visible():
+            raise RuntimeError("Not logged in, please log in manually and restart.")
+        original_uk = await page.evaluate("window.localStorage.getItem('WEB_UK')")
+        await page.evaluate("localStorage.clear()")
+        for _ in range(6):
+            try:
+                await page.reload()
+                await page.wait_for_load_state("networkidle")
+            except TimeoutError:
+                continue
+            break
+        else:
+            raise RuntimeError("Failed to reload page after clearing local storage")
+        now_uk = await page.evaluate("window.localStorage.getItem('WEB_UK')")
+        assert original_uk != now_uk, "Local storage clear failed, WEB_UK unchanged"
+        assert now_uk is not None, "WEB_UK is None after clearing local storage"
+        await asyncio.sleep(5)
+
+    async def _request(self, page: Page, action):
+        """Run `action` (a coroutine function triggering one list request) under the shared limit,
+        raising `ResponseStatusError` unless it is answered with a 2xx."""
+        await self.bucket.acquire()
+        async with page.expect_response(is_list_response) as response_info:
+            await action()
+        response = await response_info.value
+        if response.status == 429:
+            self.bucket.on_throttled()
+        if not response.ok:
+            raise ResponseStatusError(f"Response status {response.status} from {response.url}")
+        self.bucket.on_success()
+        return response
+
+    async def _set_float_range(self, page: Page, min_float: float, max_float: float) -> dict:
+        """The first result page of a float range search."""
+        await page.locator(FLOAT_RANGE_BUTTON).click()
+        await page.locator("text=自定义").nth(0).click()
+        await page.locator(MIN_INPUT_SELECTOR).fill(str(min_float))
+        await page.locator(MAX_INPUT_SELECTOR).fill(str(max_float))
+        response = await self._request(page, page.locator(CONFIRM_BUTTON).click)
+        return await response.json()
+
+    def _record_search(self, planner: FloatPlanner, id_: int, min_float: float, max_float: float, data: dict) -> None:
+        """Same as `YouPin898Scraper.record_search`."""
+        recorded = planner.record(min_float, max_float, data.get("TotalCount", 0), data.get("Data") or [])
+        self.sink.write_many(recorded.listings)
+        if recorded.bins:
+            self.sink.after_flush(partial(self.checkpoint.mark_ranges, [(id_, lo, hi) for lo, hi in recorded.bins]))
+        logger.info(self.logging_format.format(id_=id_, min_float=min_float, max_float=max_float,
+                                               e=f"{len(recorded.bins)} bins settled"))
+
+    async def _pagination_extract(self, page: Page, id_: int) -> None:
+        data_pages = []
+        while True:
+            next_button = page.locator(NEXT_BUTTON)
+            btn_class = await next_button.get_attribute('class')
+            if btn_class and NEXT_DISABLED in btn_class:
+                break
+            try:
+                response = await self._request(page, next_button.click)
+            except TimeoutError:
+                if len(data_pages) > 10:
+                    # inevitably some data is lost, but save what we have
+                    self.sink.write_many(data_pages)
+                    self.sink.after_flush(partial(self.checkpoint.mark_full, id_))
+                    logger.error(self.logging_format_pagination.format(id_=id_, e="Success"))
+                raise
+            data_pages.extend((await response.json())['Data'])
+        self.sink.write_many(data_pages)
+        self.sink.after_flush(partial(self.checkpoint.mark_full, id_))
+        logger.info(self.logging_format_pagination.format(id_=id_, e="Success"))
+
+    async def _scrape_item(self, page: Page, id_: int, min_val: float, max_val: float) -> None:
+        """Same decisions as `YouPin898Scraper.scrape` for one item."""
+        planner = plan_float_ranges(self.checkpoint, id_, min_val, max_val, self.float_ranges)
+        if planner.complete:
+            return
+        response = await self._request(page, partial(page.goto, YouPin898Scraper.get_url(id_)))
+        if self.needs_reset:
+            await self._reset_session(page)
+        data = await response.json()
+        total_count = data.get("TotalCount", 0)
+        if total_count <= 10:
+            self.sink.write_many(data.get('Data') or [])
+            self.sink.after_flush(partial(self.checkpoint.mark_full, id_))
+            logger.info(self.logging_format_pagination.format(id_=id_, e="Success"))
+            return
+        self._record_search(planner, id_, *planner.full_range, data)
+        if planner.prefer_pagination(total_count) or not await page.query_selector(FLOAT_RANGE_BUTTON):
+            await self._pagination_extract(page, id_)
+        else:
+            while (float_range := planner.next_range()) is not None:
+                data = await self._set_float_range(page, *float_range)
+                self._record_search(planner, id_, *float_range, data)
+
+    async def _reset_session(self, page: Page) -> None:
+        async with self._context_lock:
+            # another worker may have reset it while this one waited
+            if self.needs_reset:
+                await self._clear_local_storage(page)
+                self.needs_reset = False
+
+    async def _worker(self, playwright: Playwright, queue: asyncio.Queue, progress: tqdm) -> None:
+        """Scrape queued items on one page, replacing the page (or the context) when it fails."""
+        page = None
+        generation = self.context_generation
+        while (item := await queue.get()) is not None:
+            id_, min_val, max_val, attempt = item
+            try:
+                if page is None or page.is_closed():
+                    try:
+                        page = await self.context.new_page()
+                    except Error:
+                        # the context is gone, relaunch it (or pick up the one another worker launched)
+                        context = await self._launch(playwright, generation)
+                        page = await context.new_page()
+                    generation = self.context_generation
+                await self._scrape_item(page, id_, min_val, max_val)
+                progress.update()
+            except Exception as e:
+                # anything else (not logged in, a failed reset, a malformed response) would kill the worker
+                if isinstance(e, TimeoutError):
+                    self.bucket.on_timeout()
+                self.restarts += 1
+                logger.exception(f"Worker restart on id {id_}: {e!r}")
+                self.needs_reset = True
+                if page is not None and not page.is_closed():
+                    try:
+                        await page.close()
+                    except Error:
+                        pass
+                page = None
+                if attempt + 1 < self.max_attempts:
+                    # queued before this attempt is marked done, so `queue.join` waits for it
+                    queue.put_nowait((id_, min_val, max_val, attempt + 1))
+                else:
+                    progress.update()
+                await asyncio.sleep(3)
+            finally:
+                queue.task_done()
+        if page is not None and not page.is_closed():
+            await page.close()
+
+    async def run(self, id_min_maxs: list[tuple]) -> None:
+        queue: asyncio.Queue = asyncio.Queue()
+        for id_, min_val, max_val in id_min_maxs:
+            queue.put_nowait((id_, min_val, max_val, 0))
+        try:
+            async with async_playwright() as playwright:
+                await self._launch(playwright, self.context_generation)
+                with tqdm(total=len(id_min_maxs)) as progress:
+                    workers = [asyncio.create_task(self._worker(playwright, queue, progress))
+                               for _ in range(self.workers)]
+                    join = asyncio.create_task(queue.join())
+                    # a worker that died anyway would leave `queue.join` waiting forever
+                    done, _ = await asyncio.wait([join, *workers], return_when=asyncio.FIRST_COMPLETED)
+                    if join not in done:
+                        join.cancel()
+                        for worker in workers:
+                            worker.cancel()
+                        await asyncio.gather(*workers, return_exceptions=True)
+                        errors = [w.exception() for w in done if not w.cancelled()]
+                        raise RuntimeError("A scraper worker died") from (errors[0] if errors else None)
+                    for _ in workers:
+                        queue.put_nowait(None)
+                    await asyncio.gather(*workers)
+                await self.context.close()
+        finally:
+            # buffered listings are flushed however the run ends
+            self.sink.close()
+        logger.info(f"Completed all tasks with {self.restarts} worker restarts. {self.bucket.metrics()}")
+
+    def scrape(self, id_min_maxs: list[tuple]) -> None:
+        asyncio.run(self.run(id_min_maxs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape youpin898 listings with several pages in parallel.")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--ids', default='yyid_high_tier_weapons.txt', help='tab separated yyid and float range')
+    parser.add_argument('--rate', type=float, default=0.4, help='initial requests per second over all pages')
+    parser.add_argument('--goods', default=None, help='goods snapshot with the float range of every skin')
+    args = parser.parse_args()
+    scraper = ParallelScraper(workers=args.workers, limiter=RateLimiter(capacity=1, rate=args.rate),
+                              float_ranges=load_float_ranges(args.goods))
+    scraper.scrape(read_yyid_file(args.ids))
+
+
+if __name__ == "__main__":
+    main()
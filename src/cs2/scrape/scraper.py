@@ -3,23 +3,30 @@ Web scraper for youpin898.com market data.
 Automates float range searches and saves response data.
 """
 
+import argparse
+import glob
 import logging
 import time
 import random
-import json
 import itertools
+from functools import partial
 from typing import Optional
 
-import numpy as np
 from tqdm import tqdm
 from playwright.sync_api import sync_playwright, Page, Response, TimeoutError, Error
 
 from .throttle import Throttle, wait
+from .checkpoint import CHECKPOINT_FILE, CheckpointStore
+from .float_planner import FloatPlanner, normalized_bin_width
+from .output_sink import OutputSink
 from cs2.config import USER_DATA_DIR, OUTPUT_FILE  # user-specific values
+from cs2.data_model.fast_loader import load_projected
 
 
 # Configuration constants
 TARGET_URL = 'https://www.youpin898.com/market/goods-list'
+# snapshots written by `cs2.scrape.async_fetcher`, the skin float ranges come from there
+GOODS_PATTERN = 'WeaponsINFO/goods_*.jsonl'
 
 # CSS Selectors
 FLOAT_RANGE_BUTTON = (
@@ -39,7 +46,8 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 
 
 def load_extracted_tuples(logger_file: str) -> set:
-    """Load already extracted (id, min, max) tuples from log file."""
+    """Load already extracted (id, min, max) tuples from log file.
+    Only used to inspect old logs, the scraper resumes from `CheckpointStore`."""
     extracted = set()
     extracted_ids = set()
     try:
@@ -59,18 +67,59 @@ def load_extracted_tuples(logger_file: str) -> set:
         pass
     return extracted, extracted_ids
 
+def plan_float_ranges(checkpoint: CheckpointStore, id_, min_val: float, max_val: float,
+                      float_ranges: Optional[dict[int, tuple[float, float]]] = None) -> FloatPlanner:
+    """Planner of an item's float range searches, bins settled by earlier runs already done.
+    Bins are 0.01 of the skin's normalized float when `float_ranges` has it, 0.01 of the raw float otherwise."""
+    float_range = (float_ranges or {}).get(int(id_))
+    if float_range:
+        planner = FloatPlanner(min_val, max_val, normalized_bin_width(*float_range), done=checkpoint.done_ranges(id_),
+                               origin=float_range[0])
+    else:
+        planner = FloatPlanner(min_val, max_val, 0.01, done=checkpoint.done_ranges(id_))
+    if checkpoint.is_full(id_):
+        planner.resolved[:] = True
+    return planner
+
 class YouPin898Scraper:
     """Scraper for youpin898.com market commodity data."""
     
-    def __init__(self, output_file: str = OUTPUT_FILE):
+    def __init__(
+        self,
+        output_file: str = OUTPUT_FILE,
+        checkpoint: Optional[CheckpointStore] = None,
+        sink: Optional[OutputSink] = None,
+        float_ranges: Optional[dict[int, tuple[float, float]]] = None,
+    ):
+        """
+        Args:
+            float_ranges: Skin (min_float, max_float) per yyid, float ranges are searched in 0.01 bins
+                of the normalized float of the skins listed here and of the raw float otherwise.
+        """
         self.output_file = output_file
+        self.float_ranges = float_ranges or {}
+        self.sink = sink if sink is not None else OutputSink(output_file)
         self.page: Optional[Page] = None
-        self.extracted_tuples = set()
-        self.extracted_ids = set()
+        self.checkpoint = checkpoint if checkpoint is not None else CheckpointStore(CHECKPOINT_FILE)
+        # progress logged by versions that resumed from the log
+        self.checkpoint.import_log(logger_file)
         self.viewport_seed = self.gen_viewport_parameters()
         self.timeout_occurred_times = 0
         self.logging_format = "id: {id_}\trange: {min_float}-{max_float}\t{e}"
         self.logging_format_pagination = "id: {id_}\trange: full\t{e}"
+
+    def plan_float_ranges(self, id_, min_val: float, max_val: float) -> FloatPlanner:
+        return plan_float_ranges(self.checkpoint, id_, min_val, max_val, self.float_ranges)
+
+    def record_search(self, planner: FloatPlanner, id_, min_float: float, max_float: float, data: dict) -> None:
+        """Save the cheapest listing of every bin the search settled, then checkpoint those bins."""
+        recorded = planner.record(min_float, max_float, data.get("TotalCount", 0), data.get("Data") or [])
+        self.sink.write_many(recorded.listings)
+        if recorded.bins:
+            # checkpoint only once the listings are on disk
+            self.sink.after_flush(partial(self.checkpoint.mark_ranges, [(id_, lo, hi) for lo, hi in recorded.bins]))
+        logger.info(self.logging_format.format(id_=id_, min_float=min_float, max_float=max_float,
+                                               e=f"{len(recorded.bins)} bins settled"))
     
     def save_response_data(self, response: Response) -> None:
         """
@@ -89,39 +138,37 @@ class YouPin898Scraper:
             return
         
         best_data = data["Data"][0]
-        with open(self.output_file, encoding='utf-8', mode='a') as f:
-            f.write(f"{json.dumps(best_data, ensure_ascii=False)}\n")
+        self.sink.write(best_data)
     
     def save_response_data_full_page(self, data) -> None:
         """
         Save the full API response data to file.
         
         Args:
-            response: The HTTP response object from the API
+            data: The listings of the API response
         """
         if not data:
             # no data found
             return
         
-        with open(self.output_file, encoding='utf-8', mode='a') as f:
-            for d in data:
-                f.write(f"{json.dumps(d, ensure_ascii=False)}\n")
+        self.sink.write_many(data)
             
 
     @wait(throttler)
-    def set_float_range(self, min_float: float, max_float: float) -> None:
+    def set_float_range(self, min_float: float, max_float: float) -> Optional[dict]:
         """
         Set custom float range filter and capture the response.
         
         Args:
             min_float: Minimum float value
             max_float: Maximum float value
+
+        Returns:
+            The json of the first result page, None when the request failed
         """
         if not self.page:
             raise RuntimeError("Page not initialized")
         
-        id_ = self.page.url.split('templateId=')[-1]
-        
         # Open float range dropdown
         self.page.locator(FLOAT_RANGE_BUTTON).click()
         
@@ -141,9 +188,10 @@ class YouPin898Scraper:
             self.page.locator('div.btn2___x8GlT:has-text("确认")').click()
         
         response = response_info.value
-        self.save_response_data(response)
-
-        logger.info(self.logging_format.format(id_=id_, min_float=min_float, max_float=max_float, e="Success"))
+        if response.status != 200:
+            print(f"Warning: Response status {response.status}, skipping save")
+            return None
+        return response.json()
     
     def pagination_extract(self, id_):
         data_pages = []
@@ -165,10 +213,12 @@ class YouPin898Scraper:
                 if len(data_pages) > 10:
                     # inevitably some data is lost, but save what we have
                     self.save_response_data_full_page(data_pages)
+                    self.sink.after_flush(partial(self.checkpoint.mark_full, id_))
                     logger.error(self.logging_format_pagination.format(id_=id_, e="Success")) 
                 raise e
 
         self.save_response_data_full_page(data_pages)
+        self.sink.after_flush(partial(self.checkpoint.mark_full, id_))
         logger.info(self.logging_format_pagination.format(id_=id_, e="Success"))
         
     
@@ -186,29 +236,14 @@ class YouPin898Scraper:
         s = f'?listType=10&templateId={yyid}'
         return TARGET_URL + s
     
-    def yield_float_range(self, id_, min_val: float, max_val: float, step_size=0.01, drop_out=1.00):
-        """
-        Run multiple float range searches across a specified range.
-        
-        Args:
-            min_val: Minimum float value to start from
-            max_val: Maximum float value to end at
-        """
-        steps = (max_val - min_val) // step_size
-        values = np.linspace(min_val, max_val, int(steps), endpoint=False)
-        
-        for start in values:
-            # Skip already extracted ranges
-            if (id_, round(start, 2), round(start + step_size, 2)) in self.extracted_tuples:
-                continue
-            if id_ in self.extracted_ids:
-                continue
-            if start >= drop_out:
-                continue
-            yield round(start, 2), round(start + step_size, 2)
-    
     def scrape(self, id_min_maxs: list[tuple], flag=False) -> None:
-        """Main scraping workflow."""
+        """Main scraping workflow, buffered listings are flushed however it ends."""
+        try:
+            self._scrape(id_min_maxs, flag)
+        finally:
+            self.sink.close()
+
+    def _scrape(self, id_min_maxs: list[tuple], flag=False) -> None:
         # clean logic: initialize context with different viewport then reload uk value
         init_run = True
         while True:
@@ -221,13 +256,10 @@ class YouPin898Scraper:
                     viewport={'width': width, 'height': height},
                 )
 
-                self.extracted_tuples, self.extracted_ids = load_extracted_tuples(logger_file)
-
                 for id_, min_val, max_val in tqdm(id_min_maxs):
 
-                    float_range_l = list(self.yield_float_range(id_, min_val, max_val))
-                    float_range_operations_count = len(float_range_l)
-                    if not float_range_l:
+                    planner = self.plan_float_ranges(id_, min_val, max_val)
+                    if planner.complete:
                         continue
 
                     try:
@@ -242,22 +274,28 @@ class YouPin898Scraper:
                                 flag = False
                                 init_run = False
 
-                        response = response_info.value
-                        total_count = response.json().get("TotalCount", 0)
+                        data = response_info.value.json()
+                        total_count = data.get("TotalCount", 0)
         
                         # pagination logic
                         if total_count <= 10: # no need to do float range search
-                            self.save_response_data_full_page(response.json()['Data'])
+                            self.save_response_data_full_page(data['Data'])
+                            self.sink.after_flush(partial(self.checkpoint.mark_full, id_))
                             logger.info(self.logging_format_pagination.format(id_=id_, e="Success"))
                             continue
-                        if total_count // 10 < float_range_operations_count or not self.page.query_selector(FLOAT_RANGE_BUTTON): # pagination is cheaper
+                        # the unfiltered page already settles the bins of its listings
+                        self.record_search(planner, id_, *planner.full_range, data)
+                        if planner.prefer_pagination(total_count) or not self.page.query_selector(FLOAT_RANGE_BUTTON): # pagination is cheaper
                         
                             self.pagination_extract(id_=id_)
 
                         # float range logic
                         else:
-                            for min_float, max_float in float_range_l:
-                                    self.set_float_range(min_float, max_float)
+                            while (float_range := planner.next_range()) is not None:
+                                data = self.set_float_range(*float_range)
+                                if data is None:
+                                    break  # left for the next run
+                                self.record_search(planner, id_, *float_range, data)
 
                     except (TimeoutError, Error):
                             flag = True
@@ -273,6 +311,7 @@ class YouPin898Scraper:
                         break  # break outer loop to reset local storage
 
                 context.close()
+                self.sink.flush()
 
                 if not flag:
                     logger.info(f"Completed all tasks with {self.timeout_occurred_times} timeouts.")
@@ -323,10 +362,44 @@ def read_yyid_file(file_path: str) -> list[tuple]:
         ts.append((int(id_), min_val, max_val))
     return ts
 
+def load_float_ranges(goods_jsonl: Optional[str] = None) -> dict[int, tuple[float, float]]:
+    """Skin (min_float, max_float) per yyid of a goods snapshot, the newest `WeaponsINFO/goods_*.jsonl` by default.
+    A snapshot item spans one wear tier, the skin spans every tier of the same weapon."""
+    # imported here, hash_name_index itself imports cs2.scrape
+    from cs2.data_model.hash_name_index import parse_hash_name
+
+    if goods_jsonl is None:
+        snapshots = sorted(glob.glob(GOODS_PATTERN))
+        if not snapshots:
+            print(f"Warning: no {GOODS_PATTERN} snapshot, searching raw float bins")
+            return {}
+        goods_jsonl = snapshots[-1]
+    items = [
+        item for item in load_projected(goods_jsonl, fields=('yyyp_id', 'market_hash_name', 'min_float', 'max_float'),
+                                        workers=None)
+        if item.yyyp_id is not None and item.market_hash_name
+        and item.min_float is not None and item.max_float is not None
+    ]
+    spans: dict[str, tuple[float, float]] = {}
+    for item in items:
+        weapon = parse_hash_name(item.market_hash_name).weapon_name
+        low, high = spans.get(weapon, (item.min_float, item.max_float))
+        spans[weapon] = min(low, item.min_float), max(high, item.max_float)
+    float_ranges = {}
+    for item in items:
+        low, high = spans[parse_hash_name(item.market_hash_name).weapon_name]
+        if high > low:
+            float_ranges[int(item.yyyp_id)] = (low, high)
+    return float_ranges
+
 def main():
     """Entry point for the scraper."""
-    scraper = YouPin898Scraper()
-    id_min_maxs = read_yyid_file('yyid_high_tier_weapons.txt')
+    parser = argparse.ArgumentParser(description="Scrape youpin898 listings.")
+    parser.add_argument('--ids', default='yyid_high_tier_weapons.txt', help='tab separated yyid and float range')
+    parser.add_argument('--goods', default=None, help='goods snapshot with the float range of every skin')
+    args = parser.parse_args()
+    scraper = YouPin898Scraper(float_ranges=load_float_ranges(args.goods))
+    id_min_maxs = read_yyid_file(args.ids)
     scraper.scrape(id_min_maxs)
 
 
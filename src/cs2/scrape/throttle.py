@@ -1,5 +1,8 @@
+import asyncio
+import math
 import threading
 import time
+from typing import NamedTuple
 
 class Throttle:
 	def __init__(self, capacity: int, recovery_rate: float):
@@ -13,12 +16,14 @@ class Throttle:
 		self.recovery_rate = recovery_rate
 		self.tokens = capacity
 		self.last_check = time.time()
+		self.frozen_until = 0.0
 		self.lock = threading.Lock()
 		self.cond = threading.Condition(self.lock)
 		
 	def _recover(self):
 		now = time.time()
-		elapsed = now - self.last_check
+		# no recovery while frozen
+		elapsed = now - max(self.last_check, self.frozen_until)
 		recovered = elapsed * self.recovery_rate
 		if recovered > 0:
 			prev_tokens = self.tokens
@@ -61,7 +66,188 @@ class Throttle:
 		"""
 		with self.cond:
 			self.tokens = 0
-			self.last_check = time.time() + time_seconds
+			self.frozen_until = max(self.frozen_until, time.time() + time_seconds)
+
+class ThrottleMetrics(NamedTuple):
+	name: str
+	rate: float
+	tokens: float
+	acquired: int
+	throttled: int
+	timeouts: int
+	wait_seconds: float
+
+
+# lowest rate a bucket can fall to, tokens/sec
+MIN_RATE = 1e-3
+
+
+class AdaptiveThrottle:
+	def __init__(
+		self,
+		capacity: int = 1,
+		rate: float = 1.0,
+		min_rate: float | None = None,
+		max_rate: float | None = None,
+		increase: float = 0.01,
+		decrease: float = 0.5,
+		cooldown: float = 5.0,
+		name: str = 'default',
+	):
+		"""
+		Token bucket whose recovery rate adapts to the upstream (AIMD).
+
+		Every success adds `increase` tokens/sec to the rate, up to `max_rate`; a rate
+		limited answer multiplies it by `decrease`, down to `min_rate`, and blocks the
+		bucket for `cooldown` seconds, a timeout only multiplies the rate. Failures of
+		requests that were in flight together are one signal: the rate is multiplied
+		at most once per `cooldown` window.
+		Usable from threads (`wait_consume`) and coroutines (`acquire`) at once.
+
+		:param capacity: Maximum number of tokens in the bucket.
+		:param rate: Initial tokens recovered per second.
+		:param min_rate: Lower bound of the rate, defaults to a tenth of `rate`, never below `MIN_RATE`.
+		:param max_rate: Upper bound of the rate, defaults to four times `rate`.
+		:param name: Name in metrics.
+		"""
+		self.capacity = capacity
+		self.min_rate = max(MIN_RATE, rate / 10 if min_rate is None else min_rate)
+		self.rate = max(self.min_rate, rate)
+		self.max_rate = rate * 4 if max_rate is None else max_rate
+		self.increase = increase
+		self.decrease = decrease
+		self.cooldown = cooldown
+		self.name = name
+		self.tokens = float(capacity)
+		self.last_check = time.monotonic()
+		self.blocked_until = 0.0
+		self.last_decrease = -math.inf
+		self.lock = threading.Lock()
+		self.acquired = 0
+		self.throttled = 0
+		self.timeouts = 0
+		self.wait_seconds = 0.0
+
+	def _recover(self, now: float):
+		start = max(self.last_check, self.blocked_until)
+		if now > start:
+			self.tokens = min(self.capacity, self.tokens + (now - start) * self.rate)
+		self.last_check = now
+
+	def _reserve(self, amount: int) -> float:
+		"""Take `amount` tokens if they are there and return 0, otherwise the seconds to wait before retrying."""
+		with self.lock:
+			now = time.monotonic()
+			self._recover(now)
+			if now >= self.blocked_until and self.tokens >= amount:
+				self.tokens -= amount
+				self.acquired += 1
+				return 0.0
+			ready = max(now, self.blocked_until) + max(0.0, amount - self.tokens) / self.rate
+			return max(ready - now, 1e-3)
+
+	def consume(self, amount: int = 1) -> bool:
+		"""
+		Attempt to consume tokens. Returns True if successful, False otherwise.
+		"""
+		return self._reserve(amount) == 0.0
+
+	def wait_consume(self, amount: int = 1):
+		"""
+		Block the calling thread until able to consume the requested amount.
+		"""
+		start = time.monotonic()
+		while (delay := self._reserve(amount)) > 0:
+			time.sleep(delay)
+		self._waited(time.monotonic() - start)
+
+	async def acquire(self, amount: int = 1):
+		"""
+		Wait without blocking the event loop until able to consume the requested amount.
+		"""
+		start = time.monotonic()
+		while (delay := self._reserve(amount)) > 0:
+			await asyncio.sleep(delay)
+		self._waited(time.monotonic() - start)
+
+	def _waited(self, seconds: float):
+		with self.lock:
+			self.wait_seconds += seconds
+
+	def on_success(self):
+		with self.lock:
+			self.rate = min(self.max_rate, self.rate + self.increase)
+
+	def _decrease(self):
+		"""Multiply the rate by `decrease`, once per `cooldown` window. Call with the lock held."""
+		now = time.monotonic()
+		if now - self.last_decrease >= self.cooldown:
+			self.rate = max(self.min_rate, self.rate * self.decrease)
+			self.last_decrease = now
+
+	def on_throttled(self):
+		"""The upstream answered Too Many Requests: back off and cool down."""
+		with self.lock:
+			self.throttled += 1
+			self._decrease()
+		self.penalize(self.cooldown)
+
+	def on_timeout(self):
+		with self.lock:
+			self.timeouts += 1
+			self._decrease()
+
+	def penalize(self, time_seconds: float):
+		"""
+		Empty the bucket and hand out no tokens for `time_seconds`.
+		"""
+		with self.lock:
+			now = time.monotonic()
+			self._recover(now)
+			self.tokens = 0.0
+			self.blocked_until = max(self.blocked_until, now + time_seconds)
+
+	def metrics(self) -> ThrottleMetrics:
+		with self.lock:
+			self._recover(time.monotonic())
+			return ThrottleMetrics(self.name, self.rate, self.tokens, self.acquired,
+								   self.throttled, self.timeouts, self.wait_seconds)
+
+
+class RateLimiter:
+	def __init__(self, **defaults):
+		"""
+		Named `AdaptiveThrottle` buckets, one per endpoint.
+
+		:param defaults: `AdaptiveThrottle` arguments of buckets created on first use.
+		"""
+		self.defaults = defaults
+		self.buckets: dict[str, AdaptiveThrottle] = {}
+		self.lock = threading.Lock()
+
+	def bucket(self, name: str, **kwargs) -> AdaptiveThrottle:
+		"""
+		The bucket called `name`, created with `kwargs` over the defaults if it does not exist yet.
+		"""
+		with self.lock:
+			if name not in self.buckets:
+				self.buckets[name] = AdaptiveThrottle(name=name, **{**self.defaults, **kwargs})
+			return self.buckets[name]
+
+	def __getitem__(self, name: str) -> AdaptiveThrottle:
+		return self.bucket(name)
+
+	def wait_consume(self, name: str, amount: int = 1):
+		self.bucket(name).wait_consume(amount)
+
+	async def acquire(self, name: str, amount: int = 1):
+		await self.bucket(name).acquire(amount)
+
+	def metrics(self) -> dict[str, ThrottleMetrics]:
+		with self.lock:
+			buckets = list(self.buckets.values())
+		return {b.name: b.metrics() for b in buckets}
+
 
 def wait(throttler: Throttle):
 	def outer(func):
@@ -0,0 +1,109 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from cs2.data_model.hash_name_index import WEAR_RANKS
+from cs2.data_model.catalog import GOODS_KINDS
+from cs2.data_model.response_model import GoodsInfo
+from cs2.optimize.outcome_index import OutcomeIndex
+from cs2.optimize.utilities import HashNameTable, Weapon
+from cs2.scrape.cs2_terms import rank_to_rarity, wear_value
+
+
+def make_identity(num_containers: int = 4, weapons_per_rank: int = 3, seed: int = 0) -> dict:
+    """Weapon identity of synthetic containers, laid out like `utilities.build_weapon_identity`."""
+    rng = np.random.default_rng(seed)
+    identity = {}
+    for c in range(num_containers):
+        for rank in (3, 4, 5):
+            weapons = []
+            for w in range(weapons_per_rank):
+                weapon_name = f"W{c}-{rank}-{w} | Test"
+                weapons.append(Weapon(
+                    weapon_name=weapon_name,
+                    hash_names=[f"{weapon_name} ({wear_rank})" for wear_rank in WEAR_RANKS],
+                    min_float=float(rng.choice([0.0, 0.06, 0.1])),
+                    max_float=float(rng.choice([0.5, 0.8, 1.0])),
+                ))
+            identity.setdefault(f"Case {c}", {})[rank_to_rarity[rank]] = weapons
+    return identity
+
+
+def goods_records(identity: dict, seed: int = 0) -> list[dict]:
+    """One `/api/v1/info/good` response per hash name of the identity whose wear tier the
+    weapon reaches, every hash name carrying the float range of its own tier like the api."""
+    rng = np.random.default_rng(seed)
+    records, yyyp_id = [], 1
+    for c, (name, rarities) in enumerate(identity.items()):
+        # braces and quotes inside strings must not confuse the projected loader
+        container = {'comment': 'case {"x": 1}', 'created_at': '2020-01-01', 'id': c, 'name': name,
+                     'price': 1.0, 'url': None, 'roi': None}
+        for rarity, weapons in rarities.items():
+            for weapon in weapons:
+                for hash_name, (wear_rank, bounds) in zip(weapon.hash_names, wear_value.items()):
+                    low, high = map(float, bounds.split('-'))
+                    if high <= weapon.min_float or low >= weapon.max_float:
+                        continue
+                    info = {}
+                    for field, kind in GOODS_KINDS.items():
+                        if kind == 'int':
+                            info[field] = int(rng.integers(0, 1000))
+                        elif kind == 'datetime':
+                            info[field] = '2025-09-25T00:00:00'
+                        elif kind == 'float':
+                            info[field] = None if rng.random() < 0.1 else round(float(rng.random() * 500), 2)
+                        else:
+                            info[field] = '{"}' if GoodsInfo.model_fields[field].annotation is str else None
+                    info.update(
+                        id=yyyp_id, buff_id=yyyp_id, yyyp_id=yyyp_id, name=f'{hash_name} "{{}}"', market_hash_name=hash_name,
+                        min_float=max(low, weapon.min_float), max_float=min(high, weapon.max_float),
+                        rarity_localized_name=rarity, quality_localized_name='普通',
+                        exterior_localized_name=wear_rank, group_hash_name=None,
+                    )
+                    records.append({'code': 200, 'msg': 'Success', 'data': {
+                        'button_list': [], 'container': [container], 'dpl': [], 'goods_info': info,
+                        'is_collection': [], 'statistic_list': [],
+                    }})
+                    yyyp_id += 1
+    return records
+
+
+def write_goods(path: Path, records: list[dict]) -> Path:
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    return path
+
+
+@pytest.fixture
+def identity() -> dict:
+    return make_identity()
+
+
+@pytest.fixture
+def index(identity) -> OutcomeIndex:
+    return OutcomeIndex.from_identity(identity)
+
+
+@pytest.fixture
+def prices(index) -> dict[str, float]:
+    rng = np.random.default_rng(1)
+    return {name: round(float(rng.random() * 100), 2) for name in HashNameTable(index.weapon_names).names}
+
+
+@pytest.fixture
+def goods_jsonl(tmp_path, identity) -> Path:
+    return write_goods(tmp_path / 'goods_2025-09-25.jsonl', goods_records(identity))
+
+
+@pytest.fixture
+def weapon_cases() -> dict:
+    """`make_identity` under weapon case names, the containers `price_table` keeps."""
+    return {f"{name} 武器箱": rarities for name, rarities in make_identity().items()}
+
+
+@pytest.fixture
+def weapon_case_goods_jsonl(tmp_path, weapon_cases) -> Path:
+    return write_goods(tmp_path / 'goods_2025-09-25.jsonl', goods_records(weapon_cases))
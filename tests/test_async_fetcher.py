@@ -0,0 +1,63 @@
+import asyncio
+import json
+import socket
+
+from cs2.scrape.async_fetcher import GoodsInfoFetcher, extracted_ids
+from cs2.scrape.mock_server import MockGoodsServer
+from cs2.scrape.throttle import AdaptiveThrottle
+
+
+def fetch(server: MockGoodsServer, ids, tmp_path, **kwargs):
+    async def main():
+        async with server:
+            fetcher = GoodsInfoFetcher(None, tmp_path / 'out.jsonl', host=server.host, port=server.port,
+                                       use_ssl=False, error_log=tmp_path / 'error.log', **kwargs)
+            return fetcher, await fetcher.run(ids)
+
+    return asyncio.run(main())
+
+
+def saved(tmp_path) -> dict[int, dict]:
+    lines = (tmp_path / 'out.jsonl').read_text(encoding='utf-8').splitlines()
+    return {json.loads(line)['data']['goods_info']['id']: json.loads(line) for line in lines}
+
+
+def test_fetches_every_response(tmp_path, goods_jsonl):
+    server = MockGoodsServer.from_jsonl(goods_jsonl)
+    _, stats = fetch(server, sorted(server.responses), tmp_path, concurrency=4, rate=0, batch_size=7)
+    assert saved(tmp_path) == {i: json.loads(body) for i, body in server.responses.items()}
+    assert (stats.fetched, stats.failed, stats.retries) == (len(server.responses), 0, 0)
+    # keep-alive: one connection per worker
+    assert server.connections == stats.connections <= 4
+    assert extracted_ids(tmp_path / 'out.jsonl') == set(server.responses)
+
+
+def test_rate_limited_requests_are_retried(tmp_path, goods_jsonl):
+    server = MockGoodsServer.from_jsonl(goods_jsonl, rate=200, burst=2)
+    ids = sorted(server.responses)[:40]
+    throttle = AdaptiveThrottle(capacity=4, rate=1000, cooldown=0.01)
+    fetcher, stats = fetch(server, ids, tmp_path, concurrency=8, throttle=throttle, backoff=0.005, max_retries=20)
+    assert set(saved(tmp_path)) == set(ids)
+    assert stats.failed == 0
+    assert stats.retries == server.rejected > 0
+    assert throttle.throttled == server.rejected
+    assert throttle.rate < 1000
+
+
+def test_unknown_ids_fail_without_retries(tmp_path, goods_jsonl):
+    server = MockGoodsServer.from_jsonl(goods_jsonl)
+    ids = sorted(server.responses)[:5] + [10 ** 9]
+    _, stats = fetch(server, ids, tmp_path, rate=0)
+    assert (stats.fetched, stats.failed, stats.retries) == (5, 1, 0)
+    assert str(10 ** 9) in (tmp_path / 'error.log').read_text(encoding='utf-8')
+
+
+def test_refused_connections_give_up_per_id(tmp_path):
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+    fetcher = GoodsInfoFetcher(None, tmp_path / 'out.jsonl', host='127.0.0.1', port=port, use_ssl=False,
+                               rate=0, max_retries=2, backoff=0.001, error_log=tmp_path / 'error.log')
+    stats = asyncio.run(fetcher.run([1, 2]))
+    assert (stats.fetched, stats.failed, stats.retries) == (0, 2, 4)
+    assert (tmp_path / 'error.log').read_text(encoding='utf-8').count('Giving up') == 2
@@ -0,0 +1,62 @@
+import numpy as np
+
+from cs2.optimize.breakpoints import critical_floats, evaluate_breakpoints, optimize_mix, uniform_input_cost
+from cs2.optimize.ga_fitness import batch_evaluate
+from cs2.optimize.utilities import wear_tiers
+
+OUTCOME_CONTAINER = np.array([0, 0, 1, 1, 1])
+OUTCOME_RANGES = np.array([[0.0, 1.0], [0.06, 0.8], [0.0, 0.5], [0.1, 0.7], [0.0, 0.08]])
+
+
+def prices(seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).random((len(OUTCOME_CONTAINER), 5)) * 100
+
+
+def test_tiers_are_constant_between_critical_floats():
+    points = critical_floats(OUTCOME_RANGES)
+    grid = np.linspace(1e-6, 1.0, 5001)
+    floats = OUTCOME_RANGES[:, 0] + (OUTCOME_RANGES[:, 1] - OUTCOME_RANGES[:, 0]) * grid[:, None]
+    tiers = wear_tiers(floats)
+    interval = np.searchsorted(points, grid, side='left')
+    for k in np.unique(interval).tolist():
+        assert (tiers[interval == k] == tiers[interval == k][0]).all()
+
+
+def test_expected_value_matches_dense_grid():
+    counts = np.array([3, 7])
+    points, expected_values = evaluate_breakpoints(counts, OUTCOME_CONTAINER, OUTCOME_RANGES, prices())
+    grid = np.linspace(1e-6, 1.0, 5001)
+    dense = batch_evaluate(np.repeat(counts[None], len(grid), axis=0), grid, OUTCOME_CONTAINER,
+                           OUTCOME_RANGES, prices()).expected_value
+    np.testing.assert_allclose(dense, expected_values[np.searchsorted(points, grid, side='left')])
+
+
+def test_optimize_mix_beats_every_grid_point():
+    rng = np.random.default_rng(1)
+    listing_container = rng.integers(0, 2, size=60)
+    listing_float = rng.random(60) * 0.6
+    listing_price = rng.random(60) * 20
+    counts = np.array([4, 6])
+    cost = uniform_input_cost(counts, listing_container, listing_float, listing_price)
+    best = optimize_mix(counts, OUTCOME_CONTAINER, OUTCOME_RANGES, prices(), cost)
+    assert [b.profit for b in best] == sorted((b.profit for b in best), reverse=True)
+    grid = np.linspace(0.0, 1.0, 2001)
+    ev = batch_evaluate(np.repeat(counts[None], len(grid), axis=0), grid, OUTCOME_CONTAINER,
+                        OUTCOME_RANGES, prices()).expected_value
+    dense_best = max(e - cost(g) for g, e in zip(grid.tolist(), ev.tolist()))
+    assert best[0].profit >= dense_best - 1e-9
+
+
+def test_uniform_input_cost_matches_brute_force():
+    rng = np.random.default_rng(2)
+    listing_container = rng.integers(0, 2, size=30)
+    listing_float = rng.random(30)
+    listing_price = rng.random(30) * 10
+    counts = np.array([2, 3])
+    cost = uniform_input_cost(counts, listing_container, listing_float, listing_price)
+    for target in (0.1, 0.3, 0.6, 1.0):
+        expected = 0.0
+        for c, n in enumerate(counts.tolist()):
+            eligible = np.sort(listing_price[(listing_container == c) & (listing_float <= target)])
+            expected = expected + (eligible[:n].sum() if len(eligible) >= n else np.inf)
+        assert cost(target) == expected
@@ -0,0 +1,47 @@
+import random
+
+import numpy as np
+
+from cs2.data_model.catalog import GoodsCatalog
+from cs2.data_model.response_model import Info
+
+
+def load(path) -> list[Info]:
+    return [Info.model_validate_json(line) for line in path.read_text(encoding='utf-8').splitlines()]
+
+
+def test_round_trip(goods_jsonl):
+    original = load(goods_jsonl)
+    random.Random(0).shuffle(original)
+    catalog = GoodsCatalog.from_infos(original)
+    by_id = {info.data.goods_info.yyyp_id: info for info in original}
+    assert len(catalog) == len(by_id)
+    for info in catalog.to_infos():
+        expected = by_id[info.data.goods_info.yyyp_id]
+        assert info.data.goods_info == expected.data.goods_info
+        assert info.data.container == expected.data.container
+
+
+def test_columns_and_lookups(goods_jsonl):
+    original = load(goods_jsonl)
+    catalog = GoodsCatalog.from_infos(original)
+    goods = sorted((info.data.goods_info for info in original), key=lambda g: g.yyyp_id)
+    prices = catalog.column('buff_sell_price')
+    assert np.array_equal(prices, [np.nan if g.buff_sell_price is None else g.buff_sell_price for g in goods],
+                          equal_nan=True)
+    assert catalog.column('market_hash_name').tolist() == [g.market_hash_name for g in goods]
+    assert catalog.rows([goods[3].yyyp_id, -5]).tolist() == [3, -1]
+    assert catalog.container_names(0) == [c.name for c in original[0].data.container]
+    name = goods[2].market_hash_name
+    assert catalog.hash_name_index.hash_names[catalog.hash_ids(2)] == name
+    assert catalog.code('market_hash_name', name) == catalog.goods['market_hash_name'][2]
+    assert catalog.code('market_hash_name', 'missing') == -1
+
+
+def test_last_duplicate_wins(goods_jsonl):
+    original = load(goods_jsonl)
+    updated = original[0].model_copy(deep=True)
+    updated.data.goods_info.buff_sell_price = 12345.0
+    catalog = GoodsCatalog.from_infos(original + [updated])
+    assert len(catalog) == len(original)
+    assert catalog.to_info(catalog.row(updated.data.goods_info.yyyp_id)).data.goods_info.buff_sell_price == 12345.0
@@ -0,0 +1,80 @@
+import threading
+
+import numpy as np
+
+from cs2.scrape.checkpoint import CheckpointStore
+
+
+def log_line(message: str) -> str:
+    return f"2025-09-25 12:00:00,000 - INFO - {message}\n"
+
+
+def test_marks_survive_reopening(tmp_path):
+    rng = np.random.default_rng(0)
+    ranges = {(int(rng.integers(1, 20)), round(float(low), 2), round(float(low) + 0.01, 2))
+              for low in rng.integers(0, 99, 200) / 100}
+    with CheckpointStore(tmp_path / 'checkpoint.sqlite3') as store:
+        for r in sorted(ranges)[:50]:
+            store.mark_range(*r)
+        store.mark_ranges(sorted(ranges)[50:])
+        store.mark_full(3)
+    with CheckpointStore(tmp_path / 'checkpoint.sqlite3') as store:
+        for yyid in range(1, 20):
+            assert store.done_ranges(yyid) == {(low, high) for i, low, high in ranges if i == yyid}
+        assert all(store.has_range(*r) for r in ranges)
+        assert not store.has_range(1, 0.5, 0.7)
+        assert store.is_full(3) and not store.is_full(4)
+        assert store.counts() == (len(ranges), 1)
+
+
+def test_float_bounds_are_rounded(tmp_path):
+    with CheckpointStore(tmp_path / 'checkpoint.sqlite3') as store:
+        store.mark_range('7', 0.1 + 0.2, 0.4)
+        assert store.has_range(7, 0.3, 0.4000000001)
+        store.mark_range(7, 0.3, 0.4)
+        assert store.counts() == (1, 0)
+
+
+def test_concurrent_marks(tmp_path):
+    with CheckpointStore(tmp_path / 'checkpoint.sqlite3') as store:
+        def work(yyid):
+            for i in range(50):
+                store.mark_range(yyid, i / 100, (i + 1) / 100)
+
+        threads = [threading.Thread(target=work, args=(yyid,)) for yyid in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert store.counts() == (400, 0)
+
+
+def test_import_log_once(tmp_path):
+    log = tmp_path / 'scrape.log'
+    log.write_text(
+        log_line("id: 1\trange: 0.0-0.07\tSuccess")
+        + log_line("id: 1\trange: 0.07-0.15\tFailed")
+        + log_line("id: 2\trange: 0.15-0.38\tSuccess")
+        + log_line("id: 2\trange: full\tSuccess")
+        + log_line("id: x\trange: 0.15-0.38\tSuccess")
+        + log_line("id: 3\trange: 0.45-1.0\tSuccess")[:-1],
+        encoding='utf-8',
+    )
+    with CheckpointStore(tmp_path / 'checkpoint.sqlite3') as store:
+        assert store.import_log(log) == 3
+        assert store.done_ranges(1) == {(0.0, 0.07)}
+        assert store.done_ranges(2) == {(0.15, 0.38)}
+        # the partial last line was still being written
+        assert store.done_ranges(3) == set()
+        assert store.is_full(2)
+        # lines appended by a later run are not imported again
+        with open(log, 'a', encoding='utf-8') as f:
+            f.write('\n' + log_line("id: 4\trange: 0.0-0.07\tSuccess"))
+        assert store.import_log(log) == 0
+        assert store.counts() == (2, 1)
+
+
+def test_import_missing_log(tmp_path):
+    with CheckpointStore(tmp_path / 'checkpoint.sqlite3') as store:
+        assert store.import_log(tmp_path / 'scrape.log') == 0
+        assert store.counts() == (0, 0)
@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+from cs2.data_model.fast_loader import CONTAINERS, DEFAULT_FIELDS, load_projected
+from cs2.data_model.response_model import Info
+
+FIELDS = DEFAULT_FIELDS + ('buff_sell_price', 'name', 'period_at', CONTAINERS)
+
+
+def expected(path) -> list[dict]:
+    rows = []
+    for line in path.read_text(encoding='utf-8').splitlines():
+        if not line:
+            continue
+        data = json.loads(line)['data']
+        row = {name: data['goods_info'][name] for name in FIELDS if name != CONTAINERS}
+        row[CONTAINERS] = [c['name'] for c in data['container']]
+        rows.append(row)
+    return rows
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_projection_matches_json_loads(goods_jsonl, workers):
+    loaded = load_projected(goods_jsonl, FIELDS, workers=workers, min_chunk_bytes=1)
+    assert [item.fields for item in loaded] == expected(goods_jsonl)
+
+
+def test_lazy_info_reads_its_own_line(goods_jsonl):
+    loaded = load_projected(goods_jsonl, workers=1)
+    lines = goods_jsonl.read_text(encoding='utf-8').splitlines()
+    for item in loaded[::7]:
+        assert item.info == Info.model_validate_json(lines[loaded.index(item)])
+        assert item.yyyp_id == item.info.data.goods_info.yyyp_id
+
+
+def test_blank_lines_are_skipped(goods_jsonl):
+    goods_jsonl.write_text(goods_jsonl.read_text(encoding='utf-8').replace('\n', '\n\n'), encoding='utf-8')
+    assert [item.fields for item in load_projected(goods_jsonl, FIELDS, workers=1)] == expected(goods_jsonl)
+
+
+def test_unknown_field(goods_jsonl):
+    with pytest.raises(ValueError):
+        load_projected(goods_jsonl, ('not_a_field',), workers=1)
@@ -0,0 +1,64 @@
+from cs2.scrape.float_planner import FloatPlanner
+
+
+def listing(abrade: float, price: float = 1.0) -> dict:
+    return {'abrade': f"{abrade:.10f}", 'price': price}
+
+
+def test_small_search_settles_every_bin():
+    planner = FloatPlanner(0.0, 0.05)
+    recorded = planner.record(*planner.full_range, 2, [listing(0.012), listing(0.031)])
+    assert planner.complete
+    assert [l['abrade'] for l in recorded.listings] == [listing(0.012)['abrade'], listing(0.031)['abrade']]
+    assert len(recorded.bins) == 5
+    assert planner.next_range() is None
+
+
+def test_listing_on_a_full_page_settles_its_bin():
+    planner = FloatPlanner(0.0, 0.05)
+    cheapest = listing(0.021, 1.0)
+    recorded = planner.record(*planner.full_range, 500, [cheapest] + [listing(0.022, 2.0)] * 9)
+    assert recorded.listings == [cheapest]
+    assert recorded.bins == [(0.02, 0.03)]
+    assert planner.cheapest[2] is cheapest
+    assert not planner.complete
+
+
+def test_dense_run_is_split():
+    planner = FloatPlanner(0.0, 0.10)
+    planner.record(*planner.full_range, 1000, [])
+    # 100 listings per bin, one bin per search
+    assert planner.next_range() == (0.0, 0.01)
+
+
+def test_sparse_runs_are_merged():
+    planner = FloatPlanner(0.0, 0.40)
+    settled = [0.025, 0.035, 0.045] + [0.075 + 0.01 * k for k in range(7)]
+    # 20 listings over 40 bins, two unsettled runs a page apart are searched together
+    planner.record(*planner.full_range, 20, [listing(a) for a in settled])
+    assert planner.next_range() == (0.0, 0.07)
+
+
+def test_stalled_single_bin_is_skipped():
+    planner = FloatPlanner(0.45, 0.46)
+    assert planner.next_range() == (0.45, 0.46)
+    recorded = planner.record(0.45, 0.46, 50, [])
+    assert recorded.bins == []
+    assert planner.next_range() is None
+    assert not planner.complete
+
+
+def test_searches_always_end():
+    planner = FloatPlanner(0.0, 0.55)
+    searches = 0
+    while (float_range := planner.next_range()) is not None:
+        # every listing sits on the upper edge, outside of the searched bins
+        planner.record(*float_range, 50, [listing(float_range[1])])
+        searches += 1
+    assert searches <= planner.max_searches
+
+
+def test_done_bins_are_not_searched_again():
+    planner = FloatPlanner(0.0, 0.03, done=[(0.0, 0.01), (0.02, 0.03)])
+    planner.record(*planner.full_range, 1000, [])
+    assert planner.next_range() == (0.01, 0.02)
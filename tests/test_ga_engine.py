@@ -0,0 +1,48 @@
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from cs2.optimize.ga import CONTRACT_SIZE, GAConfig, GeneticOptimizer, TradeUpProblem, score
+
+
+def problem(num_listings: int = 14, seed: int = 0) -> TradeUpProblem:
+    rng = np.random.default_rng(seed)
+    return TradeUpProblem.from_arrays(
+        listing_container=rng.integers(0, 2, size=num_listings),
+        listing_float=rng.random(num_listings) * 0.4,
+        listing_price=rng.random(num_listings) * 10 + 1,
+        outcome_container=np.array([0, 0, 1]),
+        outcome_ranges=np.array([[0.0, 1.0], [0.06, 0.8], [0.0, 0.5]]),
+        outcome_prices=rng.random((3, 5)) * 100,
+    )
+
+
+def test_finds_the_brute_force_optimum():
+    p = problem()
+    genomes = np.array(list(combinations(range(len(p.listing_price)), CONTRACT_SIZE)))
+    best = score(p, genomes).max()
+    result = GeneticOptimizer(p, GAConfig(population_size=64, generations=60, elite=4), workers=1).run()
+    assert result.best_fitness == pytest.approx(best)
+    assert score(p, result.best_genome[None])[0] == pytest.approx(result.best_fitness)
+
+
+def test_genomes_never_repeat_a_listing():
+    optimizer = GeneticOptimizer(problem(30), GAConfig(population_size=64, listing_mutation_rate=0.5), workers=1)
+    population = optimizer.initial_population()
+    for _ in range(5):
+        population = optimizer.mutate(optimizer.crossover(population))
+        assert all(len(set(row)) == CONTRACT_SIZE for row in population.tolist())
+
+
+def test_run_is_reproducible_across_worker_counts():
+    config = GAConfig(population_size=32, generations=5)
+    single = GeneticOptimizer(problem(30), config, workers=1).run()
+    pooled = GeneticOptimizer(problem(30), config, workers=2).run()
+    np.testing.assert_array_equal(single.best_genome, pooled.best_genome)
+    assert single.history == pooled.history
+
+
+def test_too_few_listings():
+    with pytest.raises(ValueError):
+        GeneticOptimizer(problem(CONTRACT_SIZE - 1))
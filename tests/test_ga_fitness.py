@@ -0,0 +1,64 @@
+import numpy as np
+
+from cs2.optimize.ga_fitness import batch_evaluate, container_possibilities, weapon_float
+from cs2.optimize.utilities import wear_tier
+
+
+def contracts(n: int = 40, num_containers: int = 3, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    counts = np.stack([np.bincount(rng.integers(0, num_containers, size=10), minlength=num_containers)
+                       for _ in range(n)])
+    wear_floats = rng.random((n, 10)) * 0.8
+    outcome_container = np.array([0, 0, 1, 2, 2, 2])
+    outcome_ranges = np.array([[0.0, 1.0], [0.06, 0.8], [0.0, 0.5], [0.1, 1.0], [0.0, 0.7], [0.9, 1.6]])
+    prices = rng.random((len(outcome_container), 5)) * 100
+    return counts, wear_floats, outcome_container, outcome_ranges, prices
+
+
+def scalar_evaluate(counts, wear_floats, outcome_container, outcome_ranges, prices):
+    """One contract with the scalar helpers, nan when a used outcome has no wear tier."""
+    containers = {c: (int(counts[c]), int((outcome_container == c).sum())) for c in range(len(counts)) if counts[c]}
+    possibilities = container_possibilities(containers)
+    probabilities, floats, tiers, ev = [], [], [], 0.0
+    for m, c in enumerate(outcome_container.tolist()):
+        output_float = weapon_float(list(wear_floats), *outcome_ranges[m])
+        probability = possibilities.get(c, 0.0)
+        tier = wear_tier(output_float)
+        if probability > 0:
+            ev += probability * (prices[m, tier] if tier >= 0 else np.nan)
+        probabilities.append(probability)
+        floats.append(output_float)
+        tiers.append(tier)
+    return probabilities, floats, tiers, ev
+
+
+def test_batch_matches_scalar_reference():
+    counts, wear_floats, outcome_container, outcome_ranges, prices = contracts()
+    result = batch_evaluate(counts, wear_floats, outcome_container, outcome_ranges, prices)
+    for i in range(len(counts)):
+        probabilities, floats, tiers, ev = scalar_evaluate(counts[i], wear_floats[i], outcome_container,
+                                                           outcome_ranges, prices)
+        np.testing.assert_allclose(result.probabilities[i], probabilities)
+        np.testing.assert_allclose(result.output_floats[i], floats)
+        np.testing.assert_array_equal(result.wear_tiers[i], tiers)
+        np.testing.assert_allclose(result.expected_value[i], ev)
+
+
+def test_averaged_floats_match_input_floats():
+    counts, wear_floats, outcome_container, outcome_ranges, prices = contracts()
+    full = batch_evaluate(counts, wear_floats, outcome_container, outcome_ranges, prices)
+    averaged = batch_evaluate(counts, wear_floats.mean(axis=1), outcome_container, outcome_ranges, prices)
+    np.testing.assert_allclose(averaged.output_floats, full.output_floats)
+    np.testing.assert_allclose(averaged.expected_value, full.expected_value)
+
+
+def test_missing_price_of_unused_container_is_ignored():
+    counts = np.array([[10, 0]])
+    prices = np.array([[1.0] * 5, [np.nan] * 5])
+    result = batch_evaluate(counts, np.array([0.2]), np.array([0, 1]), np.array([[0.0, 1.0], [0.0, 1.0]]), prices)
+    assert result.expected_value[0] == 1.0
+
+
+def test_no_prices_gives_nan_expected_value():
+    counts, wear_floats, outcome_container, outcome_ranges, _ = contracts(n=3)
+    assert np.isnan(batch_evaluate(counts, wear_floats, outcome_container, outcome_ranges).expected_value).all()
@@ -0,0 +1,69 @@
+import numpy as np
+
+from cs2.optimize.ga import TradeUpProblem, objectives, score
+from cs2.optimize.ga_fitness import batch_evaluate
+from cs2.optimize.utilities import wear_tier
+
+
+def problem(outcome_ranges) -> TradeUpProblem:
+    rng = np.random.default_rng(0)
+    return TradeUpProblem.from_arrays(
+        listing_container=np.repeat([0, 1], 15),
+        listing_float=rng.random(30) * 0.5,
+        listing_price=rng.random(30) * 10 + 1,
+        outcome_container=np.array([0, 0, 1]),
+        outcome_ranges=np.array(outcome_ranges, dtype=np.float64),
+        outcome_prices=rng.random((3, 5)) * 300,
+    )
+
+
+def brute_force_objectives(p: TradeUpProblem, genome: np.ndarray) -> tuple[float, float]:
+    # every outcome weighs as many inputs as its container has
+    weights = np.bincount(p.listing_container[genome], minlength=2)[p.outcome_container]
+    probabilities = weights / weights.sum()
+    avg = p.listing_float[genome].mean()
+    cost = p.listing_price[genome].sum()
+    ev, p_profit = 0.0, 0.0
+    for m, (low, high) in enumerate(p.outcome_ranges):
+        if probabilities[m] == 0:
+            continue
+        tier = wear_tier(low + (high - low) * avg)
+        if tier < 0:
+            return -np.inf, -np.inf
+        price = p.outcome_prices[m, tier]
+        ev += probabilities[m] * price
+        p_profit += probabilities[m] * (price > cost)
+    return ev / cost, p_profit
+
+
+def genomes(n: int = 50) -> np.ndarray:
+    rng = np.random.default_rng(1)
+    return np.stack([rng.choice(30, size=10, replace=False) for _ in range(n)])
+
+
+def test_objectives_match_brute_force():
+    p = problem([[0.0, 0.8], [0.06, 1.0], [0.1, 0.5]])
+    expected = np.array([brute_force_objectives(p, g) for g in genomes()])
+    np.testing.assert_allclose(objectives(p, genomes()), expected)
+
+
+def test_out_of_range_outcome_is_not_priced_as_factory_new():
+    # floats of the second outcome land above 1.0, out of every wear tier
+    p = problem([[0.0, 0.8], [0.9, 2.5], [0.1, 0.5]])
+    g = genomes()
+    uses_it = (p.listing_container[g] == 0).any(axis=1)
+    result = batch_evaluate(np.ones((1, 2)), np.array([0.4]), p.outcome_container, p.outcome_ranges, p.outcome_prices)
+    assert result.wear_tiers[0, 1] == -1
+    values = objectives(p, g)
+    assert np.all(values[uses_it] == -np.inf)
+    np.testing.assert_allclose(values, [brute_force_objectives(p, x) for x in g])
+
+
+def test_score_objectives():
+    p = problem([[0.0, 0.8], [0.06, 1.0], [0.1, 0.5]])
+    g = genomes()
+    roi = score(p, g, 'roi')
+    profit = score(p, g, 'profit')
+    cost = p.listing_price[g].sum(axis=1)
+    np.testing.assert_allclose(profit, roi * cost - cost)
+    np.testing.assert_allclose(score(p, g, 'pareto')[:, 0], roi)
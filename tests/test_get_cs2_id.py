@@ -0,0 +1,64 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from cs2.scrape.get_cs2_id import IdFetcher, IdIndex, load_ids, page_count
+from cs2.scrape.mock_server import MockGoodsServer
+from cs2.scrape.throttle import RateLimiter
+
+CATEGORIES = ['W0-', 'W1-3', 'W2-5-1', 'nothing']
+
+
+@pytest.fixture
+def server(goods_jsonl):
+    """The mock api on an event loop of its own, `IdFetcher` is blocking."""
+    server = MockGoodsServer.from_jsonl(goods_jsonl)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(server.start(), loop).result()
+    yield server
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def fetcher(server, index: IdIndex, page_size: int = 7) -> IdFetcher:
+    return IdFetcher(None, index, host=server.host, port=server.port, use_ssl=False, workers=3,
+                     limiter=RateLimiter(rate=1000.0), page_size=page_size, save_every=2)
+
+
+def expected(server, category: str) -> list[int]:
+    return [i for i, body in server.responses.items() if category in json.loads(body)['data']['goods_info']['name']]
+
+
+def test_every_page_is_fetched(server, tmp_path):
+    index = fetcher(server, IdIndex(tmp_path / 'index.json')).fetch(CATEGORIES)
+    for category in CATEGORIES:
+        assert [item['id'] for item in index.items(category)] == expected(server, category)
+        assert index.complete(category)
+    ids = [item['id'] for item in load_ids(tmp_path / 'index.json')]
+    assert sorted(ids) == sorted({i for category in CATEGORIES for i in expected(server, category)})
+
+
+def test_resume_fetches_only_missing_pages(server, tmp_path):
+    fetcher(server, IdIndex(tmp_path / 'index.json')).fetch(CATEGORIES)
+    index = IdIndex(tmp_path / 'index.json')
+    del index.categories['W0-']['pages']['2']
+    del index.categories['W1-3']
+    index.save()
+    before = server.requests
+    index = fetcher(server, IdIndex(tmp_path / 'index.json')).fetch(CATEGORIES)
+    assert server.requests - before == 1 + page_count(len(expected(server, 'W1-3')), 7)
+    assert [item['id'] for item in index.items('W0-')] == expected(server, 'W0-')
+
+
+def test_another_page_size_starts_over(server, tmp_path):
+    fetcher(server, IdIndex(tmp_path / 'index.json')).fetch(CATEGORIES)
+    index = fetcher(server, IdIndex(tmp_path / 'index.json'), page_size=5).fetch(CATEGORIES)
+    for category in CATEGORIES:
+        assert index.categories[category]['page_size'] == 5
+        assert [item['id'] for item in index.items(category)] == expected(server, category)
@@ -0,0 +1,58 @@
+import re
+
+import numpy as np
+import pytest
+
+from cs2.data_model.hash_name_index import WEAR_RANKS, HashNameIndex, parse_hash_name
+
+NAMES = [
+    'AK-47 | Redline (Field-Tested)',
+    'StatTrak™ AK-47 | Redline (Minimal Wear)',
+    'Souvenir AWP | Dragon Lore (Factory New)',
+    '★ StatTrak™ Karambit | Fade (Factory New)',
+    '★ Karambit',
+    'Sticker | Team Liquid (Holo) | Katowice 2019',
+    'AK-47 | Redline (Field-Tested)',
+    'Souvenir Package',
+]
+# how the notebook strips the wear tier
+WEAR_RANK_P = re.compile(r'\s*\(([^)]*)\)\s*$')
+
+
+@pytest.mark.parametrize('name', NAMES)
+def test_weapon_name_matches_the_notebook(name):
+    parsed = parse_hash_name(name)
+    match = WEAR_RANK_P.search(name)
+    if match and match.group(1) in WEAR_RANKS:
+        assert parsed.weapon_name == WEAR_RANK_P.sub('', name).strip()
+        assert WEAR_RANKS[parsed.wear] == match.group(1)
+    else:
+        assert parsed.weapon_name == name
+        assert parsed.wear == -1
+
+
+def test_prefixes():
+    assert parse_hash_name('StatTrak™ AK-47 | Redline (Minimal Wear)').base_name == 'AK-47 | Redline'
+    assert parse_hash_name('StatTrak™ AK-47 | Redline (Minimal Wear)').stattrak
+    assert parse_hash_name('Souvenir AWP | Dragon Lore (Factory New)').souvenir
+    knife = parse_hash_name('★ StatTrak™ Karambit | Fade (Factory New)')
+    assert (knife.base_name, knife.stattrak) == ('★ Karambit | Fade', True)
+
+
+def test_index_matches_parse(tmp_path):
+    index = HashNameIndex.from_names(NAMES)
+    for hash_id, name in enumerate(NAMES):
+        assert index.parsed(hash_id) == parse_hash_name(name)
+    assert index.id(NAMES[1]) == 1
+    assert index.weapon_ids[0] == index.weapon_ids[6]
+    assert index.id('missing') == -1
+    assert index.weapon_id('AK-47 | Redline') == index.weapon_ids[0]
+    assert index.variants[index.weapon_ids[1], WEAR_RANKS.index('Minimal Wear')] == 1
+    assert (index.variants[index.weapon_id('★ Karambit')] == -1).all()
+
+    loaded = HashNameIndex.load(index.save(tmp_path / 'index'))
+    assert [loaded.parsed(i) for i in range(len(NAMES))] == [index.parsed(i) for i in range(len(NAMES))]
+    assert HashNameIndex.cached(tmp_path / 'index', NAMES).hash_names == NAMES
+    rebuilt = HashNameIndex.cached(tmp_path / 'index', NAMES[:3])
+    assert rebuilt.hash_names == NAMES[:3]
+    np.testing.assert_array_equal(HashNameIndex.load(tmp_path / 'index').wear, rebuilt.wear)
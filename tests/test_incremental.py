@@ -0,0 +1,55 @@
+import numpy as np
+
+from cs2.optimize.incremental import Contract, IncrementalEvaluator
+from cs2.scrape.cs2_terms import rank_to_rarity
+
+INPUT_RARITY = rank_to_rarity[4]
+
+
+def contracts(index, n: int = 60, seed: int = 0) -> list[Contract]:
+    rng = np.random.default_rng(seed)
+    names = sorted({container for container, _ in index.groups})
+    result = []
+    for _ in range(n):
+        chosen = tuple(rng.choice(names, size=int(rng.integers(1, 4)), replace=False).tolist())
+        counts = np.bincount(rng.integers(0, len(chosen), size=10), minlength=len(chosen))
+        result.append(Contract(chosen, tuple(counts.tolist()), INPUT_RARITY, float(rng.random() * 0.6)))
+    return result
+
+
+def assert_matches_full_recompute(evaluator, index, prices):
+    fresh = IncrementalEvaluator(index, prices)
+    for contract_id, contract in evaluator.contracts.items():
+        np.testing.assert_equal(evaluator.values[contract_id], fresh.values[fresh.add(contract)])
+
+
+def test_update_matches_full_recompute(index, prices):
+    evaluator = IncrementalEvaluator(index, prices)
+    ids = evaluator.add_many(contracts(index))
+    moved = {name: price * 1.5 for name, price in list(prices.items())[::7]}
+    before = dict(evaluator.values)
+    affected = evaluator.update_prices({**prices, **moved})
+    assert affected
+    assert {i for i in ids if evaluator.values[i] != before[i]} <= affected
+    assert_matches_full_recompute(evaluator, index, {**prices, **moved})
+
+
+def test_shrinking_snapshot_invalidates_delisted_prices(index, prices):
+    evaluator = IncrementalEvaluator(index, prices)
+    ids = evaluator.add_many(contracts(index))
+    names = list(prices)
+    # half of the hash names disappear, a few more are listed without a price
+    shrunk = {name: prices[name] for name in names[::2]}
+    shrunk.update({name: None for name in names[::2][:5]})
+    before = dict(evaluator.values)
+    affected = evaluator.update_prices(shrunk)
+    changed = {i for i in ids if not np.array_equal(evaluator.values[i], before[i], equal_nan=True)}
+    assert changed and changed <= affected
+    assert any(np.isnan(evaluator.values[i]) for i in ids)
+    assert_matches_full_recompute(evaluator, index, shrunk)
+
+
+def test_unchanged_snapshot_affects_nothing(index, prices):
+    evaluator = IncrementalEvaluator(index, prices)
+    evaluator.add_many(contracts(index))
+    assert evaluator.update_prices(dict(prices)) == set()
@@ -0,0 +1,81 @@
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cs2.optimize.input_solver import InputSolver
+
+KEY = ('普通', 'Case 0', '受限')
+
+
+def price_table(n: int = 12, min_float: float = 0.0, max_float: float = 1.0, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    # normalized floats on the solver's 0.001 grid, so discretizing them loses nothing
+    normalized = rng.integers(0, 1000, size=n) / 1000
+    abrade = min_float + normalized * (max_float - min_float)
+    return pd.DataFrame({
+        'quality': KEY[0], 'container': KEY[1], 'rarity': KEY[2],
+        'price': np.round(rng.random(n) * 50 + 1, 2),
+        'abrade': abrade, 'min_float': min_float, 'max_float': max_float,
+        'new_abrade': abrade / (max_float - min_float),
+    })
+
+
+def brute_force(floats: np.ndarray, prices: np.ndarray, target: float, count: int) -> float:
+    best = np.inf
+    for rows in combinations(range(len(floats)), count):
+        rows = list(rows)
+        if floats[rows].sum() <= target * count + 1e-9:
+            best = min(best, prices[rows].sum())
+    return best
+
+
+@pytest.mark.parametrize('count', [1, 3, 4])
+def test_cost_matches_brute_force(count):
+    table = price_table()
+    solver = InputSolver(table, max_count=4)
+    floats, prices = table['abrade'].to_numpy(), table['price'].to_numpy()
+    targets = np.linspace(0.0, 1.0, 41)
+    expected = [brute_force(floats, prices, t, count) for t in targets.tolist()]
+    np.testing.assert_allclose([solver.cost(KEY, t, count) for t in targets.tolist()], expected)
+    np.testing.assert_allclose(solver.costs(KEY, targets, count), expected)
+
+
+def test_select_backtracks_the_cheapest_inputs():
+    table = price_table()
+    solver = InputSolver(table, max_count=4)
+    for target in (0.2, 0.35, 0.5, 0.8):
+        rows = solver.select(KEY, target, 4)
+        if solver.cost(KEY, target, 4) == np.inf:
+            assert rows.empty
+            continue
+        assert len(rows) == 4 and rows.index.is_unique
+        assert rows['price'].sum() == pytest.approx(solver.cost(KEY, target, 4))
+        assert rows['input_float'].mean() <= target + 1e-9
+
+
+def test_normalized_space_subtracts_the_minimum():
+    table = price_table(min_float=0.1, max_float=0.6)
+    normalized, raw = InputSolver(table, max_count=4), InputSolver(table, max_count=4, float_space='raw')
+    normalized_floats = ((table['abrade'] - 0.1) / 0.5).to_numpy()
+    prices = table['price'].to_numpy()
+    for target in (0.2, 0.4, 0.7):
+        assert normalized.cost(KEY, target, 3) == pytest.approx(brute_force(normalized_floats, prices, target, 3))
+        assert raw.cost(KEY, target, 3) == pytest.approx(brute_force(table['abrade'].to_numpy(), prices, target, 3))
+
+
+def test_input_cost_sums_groups():
+    table = pd.concat([price_table(seed=0), price_table(seed=1).assign(container='Case 1')])
+    solver = InputSolver(table, max_count=4)
+    other = (KEY[0], 'Case 1', KEY[2])
+    cost = solver.input_cost([KEY, other], np.array([3, 2]))
+    assert cost(0.5) == pytest.approx(solver.cost(KEY, 0.5, 3) + solver.cost(other, 0.5, 2))
+    assert solver.cost(('普通', 'missing', '受限'), 0.5, 3) == np.inf
+
+
+def test_rejects_unknown_space_and_missing_columns():
+    with pytest.raises(ValueError):
+        InputSolver(price_table(), float_space='new_abrade')
+    with pytest.raises(ValueError):
+        InputSolver(price_table().drop(columns=['min_float']))
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from cs2.optimize.outcome_index import OutcomeIndex
+from cs2.scrape.cs2_terms import rank_to_rarity
+
+
+def test_outcomes_match_identity(index, identity):
+    for container_name, rarities in identity.items():
+        for rank in (3, 4):
+            outcomes = index.outcomes(container_name, rank_to_rarity[rank])
+            expected = identity[container_name][rank_to_rarity[rank + 1]]
+            assert [index.weapon_names[i] for i in outcomes.ids] == [w.weapon_name for w in expected]
+            np.testing.assert_array_equal(outcomes.min_float, [w.min_float for w in expected])
+            np.testing.assert_array_equal(outcomes.max_float, [w.max_float for w in expected])
+
+
+@pytest.mark.parametrize('rarity', ['违禁', '隐秘', 'typo'])
+def test_unknown_or_top_rarity_has_no_outcomes(index, rarity):
+    assert len(index.outcomes('Case 0', rarity).ids) == 0
+    assert len(index.contract_outcomes(['Case 0', 'Case 1'], rarity).outcome_ids) == 0
+
+
+def test_save_and_load_round_trip(index, tmp_path):
+    index.save(tmp_path)
+    loaded = OutcomeIndex.load(tmp_path)
+    assert loaded.groups == index.groups
+    assert loaded.hash_names == index.hash_names
+    for container_name, rarity in index.groups:
+        np.testing.assert_array_equal(loaded.outcomes(container_name, rarity).ids, index.outcomes(container_name, rarity).ids)
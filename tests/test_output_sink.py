@@ -0,0 +1,63 @@
+import importlib.util
+
+import pytest
+
+from cs2.scrape.output_sink import OutputSink, open_segment, read_records, segments
+
+COMPRESSIONS = [None, 'gzip', pytest.param('zstd', marks=pytest.mark.skipif(
+    importlib.util.find_spec('zstandard') is None, reason='zstandard is not installed'))]
+
+
+@pytest.mark.parametrize('compression', COMPRESSIONS)
+def test_records_round_trip(tmp_path, compression):
+    path = tmp_path / 'out.jsonl'
+    records = [{'i': i, 'name': f"物品 {i}"} for i in range(50)]
+    with OutputSink(path, batch_size=7, flush_interval=0, max_bytes=200, compression=compression) as sink:
+        sink.write_many(records[:20])
+        sink.rotate()
+        for record in records[20:]:
+            sink.write(record)
+    found = segments(path)
+    assert len(found) > 2
+    if compression is not None:
+        assert all(s.name.endswith({'gzip': '.gz', 'zstd': '.zst'}[compression]) for s in found[:-1] if s != path)
+    assert list(read_records(path)) == records
+
+
+@pytest.mark.parametrize('compression', COMPRESSIONS)
+def test_open_segment_at_offset(tmp_path, compression):
+    path = tmp_path / 'out.jsonl'
+    with OutputSink(path, flush_interval=0, compression=compression) as sink:
+        sink.write_many({'i': i} for i in range(10))
+        segment = sink.rotate()
+    with open_segment(segment) as f:
+        content = f.read()
+    offset = content.index(b'\n') + 1
+    with open_segment(segment, offset) as f:
+        assert f.readline() == b'{"i": 1}\n'
+        assert b''.join(f) == content[offset + len(b'{"i": 1}\n'):]
+
+
+def test_partial_last_line_is_skipped(tmp_path):
+    path = tmp_path / 'out.jsonl'
+    path.write_bytes(b'{"i": 0}\n{"i": 1}\n{"i"')
+    assert list(read_records(path)) == [{'i': 0}, {'i': 1}]
+
+
+
+def test_every_flush_callback_runs(tmp_path):
+    calls = []
+
+    def fail():
+        calls.append('fail')
+        raise ValueError('checkpoint failed')
+
+    sink = OutputSink(tmp_path / 'out.jsonl', batch_size=100, flush_interval=0)
+    sink.write({'i': 0})
+    sink.after_flush(fail)
+    sink.after_flush(lambda: calls.append('after'))
+    with pytest.raises(ValueError):
+        sink.flush()
+    sink.close()
+    assert calls == ['fail', 'after']
+    assert list(read_records(tmp_path / 'out.jsonl')) == [{'i': 0}]
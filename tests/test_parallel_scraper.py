@@ -0,0 +1,156 @@
+import asyncio
+import contextlib
+from types import SimpleNamespace
+
+import pytest
+from playwright.async_api import Error
+
+from cs2.scrape import parallel_scraper
+from cs2.scrape.checkpoint import CheckpointStore
+from cs2.scrape.output_sink import OutputSink, read_records
+from cs2.scrape.parallel_scraper import ParallelScraper, ResponseStatusError
+from cs2.scrape.throttle import RateLimiter
+
+
+class FakeResponse:
+    url = 'https://api.youpin898.com/api/homepage/pc/goods/market/queryOnSaleCommodityList'
+
+    def __init__(self, status: int):
+        self.status = status
+        self.ok = 200 <= status < 300
+
+
+class FakePage:
+    def __init__(self, context, statuses=()):
+        self.context = context
+        self.statuses = iter(statuses)
+        self.closed = False
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+    @contextlib.asynccontextmanager
+    async def expect_response(self, predicate):
+        value = asyncio.get_running_loop().create_future()
+        yield SimpleNamespace(value=value)
+        value.set_result(FakeResponse(next(self.statuses)))
+
+
+class FakeContext:
+    def __init__(self):
+        self.alive = True
+
+    async def new_page(self) -> FakePage:
+        if not self.alive:
+            raise Error("Target page, context or browser has been closed")
+        return FakePage(self)
+
+    async def close(self):
+        self.alive = False
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.contexts = []
+        self.chromium = self
+
+    async def launch_persistent_context(self, **kwargs) -> FakeContext:
+        self.contexts.append(FakeContext())
+        return self.contexts[-1]
+
+
+@pytest.fixture
+def playwright(monkeypatch, tmp_path):
+    fake = FakePlaywright()
+
+    @contextlib.asynccontextmanager
+    async def async_playwright():
+        yield fake
+
+    monkeypatch.setattr(parallel_scraper, 'async_playwright', async_playwright)
+    # no pause between restarts
+    sleep = asyncio.sleep
+    monkeypatch.setattr(parallel_scraper.asyncio, 'sleep', lambda seconds: sleep(0))
+    # the checkpoint imports `scrape.log` of the working directory
+    monkeypatch.chdir(tmp_path)
+    return fake
+
+
+def scraper(tmp_path, **kwargs) -> ParallelScraper:
+    return ParallelScraper(checkpoint=CheckpointStore(tmp_path / 'checkpoint.sqlite3'),
+                           sink=OutputSink(tmp_path / 'out.jsonl'), limiter=RateLimiter(rate=1000.0), **kwargs)
+
+
+def test_failed_items_are_requeued(tmp_path, playwright, monkeypatch):
+    attempts = {}
+
+    async def scrape_item(self, page, id_, min_val, max_val):
+        attempts[id_] = attempts.get(id_, 0) + 1
+        if id_ == 10 or (id_ % 3 == 0 and attempts[id_] == 1):
+            raise ResponseStatusError("Response status 503")
+
+    monkeypatch.setattr(ParallelScraper, '_scrape_item', scrape_item)
+    s = scraper(tmp_path, workers=3, max_attempts=3)
+    s.scrape([(i, 0.0, 1.0) for i in range(1, 21)])
+    expected = {i: 3 if i == 10 else 2 if i % 3 == 0 else 1 for i in range(1, 21)}
+    assert attempts == expected
+    # one restart per failed attempt, id 10 failed all of its attempts
+    assert s.restarts == sum(n - 1 for n in expected.values()) + 1
+    assert len(playwright.contexts) == 1
+
+
+def test_dead_context_is_relaunched_once(tmp_path, playwright, monkeypatch):
+    attempts = {}
+
+    async def scrape_item(self, page, id_, min_val, max_val):
+        attempts[id_] = attempts.get(id_, 0) + 1
+        if id_ == 5 and attempts[id_] == 1:
+            await page.context.close()
+            raise Error("Target page, context or browser has been closed")
+
+    monkeypatch.setattr(ParallelScraper, '_scrape_item', scrape_item)
+    s = scraper(tmp_path, workers=4)
+    s.scrape([(i, 0.0, 1.0) for i in range(1, 31)])
+    assert set(attempts) == set(range(1, 31))
+    assert attempts[5] == 2
+    # every worker opening a page on the dead context shares one relaunch
+    assert len(playwright.contexts) == 2
+    assert s.context is playwright.contexts[-1]
+
+
+def test_dead_worker_ends_the_run(tmp_path, playwright, monkeypatch):
+    async def worker(self, playwright, queue, progress):
+        raise ValueError("dead")
+
+    monkeypatch.setattr(ParallelScraper, '_worker', worker)
+    sink = OutputSink(tmp_path / 'out.jsonl', batch_size=100)
+    sink.write({'i': 0})
+    s = ParallelScraper(workers=2, checkpoint=CheckpointStore(tmp_path / 'checkpoint.sqlite3'), sink=sink)
+    with pytest.raises(RuntimeError) as raised:
+        s.scrape([(1, 0.0, 1.0)])
+    assert isinstance(raised.value.__cause__, ValueError)
+    # buffered listings were flushed on the way out
+    assert list(read_records(tmp_path / 'out.jsonl')) == [{'i': 0}]
+
+
+@pytest.mark.parametrize('status, rate', [(200, 'up'), (429, 'down'), (503, 'same')])
+def test_request_adapts_the_rate_to_the_status(tmp_path, playwright, status, rate):
+    s = scraper(tmp_path)
+    before = s.bucket.rate
+
+    async def request():
+        async def action():
+            pass
+        return await s._request(FakePage(None, [status]), action)
+
+    if status == 200:
+        assert asyncio.run(request()).status == 200
+    else:
+        with pytest.raises(ResponseStatusError):
+            asyncio.run(request())
+    after = s.bucket.rate
+    assert {'up': after > before, 'down': after < before, 'same': after == before}[rate]
+    assert s.bucket.throttled == (status == 429)
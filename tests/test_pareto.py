@@ -0,0 +1,42 @@
+import numpy as np
+
+from cs2.optimize.pareto import ParetoFront, domination_counts
+
+
+def brute_force_front(points: np.ndarray) -> set[tuple[float, float]]:
+    front = set()
+    for p in points.tolist():
+        if not any(q[0] >= p[0] and q[1] >= p[1] and q != p for q in points.tolist()):
+            front.add(tuple(p))
+    return front
+
+
+def test_front_matches_brute_force():
+    rng = np.random.default_rng(0)
+    # rounded so ties in either objective happen
+    points = np.round(rng.random((300, 2)), 1)
+    front = ParetoFront()
+    for chunk in np.array_split(points, 7):
+        front.add_batch(chunk)
+    assert set(map(tuple, front.points().tolist())) == brute_force_front(points)
+    assert np.all(np.diff(front.points()[:, 0]) < 0)
+    assert np.all(np.diff(front.points()[:, 1]) > 0)
+
+
+def test_single_inserts_match_batches():
+    rng = np.random.default_rng(1)
+    points = rng.random((200, 2))
+    one_by_one, batched = ParetoFront(), ParetoFront()
+    for roi, p_profit in points.tolist():
+        one_by_one.add(roi, p_profit)
+    batched.add_batch(points)
+    np.testing.assert_array_equal(one_by_one.points(), batched.points())
+
+
+def test_domination_counts():
+    rng = np.random.default_rng(2)
+    points = np.round(rng.random((100, 2)), 1)
+    counts = domination_counts(points)
+    for p, count in zip(points.tolist(), counts.tolist()):
+        expected = sum(q[0] >= p[0] and q[1] >= p[1] and q != p for q in points.tolist())
+        assert count == expected
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cs2.optimize.price_curve import PARAMS, PriceCurves, fit_group, monotone_filter, two_exp
+
+TRUE = (40.0, 4.0, 200.0, 80.0, 10.0)
+
+
+def price_table(seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    rows = []
+    for c in range(3):
+        x = np.sort(rng.random(60))
+        y = two_exp(x, *TRUE) * (1 + c) * (1 + rng.normal(0, 0.01, len(x)))
+        rows += [('普通', f"Case {c}", '受限', xi, yi) for xi, yi in zip(x, y)]
+    # too sparse to fit
+    rows += [('普通', 'Case 9', '受限', x, 1.0) for x in (0.1, 0.2, 0.3)]
+    return pd.DataFrame(rows, columns=['quality', 'container', 'rarity', 'new_abrade', 'price'])
+
+
+def test_monotone_filter():
+    rng = np.random.default_rng(0)
+    y = rng.random(200) * 100
+    keep = monotone_filter(y, rel_tol=0.05)
+    last = None
+    for yi, kept in zip(y, keep):
+        assert kept == (last is None or yi <= last * 1.05)
+        if kept:
+            last = yi
+
+
+def test_fit_recovers_the_curve():
+    x = np.linspace(0, 1, 200)
+    params = fit_group(x, two_exp(x, *TRUE))
+    # the knee term pulls toward the last point before 0.07, a few percent off the true curve
+    assert np.allclose(two_exp(x, *params), two_exp(x, *TRUE), rtol=0.05)
+    assert np.isnan(fit_group(x[:5], two_exp(x[:5], *TRUE))).all()
+
+
+def test_fit_matches_per_group_fits(tmp_path):
+    table = price_table()
+    curves = PriceCurves.fit(table, workers=1)
+    assert np.array_equal(PriceCurves.fit(table, workers=2).params, curves.params, equal_nan=True)
+    for key, group in table.groupby(['quality', 'container', 'rarity']):
+        group = group.sort_values('new_abrade')
+        expected = fit_group(group['new_abrade'].to_numpy(), group['price'].to_numpy())
+        assert np.array_equal(curves.params[curves.group_id(key)], expected, equal_nan=True)
+
+    curves.save(tmp_path / 'curves.npz')
+    loaded = PriceCurves.load(tmp_path / 'curves.npz')
+    assert loaded.keys == curves.keys
+    ids = loaded.group_ids([('普通', 'Case 1', '受限'), ('普通', 'Case 9', '受限'), ('普通', 'missing', '受限')])
+    assert ids[-1] == -1
+    prices = loaded.price(ids, np.array([0.3, 0.3, 0.3]))
+    assert prices[0] == pytest.approx(two_exp(0.3, *TRUE) * 2, rel=0.05)
+    assert np.isnan(prices[1:]).all()
+    assert curves.params.shape == (4, len(PARAMS))
@@ -0,0 +1,142 @@
+import json
+import shutil
+
+import numpy as np
+import pytest
+
+from cs2.data_model.price_history import PriceHistory
+
+FIELDS = ('buff_sell_price', 'yyyp_sell_price', 'yyyp_sell_num')
+DATES = [f"2025-09-{day:02d}" for day in range(20, 26)]
+
+
+def snapshots(seed: int = 0) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Random days over 30 ids: some ids skip a day, some values are None, most stay put."""
+    rng = np.random.default_rng(seed)
+    values = rng.integers(1, 50, (30, len(FIELDS))).astype(np.float64)
+    days = []
+    for _ in DATES:
+        moved = rng.random(values.shape) < 0.2
+        values = np.where(moved, rng.integers(1, 50, values.shape), values)
+        values[rng.random(values.shape) < 0.05] = np.nan
+        present = np.flatnonzero(rng.random(len(values)) < 0.8)
+        days.append((present + 100, values[present].copy()))
+    return days
+
+
+def carried_forward(days) -> dict[int, np.ndarray]:
+    """(days, fields) value of every id, recomputed from scratch: an id missing from a
+    snapshot keeps its last value, nan before its first sighting."""
+    ids = np.unique(np.concatenate([ids for ids, _ in days]))
+    table = {int(i): np.full((len(days), len(FIELDS)), np.nan) for i in ids}
+    for d, (day_ids, values) in enumerate(days):
+        for i in table:
+            if d:
+                table[i][d] = table[i][d - 1]
+        for i, row in zip(day_ids.tolist(), values):
+            table[i][d] = row
+    return table
+
+
+def fill(history: PriceHistory, days) -> list[int]:
+    return [history.append(date, ids, values) for date, (ids, values) in zip(DATES, days)]
+
+
+def assert_series(history: PriceHistory, expected: dict[int, np.ndarray]):
+    for i, table in expected.items():
+        for f, field in enumerate(FIELDS):
+            dates, values = history.series(i, field)
+            assert dates == DATES[:len(table)]
+            assert np.array_equal(values, table[:, f], equal_nan=True), (i, field)
+
+
+def test_series_match_full_recompute(tmp_path):
+    days = snapshots()
+    history = PriceHistory(tmp_path / 'history', FIELDS)
+    written = fill(history, days)
+    expected = carried_forward(days)
+    assert_series(history, expected)
+    # one record per value that moved, an absent id writes nothing
+    changes = []
+    for d, (ids, values) in enumerate(days):
+        before = np.array([expected[i][d - 1] if d else np.full(len(FIELDS), np.nan) for i in ids.tolist()])
+        changes.append(int((~((before == values) | (np.isnan(before) & np.isnan(values)))).sum()))
+    assert written == changes
+    # a reopened history reads the same
+    assert_series(PriceHistory(tmp_path / 'history', FIELDS), expected)
+
+
+def test_series_date_range(tmp_path):
+    days = snapshots()
+    history = PriceHistory(tmp_path / 'history', FIELDS)
+    fill(history, days)
+    expected = carried_forward(days)
+    dates, values = history.series(105, 'yyyp_sell_price', start=DATES[2], end=DATES[4])
+    assert dates == DATES[2:5]
+    assert np.array_equal(values, expected[105][2:5, 1], equal_nan=True)
+    assert np.isnan(history.series(1, 'yyyp_sell_price')[1]).all()
+
+
+def test_movers(tmp_path):
+    days = snapshots()
+    history = PriceHistory(tmp_path / 'history', FIELDS)
+    fill(history, days)
+    expected = carried_forward(days)
+    d = 3
+    moved = []
+    for i, table in expected.items():
+        before, after = table[d - 1, 1], table[d, 1]
+        if np.isfinite(before) and np.isfinite(after) and abs(after - before) / before > 0.1:
+            moved.append(i)
+    movers = history.movers('yyyp_sell_price', threshold=0.1, date=DATES[d])
+    assert sorted(movers['yyyp_id'].tolist()) == moved
+
+
+def test_uncommitted_append_is_rolled_back(tmp_path):
+    days = snapshots()
+    path = tmp_path / 'history'
+    history = PriceHistory(path, FIELDS)
+    fill(history, days[:3])
+    committed = (path / 'days.json').read_text(encoding='utf-8')
+    history.append(DATES[3], *days[3])
+    # crash before days.json commits: records and state of the 4th day are on disk
+    (path / 'days.json').write_text(committed, encoding='utf-8')
+
+    reopened = PriceHistory(path, FIELDS)
+    assert reopened.dates == DATES[:3]
+    assert len(reopened.records) == json.loads(committed)[-1]['end']
+    written = [reopened.append(date, ids, values) for date, (ids, values) in zip(DATES[3:], days[3:])]
+    assert written == fill(PriceHistory(tmp_path / 'clean', FIELDS), days)[3:]
+    assert_series(reopened, carried_forward(days))
+
+
+def test_untagged_state_is_rebuilt(tmp_path):
+    days = snapshots()
+    path = tmp_path / 'history'
+    fill(PriceHistory(path, FIELDS), days)
+    shutil.copy(path / 'state.npz', tmp_path / 'state.npz')
+    with np.load(tmp_path / 'state.npz') as state:
+        np.savez(path / 'state.npz', ids=state['ids'], values=np.zeros_like(state['values']))
+    rebuilt = PriceHistory(path, FIELDS)
+    with np.load(tmp_path / 'state.npz') as state:
+        assert np.array_equal(rebuilt.ids, state['ids'])
+        assert np.array_equal(rebuilt.values, state['values'], equal_nan=True)
+
+
+def test_append_jsonl(tmp_path, goods_jsonl):
+    history = PriceHistory(tmp_path / 'history', FIELDS)
+    history.append_jsonl(goods_jsonl)
+    assert history.dates == ['2025-09-25']
+    for line in goods_jsonl.read_text(encoding='utf-8').splitlines()[::11]:
+        goods_info = json.loads(line)['data']['goods_info']
+        for field in FIELDS:
+            value = history.series(goods_info['yyyp_id'], field)[1][0]
+            assert value == goods_info[field] or (goods_info[field] is None and np.isnan(value))
+
+
+def test_dates_must_increase(tmp_path):
+    history = PriceHistory(tmp_path / 'history', FIELDS)
+    ids, values = snapshots()[0]
+    history.append(DATES[1], ids, values)
+    with pytest.raises(ValueError):
+        history.append(DATES[0], ids, values)
@@ -0,0 +1,111 @@
+import importlib.util
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cs2.data_model.price_table import COLUMNS, KEY_COLUMNS, PriceTableBuilder, bin_labels, build_item_meta
+from cs2.scrape.output_sink import OutputSink
+
+COMPRESSIONS = [None, 'gzip', pytest.param('zstd', marks=pytest.mark.skipif(
+    importlib.util.find_spec('zstandard') is None, reason='zstandard is not installed'))]
+
+
+def listings(meta, n: int = 600, seed: int = 0) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    ids = sorted(meta) + [-1, -2]
+    rows = []
+    for i in range(n):
+        yyid = ids[rng.integers(len(ids))]
+        low, high = (meta[yyid].min_float, meta[yyid].max_float) if yyid in meta else (0.0, 1.0)
+        rows.append({
+            'templateId': yyid,
+            'commodityName': f"listing {i}",
+            'price': str(round(float(rng.random() * 100), 3)) if rng.random() > 0.02 else None,
+            'abrade': str(rng.uniform(low, high)) if rng.random() > 0.02 else '',
+        })
+    return rows
+
+
+def brute_force(meta, rows: list[dict]) -> pd.DataFrame:
+    """Cheapest listing of every (quality, container, rarity, abrade_bin), one listing at a time."""
+    best = {}
+    for row in rows:
+        item = meta.get(row['templateId'])
+        if item is None or not row['price'] or not row['abrade']:
+            continue
+        price, abrade = float(row['price']), float(row['abrade'])
+        new_abrade = abrade / (item.max_float - item.min_float)
+        key = (item.quality, item.container, item.rarity, bin_labels(np.array([new_abrade]))[0])
+        if key not in best or price < best[key][2]:
+            best[key] = (row['templateId'], row['commodityName'], price, abrade,
+                         item.min_float, item.max_float, new_abrade)
+    table = pd.DataFrame([key + value for key, value in best.items()], columns=COLUMNS)
+    return table.sort_values(KEY_COLUMNS, ignore_index=True)
+
+
+def test_item_meta(weapon_case_goods_jsonl, weapon_cases):
+    meta = build_item_meta(weapon_case_goods_jsonl)
+    by_name = {}
+    for line in weapon_case_goods_jsonl.read_text(encoding='utf-8').splitlines():
+        goods_info = json.loads(line)['data']['goods_info']
+        by_name[goods_info['market_hash_name']] = goods_info['yyyp_id']
+    expected = {}
+    for container, rarities in weapon_cases.items():
+        for rarity, weapons in rarities.items():
+            for weapon in weapons:
+                for hash_name in weapon.hash_names:
+                    if hash_name in by_name:
+                        expected[by_name[hash_name]] = ('普通', container, rarity, weapon.min_float, weapon.max_float)
+    assert {k: tuple(v) for k, v in meta.items()} == expected
+
+
+def test_items_out_of_weapon_cases_are_dropped(goods_jsonl):
+    assert build_item_meta(goods_jsonl) == {}
+
+
+def test_bin_labels_match_pd_cut():
+    values = np.concatenate([np.arange(0, 100) / 100, np.random.default_rng(0).random(1000)])
+    edges = np.arange(0, 1.02, 0.01)
+    cut = pd.cut(values, edges, right=False)
+    expected = [f"{round(i.left, 2)}-{round(i.right, 2)}" for i in cut]
+    assert bin_labels(values).tolist() == expected
+
+
+def test_one_shot_build_matches_brute_force(tmp_path, weapon_case_goods_jsonl):
+    meta = build_item_meta(weapon_case_goods_jsonl)
+    rows = listings(meta)
+    source = tmp_path / 'scraped.jsonl'
+    source.write_text(''.join(json.dumps(row) + '\n' for row in rows), encoding='utf-8')
+    builder = PriceTableBuilder(meta, source, tmp_path / 'price.csv', chunk_size=10_000)
+    assert builder.update() == source.stat().st_size
+    pd.testing.assert_frame_equal(builder.table(), brute_force(meta, rows))
+
+
+@pytest.mark.parametrize('compression', COMPRESSIONS)
+def test_incremental_update_matches_one_shot(tmp_path, weapon_case_goods_jsonl, compression):
+    meta = build_item_meta(weapon_case_goods_jsonl)
+    rows = listings(meta)
+    source, table_path = tmp_path / 'scraped.jsonl', tmp_path / 'price.csv'
+    sink = OutputSink(source, batch_size=1, flush_interval=0, max_bytes=4000, compression=compression)
+    builder = PriceTableBuilder(meta, source, table_path, chunk_size=17)
+    for batch, start in enumerate(range(0, len(rows) - 1, 50)):
+        sink.write_many(rows[start:min(start + 50, len(rows) - 1)])
+        builder.update()
+        if batch % 4 == 3:
+            # resumed from the saved table and progress
+            builder = PriceTableBuilder(meta, source, table_path, chunk_size=17)
+    sink.close()
+    # a line still being written is left for the next update
+    last = (json.dumps(rows[-1]) + '\n').encode()
+    with open(source, 'ab') as f:
+        f.write(last[:10])
+    builder.update()
+    with open(source, 'ab') as f:
+        f.write(last[10:])
+    assert builder.update() == len(last)
+    assert len(builder.done) > 1
+    pd.testing.assert_frame_equal(builder.table(), brute_force(meta, rows))
+    # nothing left to read
+    assert PriceTableBuilder(meta, source, table_path).update() == 0
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from cs2.optimize.ga_fitness import batch_evaluate
+from cs2.optimize.risk import exact_risk, outcome_values, portfolio_variance, simulate_contracts, simulate_portfolio
+
+
+def contracts(k: int = 6, m: int = 5, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    probabilities = rng.random((k, m))
+    probabilities[rng.random((k, m)) < 0.3] = 0.0
+    probabilities[:, 0] += 0.1
+    probabilities /= probabilities.sum(axis=1, keepdims=True)
+    values = rng.random((k, m)) * 100
+    costs = rng.random(k) * 60 + 20
+    return probabilities, values, costs
+
+
+def test_exact_risk_matches_enumeration():
+    probabilities, values, costs = contracts()
+    report = exact_risk(probabilities, values, costs)
+    for i in range(len(costs)):
+        profits = values[i] - costs[i]
+        mean = float(probabilities[i] @ profits)
+        assert report.mean[i] == pytest.approx(mean)
+        assert report.std[i] == pytest.approx(np.sqrt(probabilities[i] @ (profits - mean) ** 2))
+        assert report.p_loss[i] == pytest.approx(probabilities[i][profits < 0].sum())
+        # smallest profit whose cumulative probability reaches the quantile
+        order = np.argsort(profits)
+        cumulative = np.cumsum(probabilities[i][order])
+        median = profits[order][np.searchsorted(cumulative, 0.5 - 1e-12)]
+        assert report.quantiles[i, 2] == pytest.approx(median)
+
+
+def test_simulation_converges_to_exact():
+    probabilities, values, costs = contracts()
+    exact = exact_risk(probabilities, values, costs)
+    simulated = simulate_contracts(probabilities, values, costs, n_draws=2_000_000, seed=1)
+    np.testing.assert_allclose(simulated.mean, exact.mean, atol=0.1)
+    np.testing.assert_allclose(simulated.std, exact.std, rtol=0.01)
+    np.testing.assert_allclose(simulated.p_loss, exact.p_loss, atol=2e-3)
+    same = simulate_contracts(probabilities, values, costs, n_draws=2_000_000, seed=1)
+    np.testing.assert_array_equal(simulated.quantiles, same.quantiles)
+
+
+def test_portfolio_adds_independent_contracts():
+    probabilities, values, costs = contracts()
+    report = simulate_portfolio(probabilities, values, costs, n_draws=400_000, seed=2, chunk_size=1 << 16)
+    exact = exact_risk(probabilities, values, costs)
+    assert float(report.mean) == pytest.approx(exact.mean.sum(), abs=0.3)
+    assert float(report.std) ** 2 == pytest.approx(portfolio_variance(probabilities, values, costs), rel=0.02)
+
+
+def test_out_of_range_outcomes_have_no_value():
+    prices = np.arange(15, dtype=np.float64).reshape(3, 5)
+    result = batch_evaluate(np.array([[5, 5]]), np.array([0.5]), np.array([0, 0, 1]),
+                            np.array([[0.0, 1.0], [0.9, 2.0], [0.0, 0.1]]), prices)
+    values = outcome_values(result, prices)
+    assert result.wear_tiers[0, 1] == -1
+    assert np.isnan(values[0, 1])
+    assert values[0, 0] == prices[0, result.wear_tiers[0, 0]]
@@ -0,0 +1,42 @@
+import json
+
+import numpy as np
+import pytest
+
+from cs2.data_model.response_model import Info
+from cs2.data_model.snapshot_store import SnapshotStore, convert_jsonl
+
+
+def load(path) -> list[Info]:
+    return [Info.model_validate_json(line) for line in path.read_text(encoding='utf-8').splitlines()]
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_converted_snapshot_round_trip(goods_jsonl, mmap):
+    store = SnapshotStore(convert_jsonl(goods_jsonl), mmap=mmap)
+    original = {info.data.goods_info.yyyp_id: info for info in load(goods_jsonl)}
+    assert store.manifest['date'] == '2025-09-25'
+    assert len(store) == len(original)
+    assert store.yyyp_ids.tolist() == sorted(original)
+    for info in store.catalog().to_infos():
+        expected = original[info.data.goods_info.yyyp_id]
+        assert info.data.goods_info == expected.data.goods_info
+        assert info.data.container == expected.data.container
+
+
+def test_columns_match_json(goods_jsonl, tmp_path):
+    store = SnapshotStore(convert_jsonl(goods_jsonl, tmp_path / 'snapshot'))
+    goods = sorted((json.loads(line)['data'] for line in goods_jsonl.read_text(encoding='utf-8').splitlines()),
+                   key=lambda data: data['goods_info']['yyyp_id'])
+    rows = np.arange(0, len(goods), 5)
+    columns = store.columns(['market_hash_name', 'yyyp_sell_price', 'buff_sell_num'], rows)
+    for row, name, price, num in zip(rows.tolist(), *columns.values()):
+        goods_info = goods[row]['goods_info']
+        assert name == goods_info['market_hash_name']
+        assert price == goods_info['yyyp_sell_price'] or (goods_info['yyyp_sell_price'] is None and np.isnan(price))
+        assert num == goods_info['buff_sell_num']
+        assert store.container_names(row) == [c['name'] for c in goods[row]['container']]
+    ids = [goods[7]['goods_info']['yyyp_id'], 10 ** 9]
+    assert store.rows(ids).tolist() == [7, -1]
+    names = store.hash_name_index().hash_names
+    assert names[store.catalog().hash_ids(7)] == goods[7]['goods_info']['market_hash_name']
@@ -0,0 +1,110 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from cs2.scrape import throttle
+from cs2.scrape.throttle import MIN_RATE, AdaptiveThrottle, RateLimiter
+
+
+class FakeTime:
+    """`time` of the throttle module, sleeping only moves the clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeTime:
+    fake = FakeTime()
+    monkeypatch.setattr(throttle, 'time', fake)
+    return fake
+
+
+def test_rate_follows_aimd(clock):
+    rng = np.random.default_rng(0)
+    bucket = AdaptiveThrottle(rate=2.0, increase=0.1, decrease=0.5, cooldown=5.0)
+    # reference: additive increase, multiplicative decrease at most once per cooldown
+    rate, last_decrease = 2.0, -np.inf
+    for event in rng.choice(['success', 'throttled', 'timeout'], size=500, p=[0.8, 0.1, 0.1]):
+        clock.now += float(rng.random() * 2)
+        getattr(bucket, f"on_{event}")()
+        if event == 'success':
+            rate = min(8.0, rate + 0.1)
+        elif clock.now - last_decrease >= 5.0:
+            rate = max(0.2, rate * 0.5)
+            last_decrease = clock.now
+        assert bucket.rate == pytest.approx(rate)
+    metrics = bucket.metrics()
+    assert (metrics.throttled, metrics.timeouts) == (bucket.throttled, bucket.timeouts)
+
+
+def test_one_decrease_per_cooldown(clock):
+    bucket = AdaptiveThrottle(rate=4.0, cooldown=5.0)
+    for _ in range(10):
+        bucket.on_throttled()
+    assert bucket.rate == 2.0
+    clock.now += 4.9
+    bucket.on_timeout()
+    assert bucket.rate == 2.0
+    clock.now += 0.1
+    bucket.on_timeout()
+    assert bucket.rate == 1.0
+
+
+def test_rate_bounds(clock):
+    bucket = AdaptiveThrottle(rate=1.0, increase=1.0, cooldown=0.0)
+    for _ in range(20):
+        bucket.on_success()
+    assert bucket.rate == bucket.max_rate == 4.0
+    for _ in range(20):
+        bucket.on_timeout()
+    assert bucket.rate == bucket.min_rate == 0.1
+    assert AdaptiveThrottle(rate=1e-6).min_rate == MIN_RATE
+
+
+def test_wait_consume_paces_at_the_rate(clock):
+    bucket = AdaptiveThrottle(capacity=3, rate=2.0)
+    start = clock.now
+    for _ in range(13):
+        bucket.wait_consume()
+    # the first 3 tokens are in the bucket, every other one takes 1 / rate
+    assert clock.now - start == pytest.approx(5.0, abs=0.01)
+    assert bucket.metrics().acquired == 13
+
+
+def test_throttled_blocks_for_the_cooldown(clock):
+    bucket = AdaptiveThrottle(capacity=5, rate=10.0, cooldown=3.0)
+    bucket.on_throttled()
+    assert not bucket.consume()
+    start = clock.now
+    bucket.wait_consume()
+    # blocked for the cooldown, then one token at the halved rate
+    assert clock.now - start == pytest.approx(3.0 + 1 / 5.0, abs=0.01)
+
+
+def test_acquire_from_coroutines():
+    bucket = AdaptiveThrottle(capacity=1, rate=1000.0)
+
+    async def main():
+        await asyncio.gather(*(bucket.acquire() for _ in range(20)))
+
+    asyncio.run(main())
+    assert bucket.metrics().acquired == 20
+
+
+def test_rate_limiter_buckets():
+    limiter = RateLimiter(rate=2.0, cooldown=1.0)
+    search = limiter.bucket('search', rate=8.0)
+    assert limiter['search'] is search
+    assert (search.rate, search.cooldown) == (8.0, 1.0)
+    assert limiter['detail'].rate == 2.0
+    search.on_timeout()
+    assert limiter['detail'].rate == 2.0
+    assert set(limiter.metrics()) == {'search', 'detail'}
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cs2.optimize.input_solver import InputSolver
+from cs2.optimize.topk import ContractSearch, compositions
+from cs2.scrape.cs2_terms import rank_to_rarity
+
+QUALITY = '普通'
+RARITY = rank_to_rarity[4]
+
+
+@pytest.fixture
+def search(index, prices) -> ContractSearch:
+    rng = np.random.default_rng(2)
+    rows = []
+    for c in range(4):
+        for _ in range(15):
+            abrade = float(rng.integers(0, 1000)) / 1000
+            # inputs of a container cost about the same, so the bound prunes something
+            rows.append((QUALITY, f"Case {c}", RARITY, round(float(rng.random() * 5 + 2 * c), 2), abrade, 0.0, 1.0))
+    table = pd.DataFrame(rows, columns=['quality', 'container', 'rarity', 'price', 'abrade', 'min_float', 'max_float'])
+    return ContractSearch(index, InputSolver(table), prices, QUALITY, RARITY, max_containers=2)
+
+
+def brute_force(search: ContractSearch, k: int, objective: str) -> list[float]:
+    best = []
+    for combo, counts in search.mixes():
+        scores = [getattr(c, objective) for c in search.evaluate(combo, counts)]
+        if scores:
+            best.append(max(scores))
+    return sorted(best, reverse=True)[:k]
+
+
+def test_compositions():
+    assert sorted(compositions(4, 2)) == [(1, 3), (2, 2), (3, 1)]
+    assert all(sum(c) == 10 and min(c) >= 1 for c in compositions(10, 3))
+    assert len(list(compositions(10, 3))) == 36
+
+
+@pytest.mark.parametrize('objective', ['profit', 'roi'])
+@pytest.mark.parametrize('k', [1, 5, 20])
+def test_pruned_top_k_matches_brute_force(search, objective, k):
+    found = search.top_k(k, objective)
+    np.testing.assert_allclose([getattr(c, objective) for c in found], brute_force(search, k, objective))
+
+
+def test_upper_bound_holds(search):
+    for combo, counts in search.mixes():
+        bound = search.upper_bound(combo, counts, 'profit')
+        assert all(c.profit <= bound + 1e-9 for c in search.evaluate(combo, counts))
+
+
+def test_every_breakpoint_when_not_per_mix(search):
+    everything = sorted((c.profit for c in search.candidates()), reverse=True)
+    found = search.top_k(10, per_mix=False)
+    np.testing.assert_allclose([c.profit for c in found], everything[:10])
@@ -0,0 +1,30 @@
+import numpy as np
+
+from cs2.optimize.utilities import HashNameTable, WEAR_RANKS, return_hash_name, wear_tier, wear_tiers
+
+
+def test_wear_tiers_match_scalar():
+    rng = np.random.default_rng(0)
+    # every boundary, values around it and out of range floats
+    bounds = [0.0, 0.07, 0.15, 0.38, 0.45, 1.0]
+    floats = np.concatenate([bounds, np.nextafter(bounds, 2), np.nextafter(bounds, -1), rng.random(500) * 1.2 - 0.1])
+    np.testing.assert_array_equal(wear_tiers(floats), [wear_tier(f) for f in floats.tolist()])
+
+
+def test_boundary_belongs_to_the_lower_tier():
+    assert WEAR_RANKS[wear_tier(0.07)] == 'Factory New'
+    assert WEAR_RANKS[wear_tier(0.45)] == 'Well-Worn'
+    assert wear_tier(1.0001) == -1
+
+
+def test_resolve_matches_return_hash_name():
+    weapon_names = ['AK-47 | Redline', 'StatTrak™ AWP | Asiimov', 'AK-47 | Redline']
+    table = HashNameTable(weapon_names)
+    rng = np.random.default_rng(1)
+    weapon_ids = rng.integers(0, len(weapon_names), size=300)
+    floats = rng.random(300) * 1.1
+    hash_ids = table.resolve(weapon_ids, floats)
+    for weapon_id, float_, hash_id in zip(weapon_ids.tolist(), floats.tolist(), hash_ids.tolist()):
+        assert table.name(hash_id) == return_hash_name(weapon_names[weapon_id], float_)
+    # the same weapon listed twice shares its hash name ids
+    np.testing.assert_array_equal(table.table[0], table.table[2])